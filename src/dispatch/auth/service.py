@@ -5,15 +5,20 @@
     :license: Apache, see LICENSE for more details.
 """
 import logging
-from typing import Optional
+from threading import Lock
+from typing import Optional, Tuple
 
+from cachetools import TTLCache
 from fastapi import HTTPException, Depends
 from starlette.requests import Request
 from starlette.status import HTTP_401_UNAUTHORIZED
 
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import make_transient_to_detached
 
 from dispatch.config import (
+    DISPATCH_AUTHENTICATION_CACHE_SIZE,
+    DISPATCH_AUTHENTICATION_CACHE_TTL,
     DISPATCH_AUTHENTICATION_PROVIDER_SLUG,
     DISPATCH_AUTHENTICATION_DEFAULT_USER,
 )
@@ -40,6 +45,32 @@ InvalidCredentialException = HTTPException(
     status_code=HTTP_401_UNAUTHORIZED, detail=[{"msg": "Could not validate credentials"}]
 )
 
+# (organization slug, email) -> (user id, organization role)
+identity_cache = TTLCache(
+    maxsize=DISPATCH_AUTHENTICATION_CACHE_SIZE, ttl=DISPATCH_AUTHENTICATION_CACHE_TTL
+)
+identity_cache_lock = Lock()
+
+
+def get_cached_identity(*, organization: str, email: str) -> Optional[Tuple[int, str]]:
+    """Returns the cached user id and role for an email in an organization."""
+    with identity_cache_lock:
+        return identity_cache.get((organization, email))
+
+
+def set_cached_identity(*, organization: str, user: DispatchUser):
+    """Caches the user id and role of a user in an organization."""
+    role = user.get_organization_role(organization_slug=organization)
+    with identity_cache_lock:
+        identity_cache[(organization, user.email)] = (user.id, role)
+
+
+def invalidate_cached_identity(*, email: str):
+    """Drops the cached identities of a user across all organizations."""
+    with identity_cache_lock:
+        for key in [k for k in list(identity_cache.keys()) if k[1] == email]:
+            identity_cache.pop(key, None)
+
 
 def get(*, db_session, user_id: int) -> Optional[DispatchUser]:
     """Returns a user based on the given user id."""
@@ -223,6 +254,7 @@ def update(*, db_session, user: DispatchUser, user_in: UserUpdate) -> DispatchUs
             )
 
     db_session.commit()
+    invalidate_cached_identity(email=user.email)
     return user
 
 
@@ -241,15 +273,34 @@ def get_current_user(request: Request) -> DispatchUser:
         )
         raise InvalidCredentialException
 
-    return get_or_create(
+    identity = get_cached_identity(organization=request.state.organization, email=user_email)
+    if identity:
+        # we attach a placeholder for the cached user to the session without querying it,
+        # any other attributes are lazily loaded if the caller needs them
+        user = DispatchUser(id=identity[0], email=user_email)
+        make_transient_to_detached(user)
+        return request.state.db.merge(user, load=False)
+
+    user = get_or_create(
         db_session=request.state.db,
         organization=request.state.organization,
         user_in=UserRegister(email=user_email),
     )
 
+    if user:
+        set_cached_identity(organization=request.state.organization, user=user)
+
+    return user
+
 
 def get_current_role(
     request: Request, current_user: DispatchUser = Depends(get_current_user)
 ) -> UserRoles:
     """Attempts to get the current user depending on the configured authentication provider."""
+    identity = get_cached_identity(
+        organization=request.state.organization, email=current_user.email
+    )
+    if identity:
+        return identity[1]
+
     return current_user.get_organization_role(organization_slug=request.state.organization)
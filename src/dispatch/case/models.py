@@ -7,6 +7,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     PrimaryKeyConstraint,
     String,
@@ -57,7 +58,21 @@ assoc_cases_incidents = Table(
 
 
 class Case(Base, TimeStampMixin, ProjectMixin):
-    __table_args__ = (UniqueConstraint("name", "project_id"),)
+    __table_args__ = (
+        UniqueConstraint("name", "project_id"),
+        Index(
+            "ix_case_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_case_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String)
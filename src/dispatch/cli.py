@@ -600,11 +600,47 @@ def list_tasks():
     """Prints and runs all currently configured periodic tasks, in seperate event loop."""
     from tabulate import tabulate
 
+    # statistics are written by the running scheduler process
+    stats = scheduler.read_stats()
+
     table = []
     for task in scheduler.registered_tasks:
-        table.append([task["name"], task["job"].period, task["job"].at_time])
+        task_stats = stats.get(task["name"], {})
+        table.append(
+            [
+                task["name"],
+                task["job"].period,
+                task["job"].at_time,
+                task["max_concurrency"],
+                task_stats.get("queued", 0),
+                task_stats.get("running", 0),
+                task_stats.get("runs", 0),
+                task_stats.get("skipped", 0),
+                task_stats.get("failures", 0),
+                task_stats.get("last_run_at"),
+                task_stats.get("last_run_duration"),
+            ]
+        )
 
-    click.secho(tabulate(table, headers=["Task Name", "Period", "At Time"]), fg="blue")
+    click.secho(
+        tabulate(
+            table,
+            headers=[
+                "Task Name",
+                "Period",
+                "At Time",
+                "Max Concurrency",
+                "Queued",
+                "Running",
+                "Runs",
+                "Skipped",
+                "Failures",
+                "Last Run",
+                "Last Duration (s)",
+            ],
+        ),
+        fg="blue",
+    )
 
 
 @dispatch_scheduler.command("start")
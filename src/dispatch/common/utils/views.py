@@ -1,3 +1,17 @@
+import csv
+import io
+import json
+from typing import Iterator, List, Set, Type
+
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON
+from sqlalchemy.orm import Query
+
+from dispatch.database.core import organization_session_scope
+
+EXPORT_BATCH_SIZE = 1000
+
+
 def create_pydantic_include(include):
     """Creates a pydantic sets based on dotted notation."""
     include_sets = {}
@@ -15,3 +29,80 @@ def create_pydantic_include(include):
         include_sets.update(keyset)
 
     return include_sets
+
+
+def stream_query(query: Query, organization_slug: str, batch_size: int = EXPORT_BATCH_SIZE):
+    """Streams the results of a query with a server side cursor.
+
+    The query is run in its own session, as the request's session is closed
+    before a streaming response body is sent.
+    """
+    with organization_session_scope(organization_slug) as db_session:
+        yield from query.with_session(db_session).yield_per(batch_size)
+
+
+def get_csv_fieldnames(
+    read_model: Type[BaseModel], include: dict = None, prefix: str = ""
+) -> List[str]:
+    """Returns the columns of a read model in dotted notation, nested models are flattened."""
+    fieldnames = []
+    for name, field in read_model.__fields__.items():
+        if include is not None and name not in include:
+            continue
+
+        key = f"{prefix}{name}"
+        if (
+            field.shape == SHAPE_SINGLETON
+            and isinstance(field.type_, type)
+            and issubclass(field.type_, BaseModel)
+        ):
+            nested_include = include.get(name) if include else None
+            fieldnames.extend(
+                get_csv_fieldnames(
+                    field.type_,
+                    include=nested_include if isinstance(nested_include, dict) else None,
+                    prefix=f"{key}.",
+                )
+            )
+        else:
+            fieldnames.append(key)
+    return fieldnames
+
+
+def flatten(data: dict, prefix: str = "", columns: Set[str] = None) -> dict:
+    """Flattens nested dictionaries into dotted keys, lists and the dictionaries
+    of the given columns are kept as json."""
+    flat = {}
+    for key, value in data.items():
+        key = f"{prefix}{key}"
+        if isinstance(value, dict) and (columns is None or key not in columns):
+            flat.update(flatten(value, prefix=f"{key}.", columns=columns))
+        elif isinstance(value, (dict, list)):
+            flat[key] = json.dumps(value)
+        else:
+            flat[key] = value
+    return flat
+
+
+def export_ndjson(rows, read_model: Type[BaseModel], include: dict = None) -> Iterator[str]:
+    """Serializes rows as newline delimited json, one row at a time."""
+    for row in rows:
+        yield read_model.from_orm(row).json(include=include) + "\n"
+
+
+def export_csv(rows, read_model: Type[BaseModel], include: dict = None) -> Iterator[str]:
+    """Serializes rows as csv, one row at a time. Columns are taken from the read model,
+    so that rows with missing relationships leave their columns empty."""
+    buffer = io.StringIO()
+    fieldnames = get_csv_fieldnames(read_model, include=include)
+    columns = set(fieldnames)
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        data = json.loads(read_model.from_orm(row).json(include=include))
+        writer.writerow(flatten(data, columns=columns))
+        yield buffer.getvalue()
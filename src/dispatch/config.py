@@ -1,5 +1,6 @@
 import logging
 import os
+import tempfile
 import base64
 from urllib import parse
 from typing import List
@@ -126,10 +127,22 @@ DISPATCH_AUTHENTICATION_DEFAULT_USER = config(
     "DISPATCH_AUTHENTICATION_DEFAULT_USER", default="dispatch@example.com"
 )
 
+DISPATCH_AUTHENTICATION_CACHE_TTL = config(
+    "DISPATCH_AUTHENTICATION_CACHE_TTL", cast=int, default=60
+)  # Seconds
+DISPATCH_AUTHENTICATION_CACHE_SIZE = config("DISPATCH_AUTHENTICATION_CACHE_SIZE", cast=int, default=1024)
+
 DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS = config(
     "DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS", default=None
 )
 
+DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS_CACHE_TTL = config(
+    "DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS_CACHE_TTL", cast=int, default=3600
+)  # Seconds
+DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS_REFRESH_INTERVAL = config(
+    "DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS_REFRESH_INTERVAL", cast=int, default=30
+)  # Seconds, minimum time between refetches triggered by unknown key ids
+
 DISPATCH_PKCE_DONT_VERIFY_AT_HASH = config("DISPATCH_PKCE_DONT_VERIFY_AT_HASH", default=False)
 
 if DISPATCH_AUTHENTICATION_PROVIDER_SLUG == "dispatch-auth-provider-pkce":
@@ -175,6 +188,43 @@ STATIC_DIR = config("STATIC_DIR", default=DEFAULT_STATIC_DIR)
 
 # metrics
 METRIC_PROVIDERS = config("METRIC_PROVIDERS", cast=CommaSeparatedStrings, default="")
+METRIC_FLUSH_INTERVAL = config("METRIC_FLUSH_INTERVAL", cast=float, default=10)  # Seconds
+METRIC_BUFFER_SIZE = config("METRIC_BUFFER_SIZE", cast=int, default=10000)
+METRIC_TIMER_SAMPLES = config("METRIC_TIMER_SAMPLES", cast=int, default=100)
+
+# search
+SEARCH_RESULTS_PER_TYPE = config("SEARCH_RESULTS_PER_TYPE", cast=int, default=10)
+TYPEAHEAD_CACHE_SIZE = config("TYPEAHEAD_CACHE_SIZE", cast=int, default=4096)
+TYPEAHEAD_CACHE_TTL = config("TYPEAHEAD_CACHE_TTL", cast=float, default=10)  # Seconds
+
+# tags
+TAG_MATCHER_CACHE_TTL = config("TAG_MATCHER_CACHE_TTL", cast=float, default=300)  # Seconds
+
+# search filters
+FILTER_CACHE_SIZE = config("FILTER_CACHE_SIZE", cast=int, default=1024)
+
+# incident cost
+INCIDENT_RESPONSE_COST_INCREMENTAL = config(
+    "INCIDENT_RESPONSE_COST_INCREMENTAL", cast=bool, default=True
+)
+
+# signals
+SIGNAL_INSTANCE_BATCH_SIZE = config("SIGNAL_INSTANCE_BATCH_SIZE", cast=int, default=1000)
+
+# slack
+# number of seconds the signing secrets of an organization are cached for,
+# this bounds how long changes made by other processes take to be picked up
+SLACK_SIGNING_SECRETS_CACHE_TTL = config(
+    "SLACK_SIGNING_SECRETS_CACHE_TTL", cast=int, default=60
+)
+
+# scheduler
+SCHEDULER_MAX_WORKERS = config("SCHEDULER_MAX_WORKERS", cast=int, default=10)
+SCHEDULER_PROJECT_MAX_WORKERS = config("SCHEDULER_PROJECT_MAX_WORKERS", cast=int, default=1)
+SCHEDULER_JITTER = config("SCHEDULER_JITTER", cast=float, default=5)  # Seconds
+SCHEDULER_STATS_PATH = config(
+    "SCHEDULER_STATS_PATH", default=os.path.join(tempfile.gettempdir(), "dispatch-scheduler.json")
+)
 
 # database
 DATABASE_HOSTNAME = config("DATABASE_HOSTNAME")
@@ -186,6 +236,11 @@ DATABASE_NAME = config("DATABASE_NAME", default="dispatch")
 DATABASE_PORT = config("DATABASE_PORT", default="5432")
 DATABASE_ENGINE_POOL_SIZE = config("DATABASE_ENGINE_POOL_SIZE", cast=int, default=20)
 DATABASE_ENGINE_MAX_OVERFLOW = config("DATABASE_ENGINE_MAX_OVERFLOW", cast=int, default=0)
+# minimum number of seconds between schema catalog refreshes caused by unknown schemas,
+# requests to an organization created by another process can fail for up to this long
+ORGANIZATION_SCHEMA_REFRESH_INTERVAL = config(
+    "ORGANIZATION_SCHEMA_REFRESH_INTERVAL", cast=int, default=30
+)
 SQLALCHEMY_DATABASE_URI = f"postgresql+psycopg2://{_DATABASE_CREDENTIAL_USER}:{_QUOTED_DATABASE_PASSWORD}@{DATABASE_HOSTNAME}:{DATABASE_PORT}/{DATABASE_NAME}"
 
 ALEMBIC_CORE_REVISION_PATH = config(
@@ -3,10 +3,12 @@ from pydantic import validator, Field
 from typing import Optional
 
 from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy.orm import relationship
 
 from dispatch.database.core import Base
 from dispatch.messaging.strings import INCIDENT_CONVERSATION_DESCRIPTION
 from dispatch.models import ResourceBase, ResourceMixin
+from dispatch.organization.models import Organization
 
 
 class Conversation(Base, ResourceMixin):
@@ -15,6 +17,17 @@ class Conversation(Base, ResourceMixin):
     incident_id = Column(Integer, ForeignKey("incident.id", ondelete="CASCADE"))
 
 
+class ConversationOrganization(Base):
+    """Maps a conversation's channel id to the organization that owns it."""
+
+    __table_args__ = {"schema": "dispatch_core"}
+
+    # the channel id without its channel type prefix
+    channel_id = Column(String, primary_key=True)
+    organization_id = Column(Integer, ForeignKey(Organization.id, ondelete="CASCADE"))
+    organization = relationship(Organization)
+
+
 # Pydantic models...
 class ConversationBase(ResourceBase):
     channel_id: Optional[str] = Field(None, nullable=True)
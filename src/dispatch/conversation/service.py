@@ -1,8 +1,14 @@
 from typing import Optional
 
 from dispatch.event import service as event_service
+from dispatch.organization.models import Organization
 
-from .models import Conversation, ConversationCreate, ConversationUpdate
+from .models import (
+    Conversation,
+    ConversationCreate,
+    ConversationOrganization,
+    ConversationUpdate,
+)
 
 
 def get(*, db_session, conversation_id: int) -> Optional[Conversation]:
@@ -39,6 +45,25 @@ def get_by_channel_id_ignoring_channel_type(db_session, channel_id: str) -> Opti
     return conversation
 
 
+def get_organization_slug_by_channel_id(*, db_session, channel_id: str) -> Optional[str]:
+    """Fetches the slug of the organization that owns a channel, ignoring the channel type."""
+    organization_slug = (
+        db_session.query(Organization.slug)
+        .join(ConversationOrganization, ConversationOrganization.organization_id == Organization.id)
+        .filter(ConversationOrganization.channel_id == channel_id[1:])
+        .scalar()
+    )
+    return organization_slug
+
+
+def set_channel_organization(*, db_session, channel_id: str, organization_id: int):
+    """Records which organization owns a channel, ignoring the channel type."""
+    db_session.merge(
+        ConversationOrganization(channel_id=channel_id[1:], organization_id=organization_id)
+    )
+    db_session.commit()
+
+
 def get_all(*, db_session):
     """Fetches all conversations."""
     return db_session.query(Conversation)
@@ -1,12 +1,16 @@
 import re
+import time
 import functools
-from typing import Any
+from collections import Counter
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, Iterator, Optional, Set
 from pydantic.error_wrappers import ErrorWrapper, ValidationError
 from pydantic import BaseModel
 
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.ext.declarative import declarative_base, declared_attr
-from sqlalchemy.orm import sessionmaker, object_session
+from sqlalchemy.orm import Session, mapper, sessionmaker, object_session
 from sqlalchemy.sql.expression import true
 from sqlalchemy_utils import get_mapper
 from starlette.requests import Request
@@ -15,6 +19,8 @@ from dispatch import config
 from dispatch.exceptions import NotFoundError
 from dispatch.search.fulltext import make_searchable
 
+from .enums import DISPATCH_ORGANIZATION_SCHEMA_PREFIX
+
 
 engine = create_engine(
     config.SQLALCHEMY_DATABASE_URI,
@@ -23,7 +29,134 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(bind=engine)
 
+_organization_schemas: Set[str] = set()
+_organization_schemas_refreshed_at = None
+_organization_schemas_lock = Lock()
+
+_schema_sessionmakers: Dict[str, sessionmaker] = {}
+_schema_sessionmakers_lock = Lock()
+_schema_sessions_opened = Counter()
+
+
+def get_organization_schema_name(organization_slug: str) -> str:
+    """Returns the name of the schema for a given organization slug."""
+    return f"{DISPATCH_ORGANIZATION_SCHEMA_PREFIX}_{organization_slug}"
+
+
+def refresh_organization_schemas():
+    """Reloads the set of existing schemas from the database catalog."""
+    global _organization_schemas, _organization_schemas_refreshed_at
+
+    schema_names = set(inspect(engine).get_schema_names())
+    with _organization_schemas_lock:
+        _organization_schemas = schema_names
+        _organization_schemas_refreshed_at = time.monotonic()
+
+
+def register_organization_schema(schema_name: str):
+    """Adds a newly created schema to the cached set of schemas."""
+    with _organization_schemas_lock:
+        _organization_schemas.add(schema_name)
+
+
+def organization_schema_exists(schema_name: str) -> bool:
+    """Returns whether a schema exists, using the cached set of schemas when possible.
+
+    Unknown schemas trigger a catalog refresh (at most once per refresh interval) so that
+    organizations created by other processes are eventually picked up. Until then, requests
+    to such an organization fail with "Unknown database schema name", for up to
+    ORGANIZATION_SCHEMA_REFRESH_INTERVAL seconds.
+    """
+    if schema_name in _organization_schemas:
+        return True
+
+    refreshed_at = _organization_schemas_refreshed_at
+    if (
+        refreshed_at is None
+        or time.monotonic() - refreshed_at > config.ORGANIZATION_SCHEMA_REFRESH_INTERVAL
+    ):
+        refresh_organization_schemas()
+
+    return schema_name in _organization_schemas
+
+
+def get_schema_sessionmaker(schema_name: str) -> sessionmaker:
+    """Returns a session factory bound to the given schema, creating it only once per schema."""
+    session_factory = _schema_sessionmakers.get(schema_name)
+    if session_factory:
+        return session_factory
+
+    with _schema_sessionmakers_lock:
+        session_factory = _schema_sessionmakers.get(schema_name)
+        if not session_factory:
+            schema_engine = engine.execution_options(
+                schema_translate_map={
+                    None: schema_name,
+                }
+            )
+            session_factory = sessionmaker(bind=schema_engine)
+            _schema_sessionmakers[schema_name] = session_factory
+
+    return session_factory
 
+
+def get_schema_session(schema_name: str) -> Session:
+    """Returns a new session bound to the given schema."""
+    session = get_schema_sessionmaker(schema_name)()
+    with _schema_sessionmakers_lock:
+        _schema_sessions_opened[schema_name] += 1
+    return session
+
+
+def get_session_schema(db_session: Session) -> Optional[str]:
+    """Returns the name of the schema a session is bound to."""
+    bind = db_session.get_bind()
+    return bind.get_execution_options().get("schema_translate_map", {}).get(None)
+
+
+def get_organization_session(organization_slug: str) -> Session:
+    """Returns a new session bound to the schema of the given organization."""
+    return get_schema_session(get_organization_schema_name(organization_slug))
+
+
+@contextmanager
+def organization_session_scope(organization_slug: str) -> Iterator[Session]:
+    """Provides a session bound to the schema of the given organization,
+    rolling back on errors and closing it on exit."""
+    session = get_organization_session(organization_slug)
+    try:
+        yield session
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def get_session_stats() -> dict:
+    """Returns connection pool usage and the number of sessions opened per schema."""
+    pool = engine.pool
+    pool_stats = {}
+    for name, attr in [
+        ("size", "size"),
+        ("checked_in", "checkedin"),
+        ("checked_out", "checkedout"),
+        ("overflow", "overflow"),
+    ]:
+        if hasattr(pool, attr):
+            pool_stats[name] = getattr(pool, attr)()
+
+    with _schema_sessionmakers_lock:
+        sessions_opened = dict(_schema_sessions_opened)
+
+    return {
+        "pool": pool_stats,
+        "schemas": len(_schema_sessionmakers),
+        "sessions_opened": sessions_opened,
+    }
+
+
+@functools.lru_cache(maxsize=256)
 def resolve_table_name(name):
     """Resolves table names to their mapped names."""
     names = re.split("(?=[A-Z])", name)  # noqa
@@ -110,16 +243,55 @@ def get_model_name_by_tablename(table_fullname: str) -> str:
     return get_class_by_tablename(table_fullname=table_fullname).__name__
 
 
+# indexes of the mapped classes by lowercased table full name and by class name
+model_tablename_index: Dict[str, Any] = {}
+model_name_index: Dict[str, Any] = {}
+_model_registry_size = 0
+
+
+@event.listens_for(mapper, "after_configured")
+def build_model_indexes():
+    """Indexes the mapped classes once all mappers are configured."""
+    tablenames, names = {}, {}
+    registry = list(Base._decl_class_registry.values())
+    for c in registry:
+        if hasattr(c, "__table__"):
+            tablenames.setdefault(c.__table__.fullname.lower(), c)
+            names.setdefault(c.__name__, c)
+
+    # we swap the indexes so that concurrent lookups never see a partial index
+    global model_tablename_index, model_name_index, _model_registry_size
+    model_tablename_index, model_name_index = tablenames, names
+    _model_registry_size = len(registry)
+
+
+def refresh_model_indexes():
+    """Rebuilds the model indexes if classes have been mapped since they were built."""
+    if len(Base._decl_class_registry) != _model_registry_size:
+        build_model_indexes()
+
+
+def get_class_by_name(name: str) -> Any:
+    """Returns the mapped class with the given name, or None."""
+    model_cls = model_name_index.get(name)
+    if model_cls is None:
+        # classes may have been mapped after the index was built
+        refresh_model_indexes()
+        model_cls = model_name_index.get(name)
+    return model_cls
+
+
 def get_class_by_tablename(table_fullname: str) -> Any:
     """Return class reference mapped to table."""
 
     def _find_class(name):
-        for c in Base._decl_class_registry.values():
-            if hasattr(c, "__table__"):
-                if c.__table__.fullname.lower() == name.lower():
-                    return c
+        return model_tablename_index.get(name.lower())
 
     mapped_name = resolve_table_name(table_fullname)
+    if not _find_class(mapped_name) and not _find_class(f"dispatch_core.{mapped_name}"):
+        # classes may have been mapped after the index was built
+        refresh_model_indexes()
+
     mapped_class = _find_class(mapped_name)
 
     # try looking in the 'dispatch_core' schema
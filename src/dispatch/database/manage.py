@@ -15,7 +15,7 @@ from dispatch.search.fulltext import (
     sync_trigger,
 )
 
-from .core import Base, sessionmaker
+from .core import Base, register_organization_schema, sessionmaker
 from .enums import DISPATCH_ORGANIZATION_SCHEMA_PREFIX
 
 
@@ -59,6 +59,10 @@ def init_database(engine):
         with engine.connect() as connection:
             connection.execute(CreateSchema(schema_name))
 
+    # required by the trigram indexes used for type-ahead search
+    with engine.connect() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public"))
+
     tables = get_core_tables()
 
     Base.metadata.create_all(engine, tables=tables)
@@ -124,6 +128,8 @@ def init_schema(*, engine, organization: Organization):
     organization = db_session.merge(organization)
     db_session.add(organization)
     db_session.commit()
+
+    register_organization_schema(schema_name)
     return organization
 
 
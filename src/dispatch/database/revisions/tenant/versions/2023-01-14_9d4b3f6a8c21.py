@@ -0,0 +1,45 @@
+"""Adds trigram indexes for type-ahead search
+
+Revision ID: 9d4b3f6a8c21
+Revises: 5e8a2c6b1f47
+Create Date: 2023-01-14 10:41:08.215937
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "9d4b3f6a8c21"
+down_revision = "5e8a2c6b1f47"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("incident", "name"),
+    ("incident", "title"),
+    ("case", "name"),
+    ("case", "title"),
+    ("individual_contact", "name"),
+    ("individual_contact", "email"),
+    ("tag", "name"),
+    ("term", "text"),
+]
+
+
+def upgrade():
+    # the tenant search path doesn't include the public schema
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public")
+    for table, column in INDEXES:
+        op.create_index(
+            f"ix_{table}_{column}_trgm",
+            table,
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "public.gin_trgm_ops"},
+        )
+
+
+def downgrade():
+    for table, column in INDEXES:
+        op.drop_index(f"ix_{table}_{column}_trgm", table_name=table)
@@ -1,32 +1,36 @@
+import base64
+import functools
 import json
 import logging
 
 from collections import namedtuple
 from collections.abc import Iterable
+from datetime import date, datetime
 from inspect import signature
 from itertools import chain
 from six import string_types
 from sortedcontainers import SortedSet
 
-from typing import List
+from typing import Any, List, Optional, Tuple
 from pydantic.error_wrappers import ErrorWrapper, ValidationError
 from pydantic import BaseModel
 from pydantic.types import Json, constr
 
 from fastapi import Depends, Query
 
-from sqlalchemy import and_, not_, or_, orm, func, desc
+from sqlalchemy import and_, exists, not_, or_, orm, func, desc, false
 from sqlalchemy.exc import InvalidRequestError, ProgrammingError
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy_filters import apply_pagination, apply_sort
-from sqlalchemy_filters.exceptions import BadFilterFormat, FieldNotFound
-from sqlalchemy_filters.models import Field, get_model_from_spec
+from sqlalchemy_filters.exceptions import BadFilterFormat, BadSpec, FieldNotFound
+from sqlalchemy_filters.models import Field
 
 from dispatch.auth.models import DispatchUser
 from dispatch.auth.service import get_current_user, get_current_role
+from dispatch.config import FILTER_CACHE_SIZE, SEARCH_RESULTS_PER_TYPE
 from dispatch.data.query.models import Query as QueryModel
 from dispatch.data.source.models import Source
-from dispatch.enums import UserRoles, Visibility
+from dispatch.enums import TotalCount, UserRoles, Visibility
 from dispatch.exceptions import FieldNotFoundError, InvalidFilterError
 from dispatch.feedback.models import Feedback
 from dispatch.incident.models import Incident
@@ -35,10 +39,13 @@ from dispatch.individual.models import IndividualContact
 from dispatch.participant.models import Participant
 from dispatch.plugin.models import Plugin, PluginInstance
 from dispatch.search.fulltext.composite_search import CompositeSearch
+from dispatch.search.fulltext.query import InvalidSearchQuery, to_tsquery
+from dispatch.search.fulltext.query import parse as parse_search_query
 from dispatch.task.models import Task
 
 from .core import (
     Base,
+    get_class_by_name,
     get_class_by_tablename,
     get_model_name_by_tablename,
     get_db,
@@ -118,12 +125,12 @@ class Filter(object):
             return {self.filter_spec["model"]}
         return set()
 
-    def format_for_sqlalchemy(self, query, default_model):
+    def format_for_sqlalchemy(self, query_models, default_model):
         filter_spec = self.filter_spec
         operator = self.operator
         value = self.value
 
-        model = get_model_from_spec(filter_spec, query, default_model)
+        model = get_filter_model(filter_spec, query_models, default_model)
 
         function = operator.function
         arity = operator.arity
@@ -152,9 +159,9 @@ class BooleanFilter(object):
                 models.add(*named_models)
         return models
 
-    def format_for_sqlalchemy(self, query, default_model):
+    def format_for_sqlalchemy(self, query_models, default_model):
         return self.function(
-            *[filter.format_for_sqlalchemy(query, default_model) for filter in self.filters]
+            *[filter.format_for_sqlalchemy(query_models, default_model) for filter in self.filters]
         )
 
 
@@ -194,6 +201,34 @@ def build_filters(filter_spec):
     return [Filter(filter_spec)]
 
 
+@functools.lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _get_filters(filter_spec_json: str):
+    return tuple(build_filters(json.loads(filter_spec_json)))
+
+
+def get_filters(filter_spec):
+    """Returns the parsed filter trees of a filter spec, cached by its canonical json."""
+    try:
+        filter_spec_json = json.dumps(filter_spec, sort_keys=True)
+    except (TypeError, ValueError):
+        return build_filters(filter_spec)
+    return list(_get_filters(filter_spec_json))
+
+
+def get_filter_model(filter_spec, query_models, default_model):
+    """Returns the model a filter applies to, the named one must be part of the query."""
+    model_name = filter_spec.get("model")
+    if model_name is None:
+        if default_model is None:
+            raise BadSpec("Ambiguous spec. Please specify a model.")
+        return default_model
+
+    model = query_models.get(model_name)
+    if model is None:
+        raise BadSpec("The query does not contain model `{}`.".format(model_name))
+    return model
+
+
 def get_query_models(query):
     """Get models from query.
 
@@ -221,9 +256,7 @@ def get_query_models(query):
 
 def get_model_class_by_name(registry, name):
     """Return the model class matching `name` in the given `registry`."""
-    for cls in registry.values():
-        if getattr(cls, "__name__", None) == name:
-            return cls
+    return get_class_by_name(name)
 
 
 def get_named_models(filters):
@@ -249,15 +282,14 @@ def auto_join(query, model_names):
     """Automatically join models to `query` if they're not already present
     and the join can be done implicitly.
     """
-    # every model has access to the registry, so we can use any from the query
-    query_models = get_query_models(query).values()
-    model_registry = list(query_models)[-1]._decl_class_registry
+    query_models = set(get_query_models(query).values())
 
     for name in model_names:
-        model = get_model_class_by_name(model_registry, name)
-        if model not in get_query_models(query).values():
+        model = get_class_by_name(name)
+        if model not in query_models:
             try:
                 query = query.join(model)
+                query_models.add(model)
             except InvalidRequestError:
                 pass  # can't be autojoined
     return query
@@ -315,7 +347,7 @@ def apply_filters(query, filter_spec, model_cls=None, do_auto_join=True):
                     The :class:`sqlalchemy.orm.Query` instance after all the filters
                     have been applied.
     """
-    filters = build_filters(filter_spec)
+    filters = get_filters(filter_spec)
     default_model = get_default_model(query)
     if not default_model:
         default_model = model_cls
@@ -324,7 +356,10 @@ def apply_filters(query, filter_spec, model_cls=None, do_auto_join=True):
     if do_auto_join:
         query = auto_join(query, filter_models)
 
-    sqlalchemy_filters = [filter.format_for_sqlalchemy(query, default_model) for filter in filters]
+    query_models = get_query_models(query)
+    sqlalchemy_filters = [
+        filter.format_for_sqlalchemy(query_models, default_model) for filter in filters
+    ]
 
     if sqlalchemy_filters:
         query = query.filter(*sqlalchemy_filters)
@@ -332,54 +367,84 @@ def apply_filters(query, filter_spec, model_cls=None, do_auto_join=True):
     return query
 
 
+# this is required because by default sqlalchemy-filter's auto-join
+# knows nothing about how to join many-many relationships.
+# (model, filter model name) -> (joined model, is outer join)
+FILTER_SPECIFIC_JOINS = {
+    (Feedback, "Project"): (Incident, False),
+    (Feedback, "Incident"): (Incident, False),
+    (Task, "Project"): (Incident, False),
+    (Task, "Incident"): (Incident, False),
+    (Task, "IncidentPriority"): (Incident, False),
+    (Task, "IncidentType"): (Incident, False),
+    (PluginInstance, "Plugin"): (Plugin, False),
+    (Source, "Tag"): (Source.tags, True),
+    (Source, "TagType"): (Source.tags, True),
+    (QueryModel, "Tag"): (QueryModel.tags, True),
+    (QueryModel, "TagType"): (QueryModel.tags, True),
+    (DispatchUser, "Organization"): (DispatchUser.organizations, True),
+    (Incident, "Tag"): (Incident.tags, True),
+    (Incident, "TagType"): (Incident.tags, True),
+    (Incident, "Term"): (Incident.terms, True),
+}
+
+
 def apply_filter_specific_joins(model: Base, filter_spec: dict, query: orm.query):
-    """Applies any model specific implicity joins."""
-    # this is required because by default sqlalchemy-filter's auto-join
-    # knows nothing about how to join many-many relationships.
-    model_map = {
-        (Feedback, "Project"): (Incident, False),
-        (Feedback, "Incident"): (Incident, False),
-        (Task, "Project"): (Incident, False),
-        (Task, "Incident"): (Incident, False),
-        (Task, "IncidentPriority"): (Incident, False),
-        (Task, "IncidentType"): (Incident, False),
-        (PluginInstance, "Plugin"): (Plugin, False),
-        (Source, "Tag"): (Source.tags, True),
-        (Source, "TagType"): (Source.tags, True),
-        (QueryModel, "Tag"): (QueryModel.tags, True),
-        (QueryModel, "TagType"): (QueryModel.tags, True),
-        (DispatchUser, "Organization"): (DispatchUser.organizations, True),
-        (Incident, "Tag"): (Incident.tags, True),
-        (Incident, "TagType"): (Incident.tags, True),
-        (Incident, "Term"): (Incident.terms, True),
-    }
-    filters = build_filters(filter_spec)
-    filter_models = get_named_models(filters)[0]
+    """Applies any model specific implicity joins.
+
+    The models of every filter are joined, models sharing a join are joined once.
+    """
+    filters = get_filters(filter_spec)
+    filter_models = sorted(set().union(*get_named_models(filters)))
+    joined_models = []
     for filter_model in filter_models:
-        if model_map.get((model, filter_model)):
-            joined_model, is_outer = model_map[(model, filter_model)]
+        if FILTER_SPECIFIC_JOINS.get((model, filter_model)):
+            joined_model, is_outer = FILTER_SPECIFIC_JOINS[(model, filter_model)]
+            if any(joined_model is j for j in joined_models):
+                continue
             try:
                 query = query.join(joined_model, isouter=is_outer)
+                joined_models.append(joined_model)
             except Exception as e:
                 log.debug(str(e))
 
     return query
 
 
-def composite_search(*, db_session, query_str: str, models: List[Base], current_user: DispatchUser):
-    """Perform a multi-table search based on the supplied query."""
-    s = CompositeSearch(db_session, models)
-    query = s.build_query(query_str, sort=True)
+def composite_search(
+    *,
+    db_session,
+    query_str: str,
+    models: List[Base],
+    current_user: DispatchUser,
+    limit: int = SEARCH_RESULTS_PER_TYPE,
+):
+    """Perform a multi-table search based on the supplied query.
+
+    Returns the top `limit` ranked objects of each model. Restricted incidents are
+    only returned to admins of the incident's project.
+    """
+    admin_project_ids = [p.project_id for p in current_user.projects if p.role == UserRoles.admin]
+    filters = {
+        Incident: [
+            or_(Incident.visibility == Visibility.open, Incident.project_id.in_(admin_project_ids))
+        ]
+    }
 
-    # TODO can we do this with composite filtering?
-    # for model in models:
-    # 	 query = apply_model_specific_filters(model, query, current_user)
+    s = CompositeSearch(db_session, models, filters=filters)
+    try:
+        return s.ranked_search(query_str, limit=limit)
+    except InvalidSearchQuery as e:
+        raise ValidationError(
+            [ErrorWrapper(InvalidFilterError(msg=str(e)), loc="q")], model=BaseModel
+        )
 
-    return s.search(query=query)
 
+def search(*, query_str: str, query: Query, model: str, sort=False, prefix=True):
+    """Perform a search based on the query.
 
-def search(*, query_str: str, query: Query, model: str, sort=False):
-    """Perform a search based on the query."""
+    The query is parsed once and its tsquery is shared by the filter and the ranking.
+    """
     search_model = get_class_by_tablename(model)
 
     if not query_str.strip():
@@ -387,11 +452,22 @@ def search(*, query_str: str, query: Query, model: str, sort=False):
 
     vector = search_model.search_vector
 
-    query = query.filter(vector.op("@@")(func.tsq_parse(query_str)))
+    try:
+        tsquery = parse_search_query(query_str, prefix=prefix)
+    except InvalidSearchQuery as e:
+        raise ValidationError(
+            [ErrorWrapper(InvalidFilterError(msg=str(e)), loc="q")], model=BaseModel
+        )
+
+    if tsquery is None:
+        return query.filter(false())
+
+    tsquery = to_tsquery(tsquery)
+    query = query.filter(vector.op("@@")(tsquery))
     if sort:
-        query = query.order_by(desc(func.ts_rank_cd(vector, func.tsq_parse(query_str))))
+        query = query.order_by(desc(func.ts_rank_cd(vector, tsquery)))
 
-    return query.params(term=query_str)
+    return query
 
 
 def create_sort_spec(model, sort_by, descending):
@@ -447,34 +523,172 @@ def common_parameters(
     }
 
 
-def search_filter_sort_paginate(
+def keyset_parameters(
+    common: dict = Depends(common_parameters),
+    cursor: str = Query(None),
+    total_count: TotalCount = Query(TotalCount.exact, alias="totalCount"),
+):
+    """Common parameters of the list views whose pagination models have an optional
+    total and a next cursor."""
+    return {**common, "cursor": cursor, "total_count": total_count}
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encodes the sort values of the last item of a page into an opaque cursor."""
+    data = json.dumps(
+        [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values],
+        default=str,
+    )
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor: str, columns: List[Any]) -> List[Any]:
+    """Decodes a cursor into the sort values of the last item of the previous page."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("Cursor doesn't match the sort columns.")
+
+        decoded = []
+        for column, value in zip(columns, values):
+            python_type = column.type.python_type
+            if value is not None and python_type in (date, datetime):
+                value = python_type.fromisoformat(value)
+            decoded.append(value)
+        return decoded
+    except (TypeError, ValueError, NotImplementedError) as e:
+        raise ValidationError(
+            [ErrorWrapper(InvalidFilterError(msg=f"Invalid cursor. {e}"), loc="cursor")],
+            model=BaseModel,
+        )
+
+
+def get_keyset_columns(model_cls, sort_by: List[str], descending: List[bool]) -> List[Tuple]:
+    """Returns the (column, descending) pairs a keyset is sorted on.
+
+    The primary key is always appended so that the order is total.
+    """
+    sort_by, descending = sort_by or [], descending or []
+    if len(sort_by) != len(descending):
+        raise ValidationError(
+            [
+                ErrorWrapper(
+                    InvalidFilterError(
+                        msg="Cursor pagination requires a descending value for each sort column."
+                    ),
+                    loc="cursor",
+                )
+            ],
+            model=BaseModel,
+        )
+
+    keyset = []
+    for field, direction in zip(sort_by, descending):
+        column = getattr(model_cls, field, None) if "." not in field else None
+        if column is None or not hasattr(column, "type"):
+            raise ValidationError(
+                [
+                    ErrorWrapper(
+                        InvalidFilterError(
+                            msg=f"Cursor pagination can't sort by {field}. Only {model_cls.__name__} columns are supported."
+                        ),
+                        loc="sortBy",
+                    )
+                ],
+                model=BaseModel,
+            )
+        keyset.append((column, direction))
+
+    keyset.append((model_cls.id, keyset[-1][1] if keyset else False))
+    return keyset
+
+
+def keyset_after(column, value, descending: bool):
+    """Returns a condition that is true for rows sorted after the given value.
+
+    Follows the postgres default of sorting nulls last in ascending order and
+    first in descending order.
+    """
+    if descending:
+        return column.isnot(None) if value is None else column < value
+    return false() if value is None else or_(column > value, column.is_(None))
+
+
+def keyset_equal(column, value):
+    """Returns a condition that is true for rows with the given value."""
+    return column.is_(None) if value is None else column == value
+
+
+def apply_keyset(query: orm.Query, keyset: List[Tuple], values: List[Any]) -> orm.Query:
+    """Filters a query to the rows sorted after the given keyset values."""
+    conditions = []
+    for i, ((column, descending), value) in enumerate(zip(keyset, values)):
+        conditions.append(
+            and_(
+                *[keyset_equal(c, v) for (c, _), v in zip(keyset[:i], values[:i])],
+                keyset_after(column, value, descending),
+            )
+        )
+    return query.filter(or_(*conditions))
+
+
+def count_results(db_session, query: orm.Query, total_count: TotalCount) -> Optional[int]:
+    """Counts the results of a query, either exactly or using the query planner's estimate."""
+    if total_count == TotalCount.none:
+        return None
+
+    query = query.order_by(None)
+    if total_count == TotalCount.exact:
+        return query.count()
+
+    # the statement is rendered as text, tenant tables must be qualified with their schema
+    bind = db_session.get_bind()
+    statement = query.statement.compile(
+        dialect=bind.dialect,
+        schema_translate_map=bind.get_execution_options().get("schema_translate_map"),
+    )
+    plan = (
+        db_session.connection()
+        .execute(f"EXPLAIN (FORMAT JSON) {statement}", statement.params)
+        .scalar()
+    )
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def search_filter_sort(
     db_session,
     model,
     query_str: str = None,
     filter_spec: List[dict] = None,
-    page: int = 1,
-    items_per_page: int = 5,
     sort_by: List[str] = None,
     descending: List[bool] = None,
     current_user: DispatchUser = None,
     role: UserRoles = UserRoles.member,
-):
-    """Common functionality for searching, filtering, sorting, and pagination."""
+    sort: bool = True,
+) -> orm.Query:
+    """Builds the searched, filtered and sorted query of a list view."""
     model_cls = get_class_by_tablename(model)
     try:
         query = db_session.query(model_cls)
 
         if query_str:
-            sort = False if sort_by else True
-            query = search(query_str=query_str, query=query, model=model, sort=sort)
+            rank = sort and not sort_by
+            query = search(query_str=query_str, query=query, model=model, sort=rank)
 
         query = apply_model_specific_filters(model_cls, query, current_user, role)
 
         if filter_spec:
-            query = apply_filter_specific_joins(model_cls, filter_spec, query)
-            query = apply_filters(query, filter_spec, model_cls)
+            # filters may join one-to-many relationships, we match the ids in a
+            # subquery so that the rows aren't multiplied by the joined rows
+            filtered = apply_filter_specific_joins(
+                model_cls, filter_spec, db_session.query(model_cls.id)
+            )
+            filtered = apply_filters(filtered, filter_spec, model_cls)
+            query = query.filter(model_cls.id.in_(filtered))
 
-        if sort_by:
+        if sort and sort_by:
             sort_spec = create_sort_spec(model, sort_by, descending)
             query = apply_sort(query, sort_spec)
 
@@ -490,6 +704,52 @@ def search_filter_sort_paginate(
             [ErrorWrapper(InvalidFilterError(msg=str(e)), loc="filter")], model=BaseModel
         )
 
+    return query
+
+
+def search_filter_sort_paginate(
+    db_session,
+    model,
+    query_str: str = None,
+    filter_spec: List[dict] = None,
+    page: int = 1,
+    items_per_page: int = 5,
+    sort_by: List[str] = None,
+    descending: List[bool] = None,
+    cursor: str = None,
+    total_count: TotalCount = TotalCount.exact,
+    current_user: DispatchUser = None,
+    role: UserRoles = UserRoles.member,
+):
+    """Common functionality for searching, filtering, sorting, and pagination.
+
+    When a cursor is given (an empty one for the first page), pages are fetched by seeking
+    past the sort values of the previous page instead of using an offset.
+    """
+    query = search_filter_sort(
+        db_session,
+        model,
+        query_str=query_str,
+        filter_spec=filter_spec,
+        sort_by=sort_by,
+        descending=descending,
+        current_user=current_user,
+        role=role,
+        sort=cursor is None,
+    )
+
+    if cursor is not None:
+        return keyset_paginate(
+            db_session=db_session,
+            query=query,
+            model_cls=get_class_by_tablename(model),
+            cursor=cursor,
+            items_per_page=items_per_page,
+            sort_by=sort_by,
+            descending=descending,
+            total_count=total_count,
+        )
+
     if items_per_page == -1:
         items_per_page = None
 
@@ -498,6 +758,17 @@ def search_filter_sort_paginate(
     # e.g. websearch_to_tsquery
     # https://www.postgresql.org/docs/current/textsearch-controls.html
     try:
+        if total_count != TotalCount.exact:
+            total = count_results(db_session, query, total_count)
+            if items_per_page:
+                query = query.limit(items_per_page).offset((page - 1) * items_per_page)
+            return {
+                "items": query.all(),
+                "itemsPerPage": items_per_page,
+                "page": page,
+                "total": total,
+            }
+
         query, pagination = apply_pagination(query, page_number=page, page_size=items_per_page)
     except ProgrammingError as e:
         log.debug(e)
@@ -516,21 +787,67 @@ def search_filter_sort_paginate(
     }
 
 
+def keyset_paginate(
+    *,
+    db_session,
+    query: orm.Query,
+    model_cls,
+    cursor: str,
+    items_per_page: int,
+    sort_by: List[str],
+    descending: List[bool],
+    total_count: TotalCount,
+):
+    """Fetches the page of a query that follows a cursor, seeking on the sort columns."""
+    keyset = get_keyset_columns(model_cls, sort_by, descending)
+
+    if items_per_page == -1:
+        items_per_page = None
+
+    try:
+        total = count_results(db_session, query, total_count)
+
+        if cursor:
+            query = apply_keyset(query, keyset, decode_cursor(cursor, [c for c, _ in keyset]))
+
+        query = query.order_by(*[c.desc() if d else c.asc() for c, d in keyset])
+
+        # we fetch one more item to know if there is a next page
+        if items_per_page:
+            query = query.limit(items_per_page + 1)
+        items = query.all()
+    except ProgrammingError as e:
+        log.debug(e)
+        return {"items": [], "itemsPerPage": items_per_page, "page": 1, "total": 0, "next": None}
+
+    next_cursor = None
+    if items_per_page and len(items) > items_per_page:
+        items = items[:items_per_page]
+        next_cursor = encode_cursor([getattr(items[-1], c.key) for c, _ in keyset])
+
+    return {
+        "items": items,
+        "itemsPerPage": items_per_page,
+        "page": 1,
+        "total": total,
+        "next": next_cursor,
+    }
+
+
 def restricted_incident_filter(query: orm.Query, current_user: DispatchUser, role: UserRoles):
     """Adds additional incident filters to query (usually for permissions)."""
     if role == UserRoles.member:
         # We filter out resticted incidents for users with a member role if the user is not an incident participant
-        query = (
-            query.join(Participant, Incident.id == Participant.incident_id)
-            .join(IndividualContact)
-            .filter(
-                or_(
-                    Incident.visibility == Visibility.open,
-                    IndividualContact.email == current_user.email,
-                )
+        # we use a semi-join so that the incident rows aren't multiplied by their participants
+        is_participant = exists().where(
+            and_(
+                Participant.incident_id == Incident.id,
+                Participant.individual_contact_id == IndividualContact.id,
+                IndividualContact.email == current_user.email,
             )
         )
-    return query.distinct()
+        query = query.filter(or_(Incident.visibility == Visibility.open, is_participant))
+    return query
 
 
 def restricted_incident_type_filter(query: orm.Query, current_user: DispatchUser):
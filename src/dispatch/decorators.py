@@ -1,14 +1,16 @@
-from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
 from typing import Any, List
 import inspect
 import logging
 import time
 
+from dispatch.config import SCHEDULER_PROJECT_MAX_WORKERS
 from dispatch.metrics import provider as metrics_provider
 from dispatch.organization import service as organization_service
 from dispatch.project import service as project_service
 
-from .database.core import SessionLocal, engine, sessionmaker
+from .database.core import SessionLocal, get_organization_session, get_session_stats
 
 
 log = logging.getLogger(__name__)
@@ -19,12 +21,57 @@ def fullname(o):
     return f"{module.__name__}.{o.__qualname__}"
 
 
-def scheduled_project_task(func):
+def report_session_stats():
+    """Sends the database connection pool usage as gauge metrics."""
+    stats = get_session_stats()
+    for name, value in stats["pool"].items():
+        metrics_provider.gauge(f"database.pool.{name}", value=value)
+    metrics_provider.gauge("database.schemas", value=stats["schemas"])
+
+
+def run_project_task(func, organization_slug: str, project, *args, **kwargs):
+    """Runs a task for a single project, isolating and timing it."""
+    start = time.perf_counter()
+    try:
+        func(*args, project=project, **kwargs)
+    except Exception as e:
+        log.exception(e)
+    finally:
+        elapsed_time = time.perf_counter() - start
+        metrics_provider.timer(
+            "function.project.elapsed.time",
+            value=elapsed_time,
+            tags={
+                "function": fullname(func),
+                "organization": organization_slug,
+                "project": project.name,
+            },
+        )
+
+
+def run_project_task_in_session(func, organization_slug: str, project_id: int, *args, **kwargs):
+    """Runs a task for a single project with its own database session."""
+    db_session = get_organization_session(organization_slug)
+    try:
+        project = project_service.get(db_session=db_session, project_id=project_id)
+        run_project_task(func, organization_slug, project, *args, db_session=db_session, **kwargs)
+    except Exception as e:
+        log.exception(e)
+    finally:
+        db_session.close()
+
+
+def scheduled_project_task(func=None, *, max_workers: int = SCHEDULER_PROJECT_MAX_WORKERS):
     """Decorator that sets up a background task function with
     a database session and exception tracking.
 
-    Each task is executed in a specific project context.
+    Each task is executed in a specific project context. When `max_workers` is
+    greater than one, projects are run concurrently on a pool of threads, each
+    with its own database session. Tasks that use plugin instances shouldn't opt in,
+    as plugins are shared and configured per project.
     """
+    if func is None:
+        return partial(scheduled_project_task, max_workers=max_workers)
 
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -32,25 +79,40 @@ def scheduled_project_task(func):
         metrics_provider.counter("function.call.counter", tags={"function": fullname(func)})
         start = time.perf_counter()
 
-        # iterate for all schema
-        for organization in organization_service.get_all(db_session=db_session):
-            schema_engine = engine.execution_options(
-                schema_translate_map={None: f"dispatch_organization_{organization.slug}"}
-            )
-            schema_session = sessionmaker(bind=schema_engine)()
-            kwargs["db_session"] = schema_session
-            for project in project_service.get_all(db_session=schema_session):
-                kwargs["project"] = project
-                try:
-                    func(*args, **kwargs)
-                except Exception as e:
-                    log.exception(e)
-            schema_session.close()
+        if max_workers > 1:
+            project_keys = []
+            for organization in organization_service.get_all(db_session=db_session):
+                schema_session = get_organization_session(organization.slug)
+                for project in project_service.get_all(db_session=schema_session):
+                    project_keys.append((organization.slug, project.id))
+                schema_session.close()
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for organization_slug, project_id in project_keys:
+                    executor.submit(
+                        run_project_task_in_session,
+                        func,
+                        organization_slug,
+                        project_id,
+                        *args,
+                        **kwargs,
+                    )
+        else:
+            # iterate for all schema
+            for organization in organization_service.get_all(db_session=db_session):
+                schema_session = get_organization_session(organization.slug)
+                for project in project_service.get_all(db_session=schema_session):
+                    run_project_task(
+                        func, organization.slug, project, *args, db_session=schema_session, **kwargs
+                    )
+                schema_session.close()
+
         elapsed_time = time.perf_counter() - start
         metrics_provider.timer(
             "function.elapsed.time", value=elapsed_time, tags={"function": fullname(func)}
         )
         db_session.close()
+        report_session_stats()
 
     return wrapper
 
@@ -70,15 +132,8 @@ def background_task(func):
             if not kwargs.get("organization_slug"):
                 raise Exception("If not db_session is supplied organization slug must be provided.")
 
-            schema_engine = engine.execution_options(
-                schema_translate_map={
-                    None: f"dispatch_organization_{kwargs['organization_slug']}",
-                }
-            )
-            db_session = sessionmaker(bind=schema_engine)
-
             background = True
-            kwargs["db_session"] = db_session()
+            kwargs["db_session"] = get_organization_session(kwargs["organization_slug"])
         try:
             metrics_provider.counter("function.call.counter", tags={"function": fullname(func)})
             start = time.perf_counter()
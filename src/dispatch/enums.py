@@ -18,6 +18,17 @@ class Visibility(DispatchEnum):
     restricted = "Restricted"
 
 
+class ExportFormat(DispatchEnum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+class TotalCount(DispatchEnum):
+    exact = "exact"
+    estimated = "estimated"
+    none = "none"
+
+
 class SearchTypes(DispatchEnum):
     definition = "Definition"
     document = "Document"
@@ -36,6 +47,14 @@ class SearchTypes(DispatchEnum):
     term = "Term"
 
 
+class TypeaheadTypes(DispatchEnum):
+    case = "Case"
+    incident = "Incident"
+    individual_contact = "IndividualContact"
+    tag = "Tag"
+    term = "Term"
+
+
 class UserRoles(DispatchEnum):
     owner = "Owner"
     manager = "Manager"
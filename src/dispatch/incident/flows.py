@@ -841,6 +841,11 @@ def incident_create_flow(*, organization_slug: str, incident_id: int, db_session
             incident.conversation = conversation_service.create(
                 db_session=db_session, conversation_in=conversation_in
             )
+            conversation_service.set_channel_organization(
+                db_session=db_session,
+                channel_id=conversation["id"],
+                organization_id=incident.project.organization_id,
+            )
 
             event_service.log_incident_event(
                 db_session=db_session,
@@ -7,6 +7,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     PrimaryKeyConstraint,
     String,
@@ -70,6 +71,21 @@ assoc_incident_tags = Table(
 
 
 class Incident(Base, TimeStampMixin, ProjectMixin):
+    __table_args__ = (
+        Index(
+            "ix_incident_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_incident_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
+
     id = Column(Integer, primary_key=True)
     name = Column(String)
     title = Column(String, nullable=False)
@@ -342,7 +358,8 @@ class IncidentRead(IncidentReadMinimal):
 
 
 class IncidentPagination(DispatchBase):
-    total: int
-    itemsPerPage: int
+    total: Optional[int]
+    itemsPerPage: Optional[int]
     page: int
+    next: Optional[str] = None
     items: List[IncidentRead] = []
@@ -15,13 +15,13 @@ from dispatch.messaging.strings import (
     INCIDENT_DAILY_REPORT_TITLE,
     MessageType,
 )
-from dispatch.nlp import build_phrase_matcher, build_term_vocab, extract_terms_from_text
+from dispatch.nlp import extract_terms_from_text
 from dispatch.notification import service as notification_service
 from dispatch.plugin import service as plugin_service
 from dispatch.project.models import Project
 from dispatch.scheduler import scheduler
 from dispatch.search_filter import service as search_filter_service
-from dispatch.tag import service as tag_service
+from dispatch.tag import matcher as tag_matcher
 from dispatch.tag.models import Tag
 
 from .enums import IncidentStatus
@@ -40,17 +40,15 @@ log = logging.getLogger(__name__)
 @scheduled_project_task
 def auto_tagger(db_session: SessionLocal, project: Project):
     """Attempts to take existing tags and associate them with incidents."""
-    tags = tag_service.get_all(db_session=db_session, project_id=project.id).all()
-    log.debug(f"Fetched {len(tags)} tags from database.")
+    matcher = tag_matcher.get_matcher(db_session=db_session, project=project)
 
-    tag_strings = [t.name.lower() for t in tags if t.discoverable]
-    phrases = build_term_vocab(tag_strings)
-    matcher = build_phrase_matcher("dispatch-tag", phrases)
+    # all incidents belong to the same project, so they share the storage plugin
+    plugin = plugin_service.get_active_instance(
+        db_session=db_session, project_id=project.id, plugin_type="storage"
+    )
 
-    for incident in get_all(db_session=db_session, project_id=project.id).all():
-        plugin = plugin_service.get_active_instance(
-            db_session=db_session, project_id=incident.project.id, plugin_type="storage"
-        )
+    incidents = get_all(db_session=db_session, project_id=project.id, load_profile="tagger").all()
+    for incident in incidents:
 
         log.debug(f"Processing incident. Name: {incident.name}")
 
@@ -87,19 +85,24 @@ def daily_report(db_session: SessionLocal, project: Project):
     """Creates and sends incident daily reports based on notifications."""
     # we fetch all active, stable and closed incidents
     active_incidents = get_all_by_status(
-        db_session=db_session, project_id=project.id, status=IncidentStatus.active
+        db_session=db_session,
+        project_id=project.id,
+        status=IncidentStatus.active,
+        load_profile="daily_report",
     )
     stable_incidents = get_all_last_x_hours_by_status(
         db_session=db_session,
         project_id=project.id,
         status=IncidentStatus.stable,
         hours=24,
+        load_profile="daily_report",
     )
     closed_incidents = get_all_last_x_hours_by_status(
         db_session=db_session,
         project_id=project.id,
         status=IncidentStatus.closed,
         hours=24,
+        load_profile="daily_report",
     )
     incidents = active_incidents + stable_incidents + closed_incidents
 
@@ -108,15 +111,15 @@ def daily_report(db_session: SessionLocal, project: Project):
     notifications = notification_service.get_all_enabled(
         db_session=db_session, project_id=project.id
     )
+    matches = search_filter_service.match_many(
+        db_session=db_session,
+        search_filters=[f for n in notifications for f in n.filters],
+        class_instances=incidents,
+    )
     for incident in incidents:
         for notification in notifications:
             for search_filter in notification.filters:
-                match = search_filter_service.match(
-                    db_session=db_session,
-                    filter_spec=search_filter.expression,
-                    class_instance=incident,
-                )
-                if match:
+                if incident.id in matches[search_filter.id]:
                     incidents_notification_filters_mapping[notification.id][
                         search_filter.id
                     ].append(incident)
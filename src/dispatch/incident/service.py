@@ -9,6 +9,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import List, Optional
 from pydantic.error_wrappers import ErrorWrapper, ValidationError
+from sqlalchemy.orm import joinedload, selectinload
 
 from dispatch.case import service as case_service
 from dispatch.database.core import SessionLocal
@@ -32,6 +33,60 @@ from .models import Incident, IncidentCreate, IncidentRead, IncidentUpdate
 
 log = logging.getLogger(__name__)
 
+# relationships eagerly loaded with the incidents used by each job
+# paths are dotted relationship names, each segment is loaded with the given strategy
+LOAD_PROFILES = {
+    "reminders": [
+        (joinedload, "incident_priority"),
+        (joinedload, "project"),
+        (joinedload, "commander.individual"),
+        (selectinload, "reports"),
+    ],
+    "sync": [
+        (joinedload, "project"),
+        (joinedload, "conversation"),
+        (joinedload, "incident_document"),
+        (joinedload, "incident_review_document"),
+        (selectinload, "monitors"),
+    ],
+    "tagger": [
+        (joinedload, "project"),
+        (joinedload, "incident_document"),
+        (selectinload, "tags"),
+    ],
+    "cost": [
+        (joinedload, "project"),
+        (selectinload, "participants.participant_roles"),
+    ],
+    # the relationships search filters are evaluated on and the report is rendered from
+    "daily_report": [
+        (joinedload, "project.organization"),
+        (joinedload, "incident_type"),
+        (joinedload, "incident_priority"),
+        (joinedload, "incident_severity"),
+        (joinedload, "commander.individual"),
+        (joinedload, "ticket"),
+        (selectinload, "tags.tag_type"),
+        (selectinload, "terms"),
+    ],
+}
+
+
+def get_load_options(profile: Optional[str]) -> list:
+    """Returns the loader options of a named loading profile."""
+    if not profile:
+        return []
+
+    options = []
+    for strategy, path in LOAD_PROFILES[profile]:
+        model_cls, option = Incident, None
+        for name in path.split("."):
+            attr = getattr(model_cls, name)
+            option = strategy(attr) if option is None else getattr(option, strategy.__name__)(attr)
+            model_cls = attr.property.mapper.class_
+        options.append(option)
+    return options
+
 
 def resolve_and_associate_role(
     db_session: SessionLocal, incident: Incident, role: ParticipantRoleType
@@ -62,9 +117,14 @@ def resolve_and_associate_role(
     return email_address, service_id
 
 
-def get(*, db_session, incident_id: int) -> Optional[Incident]:
+def get(*, db_session, incident_id: int, load_profile: str = None) -> Optional[Incident]:
     """Returns an incident based on the given id."""
-    return db_session.query(Incident).filter(Incident.id == incident_id).first()
+    return (
+        db_session.query(Incident)
+        .options(*get_load_options(load_profile))
+        .filter(Incident.id == incident_id)
+        .first()
+    )
 
 
 def get_by_name(*, db_session, project_id: int, name: str) -> Optional[Incident]:
@@ -97,15 +157,24 @@ def get_by_name_or_raise(*, db_session, project_id: int, incident_in: IncidentRe
     return incident
 
 
-def get_all(*, db_session, project_id: int) -> List[Optional[Incident]]:
+def get_all(
+    *, db_session, project_id: int, load_profile: str = None
+) -> List[Optional[Incident]]:
     """Returns all incidents."""
-    return db_session.query(Incident).filter(Incident.project_id == project_id)
+    return (
+        db_session.query(Incident)
+        .options(*get_load_options(load_profile))
+        .filter(Incident.project_id == project_id)
+    )
 
 
-def get_all_by_status(*, db_session, status: str, project_id: int) -> List[Optional[Incident]]:
+def get_all_by_status(
+    *, db_session, status: str, project_id: int, load_profile: str = None
+) -> List[Optional[Incident]]:
     """Returns all incidents based on the given status."""
     return (
         db_session.query(Incident)
+        .options(*get_load_options(load_profile))
         .filter(Incident.status == status)
         .filter(Incident.project_id == project_id)
         .all()
@@ -113,15 +182,15 @@ def get_all_by_status(*, db_session, status: str, project_id: int) -> List[Optio
 
 
 def get_all_last_x_hours_by_status(
-    *, db_session, status: str, hours: int, project_id: int
+    *, db_session, status: str, hours: int, project_id: int, load_profile: str = None
 ) -> List[Optional[Incident]]:
     """Returns all incidents of a given status in the last x hours."""
     now = datetime.utcnow()
+    query = db_session.query(Incident).options(*get_load_options(load_profile))
 
     if status == IncidentStatus.active:
         return (
-            db_session.query(Incident)
-            .filter(Incident.status == IncidentStatus.active)
+            query.filter(Incident.status == IncidentStatus.active)
             .filter(Incident.created_at >= now - timedelta(hours=hours))
             .filter(Incident.project_id == project_id)
             .all()
@@ -129,8 +198,7 @@ def get_all_last_x_hours_by_status(
 
     if status == IncidentStatus.stable:
         return (
-            db_session.query(Incident)
-            .filter(Incident.status == IncidentStatus.stable)
+            query.filter(Incident.status == IncidentStatus.stable)
             .filter(Incident.stable_at >= now - timedelta(hours=hours))
             .filter(Incident.project_id == project_id)
             .all()
@@ -138,8 +206,7 @@ def get_all_last_x_hours_by_status(
 
     if status == IncidentStatus.closed:
         return (
-            db_session.query(Incident)
-            .filter(Incident.status == IncidentStatus.closed)
+            query.filter(Incident.status == IncidentStatus.closed)
             .filter(Incident.closed_at >= now - timedelta(hours=hours))
             .filter(Incident.project_id == project_id)
             .all()
@@ -7,6 +7,7 @@ from dateutil.relativedelta import relativedelta
 from typing import List
 
 from starlette.requests import Request
+from starlette.responses import StreamingResponse
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 
 from sqlalchemy.orm import Session
@@ -19,9 +20,20 @@ from dispatch.auth.permissions import (
 )
 from dispatch.auth.models import DispatchUser
 from dispatch.auth.service import get_current_user
-from dispatch.common.utils.views import create_pydantic_include
+from dispatch.common.utils.views import (
+    create_pydantic_include,
+    export_csv,
+    export_ndjson,
+    stream_query,
+)
 from dispatch.database.core import get_db
-from dispatch.database.service import common_parameters, search_filter_sort_paginate
+from dispatch.database.service import (
+    common_parameters,
+    keyset_parameters,
+    search_filter_sort,
+    search_filter_sort_paginate,
+)
+from dispatch.enums import ExportFormat
 from dispatch.incident.enums import IncidentStatus
 from dispatch.individual.models import IndividualContactRead
 from dispatch.models import OrganizationSlug, PrimaryKey
@@ -61,7 +73,7 @@ def get_current_incident(*, db_session: Session = Depends(get_db), request: Requ
 @router.get("", summary="Retrieve a list of incidents.")
 def get_incidents(
     *,
-    common: dict = Depends(common_parameters),
+    common: dict = Depends(keyset_parameters),
     include: List[str] = Query([], alias="include[]"),
 ):
     """Retrieves a list of incidents."""
@@ -76,11 +88,46 @@ def get_incidents(
             "itemsPerPage": ...,
             "page": ...,
             "total": ...,
+            "next": ...,
         }
         return json.loads(IncidentPagination(**pagination).json(include=include_fields))
     return json.loads(IncidentPagination(**pagination).json())
 
 
+@router.get("/export", summary="Exports a list of incidents.")
+def export_incidents(
+    *,
+    request: Request,
+    common: dict = Depends(common_parameters),
+    include: List[str] = Query([], alias="include[]"),
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+):
+    """Streams all incidents matching the search, filters and sort as ndjson or csv."""
+    query = search_filter_sort(
+        common["db_session"],
+        "Incident",
+        query_str=common["query_str"],
+        filter_spec=common["filter_spec"],
+        sort_by=common["sort_by"],
+        descending=common["descending"],
+        current_user=common["current_user"],
+        role=common["role"],
+    )
+    rows = stream_query(query, request.state.organization)
+    include_sets = create_pydantic_include(include) if include else None
+
+    if export_format == ExportFormat.csv:
+        return StreamingResponse(
+            export_csv(rows, IncidentRead, include=include_sets),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=incidents.csv"},
+        )
+    return StreamingResponse(
+        export_ndjson(rows, IncidentRead, include=include_sets),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.get(
     "/{incident_id}",
     response_model=IncidentRead,
@@ -2,7 +2,7 @@ from typing import List, Optional
 from dispatch.models import PrimaryKey
 
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, ForeignKey, Integer, Numeric
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric
 from sqlalchemy.ext.associationproxy import association_proxy
 
 from dispatch.database.core import Base
@@ -18,6 +18,8 @@ class IncidentCost(Base, TimeStampMixin, ProjectMixin):
     # columns
     id = Column(Integer, primary_key=True)
     amount = Column(Numeric(precision=10, scale=2), nullable=True)
+    # the last time the amount was calculated, used to only recalculate changed incidents
+    calculated_at = Column(DateTime, nullable=True)
 
     # relationships
     incident_cost_type = relationship("IncidentCostType", backref="incident_cost")
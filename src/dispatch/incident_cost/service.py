@@ -1,20 +1,38 @@
+import logging
 import math
 from datetime import datetime
 
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, distinct, exists, extract, func, or_
 
 from dispatch.database.core import SessionLocal
 from dispatch.incident import service as incident_service
 from dispatch.incident.enums import IncidentStatus
+from dispatch.incident.models import Incident
 from dispatch.incident_cost_type import service as incident_cost_type_service
-from dispatch.participant_role.models import ParticipantRoleType
+from dispatch.incident_cost_type.models import IncidentCostType
+from dispatch.participant.models import Participant
+from dispatch.participant_role.models import ParticipantRole, ParticipantRoleType
+from dispatch.project.models import Project
 
 from .models import IncidentCost, IncidentCostCreate, IncidentCostUpdate
 
 
+log = logging.getLogger(__name__)
+
 HOURS_IN_DAY = 24
 SECONDS_IN_HOUR = 3600
 
+ENGAGEMENT_MULTIPLIERS = {
+    ParticipantRoleType.incident_commander: 1,
+    ParticipantRoleType.scribe: 0.75,
+    ParticipantRoleType.liaison: 0.75,
+    ParticipantRoleType.participant: 0.5,
+    ParticipantRoleType.reporter: 0.5,
+    # ParticipantRoleType.observer: 0, # NOTE: set to 0. It's not used, as we don't calculate cost for participants with observer role
+}
+
 
 def get(*, db_session, incident_cost_id: int) -> Optional[IncidentCost]:
     """Gets an incident cost by its id."""
@@ -92,23 +110,16 @@ def delete(*, db_session, incident_cost_id: int):
 
 def get_engagement_multiplier(participant_role: str):
     """Returns an engagement multiplier for a given incident role."""
-    engagement_mappings = {
-        ParticipantRoleType.incident_commander: 1,
-        ParticipantRoleType.scribe: 0.75,
-        ParticipantRoleType.liaison: 0.75,
-        ParticipantRoleType.participant: 0.5,
-        ParticipantRoleType.reporter: 0.5,
-        # ParticipantRoleType.observer: 0, # NOTE: set to 0. It's not used, as we don't calculate cost for participants with observer role
-    }
-
-    return engagement_mappings.get(participant_role)
+    return ENGAGEMENT_MULTIPLIERS.get(participant_role)
 
 
 def calculate_incident_response_cost(
     incident_id: int, db_session: SessionLocal, incident_review=True
 ):
     """Calculates the response cost of a given incident."""
-    incident = incident_service.get(db_session=db_session, incident_id=incident_id)
+    incident = incident_service.get(
+        db_session=db_session, incident_id=incident_id, load_profile="cost"
+    )
 
     participants_total_response_time_seconds = 0
 
@@ -174,10 +185,25 @@ def calculate_incident_response_cost(
 
         participants_total_response_time_seconds += participant_total_roles_time_seconds
 
+    return get_response_cost_amount(
+        project=incident.project,
+        participants_total_response_time_seconds=participants_total_response_time_seconds,
+        num_participants=len(incident.participants),
+        incident_review=incident_review,
+    )
+
+
+def get_response_cost_amount(
+    *,
+    project: Project,
+    participants_total_response_time_seconds: int,
+    num_participants: int,
+    incident_review=True,
+) -> int:
+    """Calculates a response cost from the time participants spent in their roles."""
     # we calculate the time spent in incident review related activities
     incident_review_hours = 0
     if incident_review:
-        num_participants = len(incident.participants)
         incident_review_prep = (
             1  # we make the assumption that it takes an hour to prepare the incident review
         )
@@ -187,9 +213,7 @@ def calculate_incident_response_cost(
         incident_review_hours = incident_review_prep + incident_review_meeting
 
     # we calculate and round up the hourly rate
-    hourly_rate = math.ceil(
-        incident.project.annual_employee_cost / incident.project.business_year_hours
-    )
+    hourly_rate = math.ceil(project.annual_employee_cost / project.business_year_hours)
 
     # we calculate and round up the incident cost
     incident_cost = math.ceil(
@@ -198,3 +222,177 @@ def calculate_incident_response_cost(
     )
 
     return incident_cost
+
+
+def get_response_cost_candidates(
+    *, db_session, project_id: int, incident_cost_type_id: int, incremental: bool = True
+):
+    """Returns a query of (incident id, response cost) for the incidents whose response cost
+    needs to be calculated.
+
+    In incremental mode these are active incidents, incidents without a calculated cost and
+    incidents whose status or participant roles changed since their cost was calculated.
+    """
+    query = (
+        db_session.query(Incident.id, IncidentCost)
+        .outerjoin(
+            IncidentCost,
+            and_(
+                IncidentCost.incident_id == Incident.id,
+                IncidentCost.incident_cost_type_id == incident_cost_type_id,
+            ),
+        )
+        .filter(Incident.project_id == project_id)
+    )
+
+    if not incremental:
+        return query
+
+    # a role of the incident was assumed or renounced since its cost was calculated
+    role_changed = exists().where(
+        and_(
+            Participant.incident_id == Incident.id,
+            ParticipantRole.participant_id == Participant.id,
+            or_(
+                ParticipantRole.assumed_at > IncidentCost.calculated_at,
+                ParticipantRole.renounced_at > IncidentCost.calculated_at,
+            ),
+        )
+    )
+
+    return query.filter(
+        or_(
+            Incident.status == IncidentStatus.active,
+            IncidentCost.id.is_(None),
+            IncidentCost.calculated_at.is_(None),
+            IncidentCost.calculated_at < Incident.stable_at,
+            role_changed,
+        )
+    )
+
+
+def get_participants_response_time(*, db_session, incident_ids, now: datetime) -> Dict[int, tuple]:
+    """Returns the number of participants and the total time they spent in their roles,
+    in seconds, for each incident, using a single aggregate query.
+
+    Follows the rules of `calculate_incident_response_cost`.
+    """
+    renounced_at = case(
+        [
+            (
+                Incident.status == IncidentStatus.active,
+                func.coalesce(ParticipantRole.renounced_at, now),
+            ),
+            (ParticipantRole.renounced_at < Incident.stable_at, ParticipantRole.renounced_at),
+        ],
+        else_=Incident.stable_at,
+    )
+    role_hours = extract("epoch", renounced_at - ParticipantRole.assumed_at) / SECONDS_IN_HOUR
+
+    # we make the assumption that participants only spend 8 hours a day working on the incident,
+    # if the incident goes past 24hrs
+    days = func.floor(role_hours / HOURS_IN_DAY)
+    role_hours = case(
+        [
+            (
+                role_hours > HOURS_IN_DAY,
+                func.ceil(days * HOURS_IN_DAY / 3 + (role_hours - days * HOURS_IN_DAY)),
+            )
+        ],
+        else_=role_hours,
+    )
+
+    engagement_multiplier = case(
+        [(ParticipantRole.role == role, m) for role, m in ENGAGEMENT_MULTIPLIERS.items()],
+        else_=0,
+    )
+    role_seconds = case(
+        [
+            (
+                and_(
+                    ParticipantRole.role != ParticipantRoleType.observer,
+                    or_(ParticipantRole.activity != 0, ParticipantRole.activity.is_(None)),
+                    renounced_at >= ParticipantRole.assumed_at,
+                ),
+                func.floor(role_hours * SECONDS_IN_HOUR * engagement_multiplier),
+            )
+        ],
+        else_=0,
+    )
+
+    rows = (
+        db_session.query(
+            Participant.incident_id,
+            func.count(distinct(Participant.id)),
+            func.coalesce(func.sum(role_seconds), 0),
+        )
+        .join(Incident, Incident.id == Participant.incident_id)
+        .outerjoin(ParticipantRole, ParticipantRole.participant_id == Participant.id)
+        .filter(Participant.incident_id.in_(incident_ids))
+        .group_by(Participant.incident_id)
+        .all()
+    )
+    return {
+        incident_id: (num_participants, int(total_seconds))
+        for incident_id, num_participants, total_seconds in rows
+    }
+
+
+def update_incidents_response_cost(
+    *, db_session, project: Project, incident_cost_type: IncidentCostType, incremental: bool = True
+) -> int:
+    """Calculates and saves the response cost of a project's incidents.
+
+    Each cost is committed on its own, an incident that fails is logged and skipped.
+    Returns the number of incidents whose response cost was calculated.
+    """
+    now = datetime.utcnow()
+    candidates = get_response_cost_candidates(
+        db_session=db_session,
+        project_id=project.id,
+        incident_cost_type_id=incident_cost_type.id,
+        incremental=incremental,
+    )
+    costs = dict(candidates.all())
+    if not costs:
+        return 0
+
+    response_times = get_participants_response_time(
+        db_session=db_session,
+        incident_ids=candidates.with_entities(Incident.id),
+        now=now,
+    )
+
+    num_incidents = 0
+    for incident_id, incident_response_cost in costs.items():
+        try:
+            num_participants, total_seconds = response_times.get(incident_id, (0, 0))
+            amount = get_response_cost_amount(
+                project=project,
+                participants_total_response_time_seconds=total_seconds,
+                num_participants=num_participants,
+            )
+
+            if incident_response_cost is None:
+                incident_response_cost = IncidentCost(
+                    incident_id=incident_id,
+                    incident_cost_type=incident_cost_type,
+                    project=project,
+                )
+                db_session.add(incident_response_cost)
+
+            if incident_response_cost.amount != amount:
+                incident_response_cost.amount = amount
+                log.debug(
+                    f"Incident {incident_id}'s response cost has been updated to ${amount:,.2f}"
+                )
+
+            incident_response_cost.calculated_at = now
+            db_session.commit()
+            num_incidents += 1
+        except Exception as e:
+            # we shouldn't fail to update all incidents when one fails
+            log.exception(e)
+            db_session.rollback()
+
+    return num_incidents
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import List, Optional
 from pydantic import Field
 
-from sqlalchemy import Column, ForeignKey, Integer, PrimaryKeyConstraint, String, Table
+from sqlalchemy import Column, ForeignKey, Index, Integer, PrimaryKeyConstraint, String, Table
 from sqlalchemy.sql.schema import UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy_utils import TSVectorType
@@ -25,7 +25,21 @@ assoc_individual_filters = Table(
 
 
 class IndividualContact(Base, ContactMixin, ProjectMixin):
-    __table_args__ = (UniqueConstraint("email", "project_id"),)
+    __table_args__ = (
+        UniqueConstraint("email", "project_id"),
+        Index(
+            "ix_individual_contact_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_individual_contact_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String)
@@ -10,8 +10,6 @@ from fastapi.responses import JSONResponse
 from pydantic.error_wrappers import ValidationError
 
 from sentry_asgi import SentryMiddleware
-from sqlalchemy import inspect
-from sqlalchemy.orm import scoped_session
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
 from starlette.routing import compile_path
@@ -24,7 +22,11 @@ from .common.utils.cli import install_plugins, install_plugin_events
 from .config import (
     STATIC_DIR,
 )
-from .database.core import engine, sessionmaker
+from .database.core import (
+    get_organization_schema_name,
+    get_schema_session,
+    organization_schema_exists,
+)
 from .extensions import configure_extensions
 from .logging import configure_logging
 from .metrics import provider as metric_provider
@@ -74,15 +76,22 @@ api = FastAPI(
 )
 
 
+# compiled path regexes of all api routes, in reverse order so the last matching route wins
+route_path_regexes = []
+
+
+def compile_route_path_regexes(router) -> list:
+    """Compiles the path regexes of all routes of a router."""
+    return [compile_path(r.path)[0] for r in reversed(router.routes)]
+
+
 def get_path_params_from_request(request: Request) -> str:
-    path_params = {}
-    for r in api_router.routes:
-        path_regex, path_format, param_converters = compile_path(r.path)
-        path = request["path"].removeprefix("/api/v1")  # remove the /api/v1 for matching
+    path = request["path"].removeprefix("/api/v1")  # remove the /api/v1 for matching
+    for path_regex in route_path_regexes:
         match = path_regex.match(path)
         if match:
-            path_params = match.groupdict()
-    return path_params
+            return match.groupdict()
+    return {}
 
 
 def get_path_template(request: Request) -> str:
@@ -112,17 +121,9 @@ async def db_session_middleware(request: Request, call_next):
     organization_slug = path_params.get("organization")
     if organization_slug:
         request.state.organization = organization_slug
-        schema = f"dispatch_organization_{organization_slug}"
+        schema = get_organization_schema_name(organization_slug)
         # validate slug exists
-        schema_names = inspect(engine).get_schema_names()
-        if schema in schema_names:
-            # add correct schema mapping depending on the request
-            schema_engine = engine.execution_options(
-                schema_translate_map={
-                    None: schema,
-                }
-            )
-        else:
+        if not organization_schema_exists(schema):
             return JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={"detail": [{"msg": f"Unknown database schema name: {schema}"}]},
@@ -131,14 +132,10 @@ async def db_session_middleware(request: Request, call_next):
         # add correct schema mapping depending on the request
         # can we set some default here?
         request.state.organization = "default"
-        schema_engine = engine.execution_options(
-            schema_translate_map={
-                None: "dispatch_organization_default",
-            }
-        )
+        schema = get_organization_schema_name("default")
     try:
-        session = scoped_session(sessionmaker(bind=schema_engine), scopefunc=get_request_id)
-        request.state.db = session()
+        # we reuse one session factory per schema
+        request.state.db = get_schema_session(schema)
         response = await call_next(request)
     except Exception as e:
         raise e from None
@@ -216,6 +213,9 @@ install_plugin_events(api_router)
 # we add all API routes to the Web API framework
 api.include_router(api_router)
 
+# we compile the route path regexes once all routes have been added
+route_path_regexes.extend(compile_route_path_regexes(api_router))
+
 # we mount the frontend and app
 if STATIC_DIR and path.isdir(STATIC_DIR):
     frontend.mount("/", StaticFiles(directory=STATIC_DIR), name="app")
@@ -1,16 +1,122 @@
+import atexit
 import logging
+import random
+import threading
+from collections import defaultdict
 
 from dispatch.plugins.base import plugins
 
-from .config import METRIC_PROVIDERS
+from .config import (
+    METRIC_BUFFER_SIZE,
+    METRIC_FLUSH_INTERVAL,
+    METRIC_PROVIDERS,
+    METRIC_TIMER_SAMPLES,
+)
 
 log = logging.getLogger(__file__)
 
 
+def get_metric_key(name, tags=None):
+    """Returns a hashable key for a metric name and its tags."""
+    if not tags:
+        return (name, ())
+    return (name, tuple(sorted((k, str(v)) for k, v in tags.items())))
+
+
+class TimerReservoir(object):
+    """Uniform random sample of at most `max_samples` values of a timer series."""
+
+    def __init__(self, max_samples=METRIC_TIMER_SAMPLES):
+        self.max_samples = max_samples
+        self.count = 0
+        self.samples = []
+
+    def add(self, value):
+        self.count += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append(value)
+            return
+
+        # every value is kept with the same probability
+        i = random.randrange(self.count)
+        if i < self.max_samples:
+            self.samples[i] = value
+
+
+class MetricBuffer(object):
+    """In-process aggregation buffer for metrics.
+
+    Counters are summed, gauges keep their last value and timers keep a sample of at
+    most `timer_samples` values and their count, which is sent as a `<name>.count`
+    counter. The buffer holds at most `max_size` series; new series beyond that are
+    dropped and counted.
+    """
+
+    def __init__(self, max_size=METRIC_BUFFER_SIZE, timer_samples=METRIC_TIMER_SAMPLES):
+        self.max_size = max_size
+        self.timer_samples = timer_samples
+        self.lock = threading.Lock()
+        self.dropped = 0
+        self.reset()
+
+    def reset(self):
+        self.size = 0
+        self.counters = defaultdict(int)
+        self.gauges = {}
+        self.timers = {}
+        self.tags = {}
+
+    def _add_series(self, key, tags):
+        """Accounts for a new series, returns false if the buffer is full."""
+        if self.size >= self.max_size:
+            self.dropped += 1
+            return False
+        self.size += 1
+        # we copy the tags, as callers may reuse their dict
+        self.tags.setdefault(key, dict(tags) if tags else tags)
+        return True
+
+    def counter(self, name, value=None, tags=None):
+        key = get_metric_key(name, tags)
+        with self.lock:
+            if key not in self.counters and not self._add_series(key, tags):
+                return
+            self.counters[key] += 1 if value is None else value
+
+    def gauge(self, name, value, tags=None):
+        key = get_metric_key(name, tags)
+        with self.lock:
+            if key not in self.gauges and not self._add_series(key, tags):
+                return
+            self.gauges[key] = value
+
+    def timer(self, name, value, tags=None):
+        key = get_metric_key(name, tags)
+        with self.lock:
+            if key not in self.timers:
+                if not self._add_series(key, tags):
+                    return
+                self.timers[key] = TimerReservoir(max_samples=self.timer_samples)
+            self.timers[key].add(value)
+
+    def drain(self):
+        """Returns the buffered metrics and empties the buffer."""
+        with self.lock:
+            counters, gauges, timers, tags = self.counters, self.gauges, self.timers, self.tags
+            dropped, self.dropped = self.dropped, 0
+            self.reset()
+        return counters, gauges, timers, tags, dropped
+
+
 class Metrics(object):
     _providers = []
 
-    def __init__(self):
+    def __init__(
+        self,
+        flush_interval=METRIC_FLUSH_INTERVAL,
+        buffer_size=METRIC_BUFFER_SIZE,
+        timer_samples=METRIC_TIMER_SAMPLES,
+    ):
         if not METRIC_PROVIDERS:
             log.info(
                 "No metric providers defined via METRIC_PROVIDERS env var. Metrics will not be sent."
@@ -18,29 +124,83 @@ class Metrics(object):
         else:
             self._providers = METRIC_PROVIDERS
 
-    def gauge(self, name, value, tags=None):
-        for provider in self._providers:
-            log.debug(
-                f"Sending gauge metric {name} to provider {provider}. Value: {value} Tags: {tags}"
+        self.flush_interval = flush_interval
+        self.buffer = MetricBuffer(max_size=buffer_size, timer_samples=timer_samples)
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def _ensure_flusher(self):
+        """Lazily starts the background flush thread."""
+        if self._thread:
+            return
+
+        with self._thread_lock:
+            if self._thread:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="dispatch-metrics-flusher", daemon=True
             )
-            p = plugins.get(provider)
-            p.gauge(name, value, tags=tags)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                log.exception(e)
+
+    def gauge(self, name, value, tags=None):
+        if not self._providers:
+            return
+        self._ensure_flusher()
+        self.buffer.gauge(name, value, tags=tags)
 
     def counter(self, name, value=None, tags=None):
-        for provider in self._providers:
-            log.debug(
-                f"Sending counter metric {name} to provider {provider}. Value: {value} Tags: {tags}"
-            )
-            p = plugins.get(provider)
-            p.counter(name, value=value, tags=tags)
+        if not self._providers:
+            return
+        self._ensure_flusher()
+        self.buffer.counter(name, value=value, tags=tags)
 
     def timer(self, name, value, tags=None):
-        for provider in self._providers:
-            log.debug(
-                f"Sending timer metric {name} to provider {provider}. Value: {value} Tags: {tags}"
-            )
-            p = plugins.get(provider)
-            p.timer(name, value, tags=tags)
+        if not self._providers:
+            return
+        self._ensure_flusher()
+        self.buffer.timer(name, value, tags=tags)
+
+    def flush(self):
+        """Sends all buffered metrics to the configured providers."""
+        with self._flush_lock:
+            counters, gauges, timers, tags, dropped = self.buffer.drain()
+
+            if dropped:
+                log.warning(f"Dropped {dropped} metrics, the metric buffer is full.")
+                counters[get_metric_key("metrics.dropped.counter")] += dropped
+
+            for provider in self._providers:
+                try:
+                    p = plugins.get(provider)
+                    log.debug(
+                        f"Sending {len(counters)} counters, {len(gauges)} gauges and {len(timers)} timers to provider {provider}."
+                    )
+                    for key, value in counters.items():
+                        p.counter(key[0], value=value, tags=tags.get(key))
+                    for key, value in gauges.items():
+                        p.gauge(key[0], value, tags=tags.get(key))
+                    for key, reservoir in timers.items():
+                        for value in reservoir.samples:
+                            p.timer(key[0], value, tags=tags.get(key))
+                        # timers are sampled, so their exact count is sent alongside
+                        p.counter(f"{key[0]}.count", value=reservoir.count, tags=tags.get(key))
+                except Exception as e:
+                    log.exception(f"Unable to send metrics to provider {provider}. Reason: {e}")
+
+    def stop(self):
+        """Stops the background flush thread and flushes any remaining metrics."""
+        self._stopped.set()
+        self.flush()
 
 
 provider = Metrics()
@@ -81,10 +81,16 @@ def sync_active_stable_monitors(db_session: SessionLocal, project: Project):
 
     # we get all active and stable incidents
     active_incidents = incident_service.get_all_by_status(
-        db_session=db_session, project_id=project.id, status=IncidentStatus.active
+        db_session=db_session,
+        project_id=project.id,
+        status=IncidentStatus.active,
+        load_profile="sync",
     )
     stable_incidents = incident_service.get_all_by_status(
-        db_session=db_session, project_id=project.id, status=IncidentStatus.stable
+        db_session=db_session,
+        project_id=project.id,
+        status=IncidentStatus.stable,
+        load_profile="sync",
     )
     incidents = active_incidents + stable_incidents
     run_monitors(db_session, project, monitor_plugin, incidents, notify=True)
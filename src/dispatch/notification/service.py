@@ -133,9 +133,9 @@ def filter_and_send(
     notifications = get_all_enabled(db_session=db_session, project_id=incident.project.id)
     for notification in notifications:
         for search_filter in notification.filters:
-            match = search_filter_service.match(
+            match = search_filter_service.evaluate(
                 db_session=db_session,
-                filter_spec=search_filter.expression,
+                search_filter=search_filter,
                 class_instance=class_instance,
             )
             if match:
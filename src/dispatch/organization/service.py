@@ -159,9 +159,13 @@ def add_user(
     role: UserRoles = UserRoles.member,
 ):
     """Adds a user to an organization."""
+    # NOTE imported here to avoid a circular import with dispatch.auth.service
+    from dispatch.auth import service as auth_service
+
     db_session.add(
         DispatchUserOrganization(
             dispatch_user_id=user.id, organization_id=organization.id, role=role
         )
     )
     db_session.commit()
+    auth_service.invalidate_cached_identity(email=user.email)
@@ -2,7 +2,7 @@ from typing import Optional, List
 from pydantic import Field
 
 from sqlalchemy.orm import relationship, backref
-from sqlalchemy import Column, Boolean, String, Integer, ForeignKey, select
+from sqlalchemy import Column, Boolean, String, Index, Integer, ForeignKey, select
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from dispatch.database.core import Base
@@ -17,6 +17,14 @@ from dispatch.individual.models import IndividualContactRead
 
 
 class Participant(Base):
+    __table_args__ = (
+        Index(
+            "ix_participant_individual_contact_id_incident_id",
+            "individual_contact_id",
+            "incident_id",
+        ),
+    )
+
     # columns
     id = Column(Integer, primary_key=True)
     team = Column(String)
@@ -6,6 +6,8 @@
 .. moduleauthor:: Kevin Glisson (kglisson@netflix.com)
 """
 import logging
+from collections import defaultdict
+
 from dispatch.common.managers import InstanceManager
 
 
@@ -20,23 +22,55 @@ class PluginManager(InstanceManager):
     def __len__(self):
         return sum(1 for i in self.all())
 
+    def add(self, class_path):
+        self.indexes = None
+        super(PluginManager, self).add(class_path)
+
+    def remove(self, class_path):
+        self.indexes = None
+        super(PluginManager, self).remove(class_path)
+
+    def update(self, class_list):
+        self.indexes = None
+        super(PluginManager, self).update(class_list)
+
+    def get_indexes(self):
+        """
+        Returns the slug and (type, version) indexes, rebuilding them
+        whenever the instance cache has been wiped.
+        """
+        if self.indexes is not None and self.cache is not None:
+            return self.indexes
+
+        plugins = sorted(super(PluginManager, self).all(), key=lambda x: x.get_title())
+
+        # a `None` type or version matches all types or versions
+        by_type = defaultdict(list)
+        for plugin in plugins:
+            for plugin_type in (plugin.type, None):
+                for version in (plugin.__version__, None):
+                    by_type[(plugin_type, version)].append(plugin)
+
+        # version 1 plugins take precedence over version 2 plugins with the same slug
+        by_slug = {}
+        for version in (1, 2):
+            for plugin in by_type[(None, version)]:
+                by_slug.setdefault(plugin.slug, plugin)
+
+        self.indexes = (by_slug, dict(by_type))
+        return self.indexes
+
     def all(self, version=1, plugin_type=None):
-        for plugin in sorted(super(PluginManager, self).all(), key=lambda x: x.get_title()):
-            if not plugin.type == plugin_type and plugin_type:
-                continue
-            if version is not None and plugin.__version__ != version:
-                continue
-            yield plugin
+        _, by_type = self.get_indexes()
+        return iter(by_type.get((plugin_type or None, version), []))
 
     def get(self, slug):
-        for plugin in self.all(version=1):
-            if plugin.slug == slug:
-                return plugin
-        for plugin in self.all(version=2):
-            if plugin.slug == slug:
-                return plugin
+        by_slug, _ = self.get_indexes()
+        plugin = by_slug.get(slug)
+        if plugin is not None:
+            return plugin
         logger.error(
-            f"Unable to find slug: {slug} in self.all version 1: {self.all(version=1)} or version 2: {self.all(version=2)}"
+            f"Unable to find slug: {slug} in self.all version 1: {list(self.all(version=1))} or version 2: {list(self.all(version=2))}"
         )
         raise KeyError(slug)
 
@@ -0,0 +1,118 @@
+"""
+.. module: dispatch.plugins.dispatch_core.jwks
+    :platform: Unix
+    :copyright: (c) 2019 by Netflix Inc., see AUTHORS for more
+    :license: Apache, see LICENSE for more details.
+"""
+import logging
+import time
+from threading import Lock
+from typing import Optional
+
+import requests
+from cachetools import LRUCache
+
+
+log = logging.getLogger(__name__)
+
+
+class JWKSCache:
+    """Caches the signing keys published at a JWKS endpoint, keyed by `kid`.
+
+    Keys are refetched once the cache is older than `ttl` seconds, or when a token
+    references an unknown `kid` (key rotation). Refetches triggered by unknown key ids
+    are rate limited to one every `refresh_interval` seconds, and concurrent callers
+    share a single in-flight request.
+    """
+
+    def __init__(self, url: str, ttl: int = 3600, refresh_interval: int = 30, timeout: int = 10):
+        self.url = url
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.keys = {}
+        self.fetched_at = None
+        self._lock = Lock()
+
+    def is_stale(self) -> bool:
+        """Returns true if the keys have never been fetched or are older than the ttl."""
+        return self.fetched_at is None or time.monotonic() - self.fetched_at > self.ttl
+
+    def refresh(self, force: bool = False):
+        """Refetches the keys from the JWKS endpoint."""
+        observed_fetched_at = self.fetched_at
+
+        with self._lock:
+            # another thread refreshed the keys while we were waiting for the lock
+            if self.fetched_at != observed_fetched_at:
+                return
+
+            if not force and not self.is_stale():
+                return
+
+            if (
+                force
+                and self.fetched_at is not None
+                and time.monotonic() - self.fetched_at < self.refresh_interval
+            ):
+                return
+
+            try:
+                response = requests.get(self.url, timeout=self.timeout)
+                response.raise_for_status()
+                keys = response.json()["keys"]
+            except Exception as e:
+                # we keep serving the keys we already have if the endpoint is unavailable
+                log.warning(f"Unable to fetch JWKS keys. Url: {self.url} Reason: {e}")
+                if self.fetched_at is not None:
+                    self.fetched_at = time.monotonic()
+                return
+
+            self.keys = {k["kid"]: k for k in keys if k.get("kid")}
+            self.fetched_at = time.monotonic()
+
+    def get_key(self, kid: str) -> Optional[dict]:
+        """Returns the key for the given key id, refetching the keys if required."""
+        if self.is_stale():
+            self.refresh()
+
+        key = self.keys.get(kid)
+        if not key:
+            self.refresh(force=True)
+            key = self.keys.get(kid)
+
+        return key
+
+
+class TokenCache:
+    """Bounded cache of decoded tokens that are kept until they expire."""
+
+    def __init__(self, maxsize: int = 4096):
+        self._cache = LRUCache(maxsize=maxsize)
+        self._lock = Lock()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Returns the decoded token if it is cached and has not expired."""
+        with self._lock:
+            data = self._cache.get(token)
+            if data is None:
+                return
+
+            if data["exp"] <= time.time():
+                del self._cache[token]
+                return
+
+            return data
+
+    def set(self, token: str, data: dict):
+        """Caches a decoded token. Tokens without an expiry are never cached."""
+        if not isinstance(data.get("exp"), (int, float)):
+            return
+
+        with self._lock:
+            self._cache[token] = data
+
+    def clear(self):
+        """Drops all cached tokens."""
+        with self._lock:
+            self._cache.clear()
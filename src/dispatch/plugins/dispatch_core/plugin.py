@@ -4,11 +4,8 @@
     :copyright: (c) 2019 by Netflix Inc., see AUTHORS for more
     :license: Apache, see LICENSE for more details.
 """
-import base64
-import json
 import logging
 
-import requests
 from fastapi import HTTPException
 from fastapi.security.utils import get_authorization_scheme_param
 
@@ -26,6 +23,7 @@ from dispatch.individual import service as individual_service
 from dispatch.individual.models import IndividualContact, IndividualContactRead
 from dispatch.plugin import service as plugin_service
 from dispatch.plugins import dispatch_core as dispatch_plugin
+from dispatch.plugins.dispatch_core.jwks import JWKSCache, TokenCache
 from dispatch.route import service as route_service
 from dispatch.service import service as service_service
 from dispatch.service.models import Service, ServiceRead
@@ -42,6 +40,8 @@ from dispatch.plugins.bases import (
 
 from dispatch.config import (
     DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS,
+    DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS_CACHE_TTL,
+    DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS_REFRESH_INTERVAL,
     DISPATCH_AUTHENTICATION_PROVIDER_HEADER_NAME,
     DISPATCH_PKCE_DONT_VERIFY_AT_HASH,
     DISPATCH_JWT_SECRET,
@@ -89,6 +89,13 @@ class PKCEAuthProviderPlugin(AuthenticationProviderPlugin):
     author = "Netflix"
     author_url = "https://github.com/netflix/dispatch.git"
 
+    jwks_cache = JWKSCache(
+        DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS,
+        ttl=DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS_CACHE_TTL,
+        refresh_interval=DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS_REFRESH_INTERVAL,
+    )
+    token_cache = TokenCache()
+
     def get_current_user(self, request: Request, **kwargs):
         credentials_exception = HTTPException(
             status_code=HTTP_401_UNAUTHORIZED, detail=[{"msg": "Could not validate credentials"}]
@@ -103,14 +110,31 @@ class PKCEAuthProviderPlugin(AuthenticationProviderPlugin):
 
         token = authorization.split()[1]
 
-        # Parse out the Key information. Add padding just in case
-        key_info = json.loads(base64.b64decode(token.split(".")[0] + "=========").decode("utf-8"))
+        data = self.token_cache.get(token)
+        if not data:
+            data = self.decode_token(token, credentials_exception)
+            self.token_cache.set(token, data)
+
+        # Support overriding where email is returned in the id token
+        if DISPATCH_JWT_EMAIL_OVERRIDE:
+            return data[DISPATCH_JWT_EMAIL_OVERRIDE]
+        else:
+            return data["email"]
+
+    def decode_token(self, token: str, credentials_exception: HTTPException) -> dict:
+        """Verifies and decodes a token using the cached JWKS keys."""
+        # Parse out the Key information
+        try:
+            key_info = jwt.get_unverified_header(token)
+        except JWTError as err:
+            log.debug("JWT header decode error: {}".format(err))
+            raise credentials_exception
 
-        # Grab all possible keys to account for key rotation and find the right key
-        keys = requests.get(DISPATCH_AUTHENTICATION_PROVIDER_PKCE_JWKS).json()["keys"]
-        for potential_key in keys:
-            if potential_key["kid"] == key_info["kid"]:
-                key = potential_key
+        # Find the right key, the cache refetches the keys to account for key rotation
+        key = self.jwks_cache.get_key(key_info.get("kid"))
+        if not key:
+            log.debug("No JWKS key found for kid: {}".format(key_info.get("kid")))
+            raise credentials_exception
 
         try:
             jwt_opts = {}
@@ -118,19 +142,12 @@ class PKCEAuthProviderPlugin(AuthenticationProviderPlugin):
                 jwt_opts = {"verify_at_hash": False}
             # If DISPATCH_JWT_AUDIENCE is defined, the we must include audience in the decode
             if DISPATCH_JWT_AUDIENCE:
-                data = jwt.decode(token, key, audience=DISPATCH_JWT_AUDIENCE, options=jwt_opts)
-            else:
-                data = jwt.decode(token, key, options=jwt_opts)
+                return jwt.decode(token, key, audience=DISPATCH_JWT_AUDIENCE, options=jwt_opts)
+            return jwt.decode(token, key, options=jwt_opts)
         except JWTError as err:
             log.debug("JWT Decode error: {}".format(err))
             raise credentials_exception
 
-        # Support overriding where email is returned in the id token
-        if DISPATCH_JWT_EMAIL_OVERRIDE:
-            return data[DISPATCH_JWT_EMAIL_OVERRIDE]
-        else:
-            return data["email"]
-
 
 class HeaderAuthProviderPlugin(AuthenticationProviderPlugin):
     title = "Dispatch Plugin - HTTP Header Authentication Provider"
@@ -3,13 +3,14 @@ import inspect
 import logging
 import time
 import uuid
+from typing import Optional
 
 from pydantic.error_wrappers import ErrorWrapper, ValidationError
 from pydantic import BaseModel
 
 from dispatch.exceptions import NotFoundError
 from dispatch.conversation import service as conversation_service
-from dispatch.database.core import engine, sessionmaker, SessionLocal
+from dispatch.database.core import SessionLocal, get_organization_session
 from dispatch.metrics import provider as metrics_provider
 from dispatch.organization import service as organization_service
 from dispatch.plugin import service as plugin_service
@@ -34,27 +35,58 @@ def get_plugin_configuration_from_channel_id(db_session: SessionLocal, channel_i
         return plugin_instance.configuration
 
 
+# in-memory index of channel ids (without their channel type prefix) to organization slugs
+channel_organizations = {}
+
+
+def get_organization_slug_from_channel_id(channel_id: str) -> Optional[str]:
+    """Looks up the organization that owns a channel in the channel routing index."""
+    organization_slug = channel_organizations.get(channel_id[1:])
+    if organization_slug:
+        return organization_slug
+
+    db_session = SessionLocal()
+    organization_slug = conversation_service.get_organization_slug_by_channel_id(
+        db_session=db_session, channel_id=channel_id
+    )
+    db_session.close()
+
+    if organization_slug:
+        channel_organizations[channel_id[1:]] = organization_slug
+    return organization_slug
+
+
 # we need a way to determine which organization to use for a given
 # event, we use the unique channel id to determine which organization the
 # event belongs to.
 def get_organization_scope_from_channel_id(channel_id: str) -> SessionLocal:
-    """Iterate all organizations looking for a relevant channel_id."""
+    """Resolves the organization of a channel_id using the channel routing index,
+    falling back to iterating all organizations looking for a relevant channel_id."""
+    organization_slug = get_organization_slug_from_channel_id(channel_id)
+    if organization_slug:
+        return get_organization_session(organization_slug)
+
     db_session = SessionLocal()
-    organization_slugs = [o.slug for o in organization_service.get_all(db_session=db_session)]
+    organizations = [(o.id, o.slug) for o in organization_service.get_all(db_session=db_session)]
     db_session.close()
 
-    for slug in organization_slugs:
-        schema_engine = engine.execution_options(
-            schema_translate_map={
-                None: f"dispatch_organization_{slug}",
-            }
-        )
-
-        scoped_db_session = sessionmaker(bind=schema_engine)()
+    for organization_id, slug in organizations:
+        scoped_db_session = get_organization_session(slug)
         conversation = conversation_service.get_by_channel_id_ignoring_channel_type(
             db_session=scoped_db_session, channel_id=channel_id
         )
         if conversation:
+            # we add the channel to the routing index so that we don't have to scan again
+            try:
+                conversation_service.set_channel_organization(
+                    db_session=scoped_db_session,
+                    channel_id=channel_id,
+                    organization_id=organization_id,
+                )
+            except Exception as e:
+                scoped_db_session.rollback()
+                log.warning(f"Unable to index channel organization. ChannelId: {channel_id} {e}")
+            channel_organizations[channel_id[1:]] = slug
             return scoped_db_session
 
         scoped_db_session.close()
@@ -67,13 +99,7 @@ def get_organization_scope_from_slug(slug: str) -> SessionLocal:
     db_session.close()
 
     if organization:
-        schema_engine = engine.execution_options(
-            schema_translate_map={
-                None: f"dispatch_organization_{slug}",
-            }
-        )
-
-        return sessionmaker(bind=schema_engine)()
+        return get_organization_session(slug)
 
     raise ValidationError(
         [
@@ -92,13 +118,7 @@ def get_default_organization_scope() -> str:
     organization = organization_service.get_default(db_session=db_session)
     db_session.close()
 
-    schema_engine = engine.execution_options(
-        schema_translate_map={
-            None: f"dispatch_organization_{organization.slug}",
-        }
-    )
-
-    return sessionmaker(bind=schema_engine)()
+    return get_organization_session(organization.slug)
 
 
 def fullname(o):
@@ -14,14 +14,14 @@ from dispatch.incident import flows as incident_flows
 from dispatch.incident import service as incident_service
 from dispatch.individual import service as individual_service
 from dispatch.monitor import service as monitor_service
-from dispatch.nlp import build_phrase_matcher, build_term_vocab, extract_terms_from_text
+from dispatch.nlp import extract_terms_from_text
 from dispatch.participant import service as participant_service
 from dispatch.participant_role import service as participant_role_service
 from dispatch.participant_role.models import ParticipantRoleType
 from dispatch.plugin import service as plugin_service
 from dispatch.plugins.dispatch_slack import service as dispatch_slack_service
 from dispatch.plugins.dispatch_slack.config import SlackConversationConfiguration
-from dispatch.tag import service as tag_service
+from dispatch.tag import matcher as tag_matcher
 from dispatch.tag.models import Tag
 
 from .decorators import slack_background_task, get_organization_scope_from_channel_id
@@ -428,10 +428,7 @@ def message_tagging(
     """Looks for incident tags in incident messages."""
     text = event.event.text
     incident = incident_service.get(db_session=db_session, incident_id=incident_id)
-    tags = tag_service.get_all(db_session=db_session, project_id=incident.project.id).all()
-    tag_strings = [t.name.lower() for t in tags if t.discoverable]
-    phrases = build_term_vocab(tag_strings)
-    matcher = build_phrase_matcher("dispatch-tag", phrases)
+    matcher = tag_matcher.get_matcher(db_session=db_session, project=incident.project)
     extracted_tags = list(set(extract_terms_from_text(text, matcher)))
 
     matched_tags = (
@@ -5,14 +5,18 @@ import logging
 import platform
 import sys
 
-from time import time
+from threading import Lock
+from time import monotonic, time
 
 from fastapi import APIRouter, BackgroundTasks, Header, HTTPException
 
 from sqlalchemy import true
+from sqlalchemy.event import listen
+from sqlalchemy.orm import Session, object_session
 
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
+from dispatch.config import SLACK_SIGNING_SECRETS_CACHE_TTL
 from dispatch.plugin.models import PluginInstance, Plugin
 
 from dispatch.plugins.dispatch_slack import service as dispatch_slack_service
@@ -53,26 +57,91 @@ def create_ua_string():
     return " ".join(ua_string)
 
 
-def verify_signature(organization: str, request_data: str, timestamp: int, signature: str):
-    """Verifies the request signature using the app's signing secret."""
+# organization slug -> (expiry, [(signing secret, configuration)])
+signing_secrets_cache = {}
+signing_secrets_cache_lock = Lock()
+
+
+def get_signing_secrets(organization: str):
+    """Returns the decoded signing secrets and configurations of all enabled Slack
+    plugin instances of an organization."""
+    with signing_secrets_cache_lock:
+        entry = signing_secrets_cache.get(organization)
+    if entry and entry[0] > monotonic():
+        return entry[1]
+
     session = get_organization_scope_from_slug(organization)
-    plugin_instances = (
-        session.query(PluginInstance)
-        .join(Plugin)
-        .filter(PluginInstance.enabled == true(), Plugin.slug == "slack-conversation")
-        .all()
-    )
+    try:
+        plugin_instances = (
+            session.query(PluginInstance)
+            .join(Plugin)
+            .filter(PluginInstance.enabled == true(), Plugin.slug == "slack-conversation")
+            .all()
+        )
+
+        secrets = []
+        for p in plugin_instances:
+            configuration = p.instance.configuration
+            secret = configuration.signing_secret.get_secret_value()
+            secrets.append((bytes(secret, "utf-8"), configuration))
+    finally:
+        session.close()
+
+    with signing_secrets_cache_lock:
+        signing_secrets_cache[organization] = (
+            monotonic() + SLACK_SIGNING_SECRETS_CACHE_TTL, secrets
+        )
+    return secrets
+
+
+def invalidate_signing_secrets():
+    """Drops all cached signing secrets."""
+    with signing_secrets_cache_lock:
+        signing_secrets_cache.clear()
+
 
-    for p in plugin_instances:
-        secret = p.instance.configuration.signing_secret.get_secret_value()
-        req = f"v0:{timestamp}:{request_data}".encode("utf-8")
-        slack_signing_secret = bytes(secret, "utf-8")
+def mark_signing_secrets_changed(mapper, connection, target):
+    """Marks the session of a changed plugin instance, its changes aren't committed yet."""
+    session = object_session(target)
+    if session is not None:
+        session.info["signing_secrets_changed"] = True
+
+
+def mark_signing_secrets_changed_on_bulk_delete(delete_context):
+    """Marks the session when plugin instances are bulk deleted."""
+    if delete_context.primary_table.name == PluginInstance.__table__.name:
+        delete_context.session.info["signing_secrets_changed"] = True
+
+
+def invalidate_signing_secrets_on_commit(session):
+    """Drops all cached signing secrets once plugin instance changes are committed, so that
+    concurrent requests can't cache the secrets as they were before the commit."""
+    if session.info.pop("signing_secrets_changed", False):
+        invalidate_signing_secrets()
+
+
+def discard_signing_secrets_changed(session):
+    """Rolled back plugin instance changes don't invalidate the cached signing secrets."""
+    session.info.pop("signing_secrets_changed", None)
+
+
+# we refresh the signing secrets whenever plugin instance changes are committed
+listen(PluginInstance, "after_insert", mark_signing_secrets_changed)
+listen(PluginInstance, "after_update", mark_signing_secrets_changed)
+listen(PluginInstance, "after_delete", mark_signing_secrets_changed)
+listen(Session, "after_bulk_delete", mark_signing_secrets_changed_on_bulk_delete)
+listen(Session, "after_commit", invalidate_signing_secrets_on_commit)
+listen(Session, "after_rollback", discard_signing_secrets_changed)
+
+
+def verify_signature(organization: str, request_data: str, timestamp: int, signature: str):
+    """Verifies the request signature using the app's signing secret."""
+    req = f"v0:{timestamp}:{request_data}".encode("utf-8")
+    for slack_signing_secret, configuration in get_signing_secrets(organization):
         h = hmac.new(slack_signing_secret, req, hashlib.sha256).hexdigest()
         result = hmac.compare_digest(f"v0={h}", signature)
         if result:
-            session.close()
-            return p.instance.configuration
-    session.close()
+            return configuration
     raise HTTPException(status_code=403, detail=[{"msg": "Invalid request signature"}])
 
 
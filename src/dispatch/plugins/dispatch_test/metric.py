@@ -0,0 +1,17 @@
+from dispatch.plugins.bases.metric import MetricPlugin
+
+
+class TestMetricPlugin(MetricPlugin):
+    title = "Dispatch Test Plugin - Metric"
+    slug = "test-metric"
+
+    sent = []
+
+    def gauge(self, name, value, tags=None):
+        self.sent.append(("gauge", name, value, tags))
+
+    def counter(self, name, value=None, tags=None):
+        self.sent.append(("counter", name, value, tags))
+
+    def timer(self, name, value, tags=None):
+        self.sent.append(("timer", name, value, tags))
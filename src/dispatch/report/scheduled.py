@@ -21,7 +21,10 @@ log = logging.getLogger(__name__)
 def incident_report_reminders(db_session: SessionLocal, project: Project):
     """Sends report reminders to incident commanders for active incidents."""
     incidents = incident_service.get_all_by_status(
-        db_session=db_session, project_id=project.id, status=IncidentStatus.active
+        db_session=db_session,
+        project_id=project.id,
+        status=IncidentStatus.active,
+        load_profile="reminders",
     )
 
     for incident in incidents:
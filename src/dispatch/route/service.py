@@ -1,6 +1,6 @@
 import logging
 import json
-from typing import Any, List
+from typing import Any, Dict, List, Set
 
 from dispatch.search_filter import service as search_filter_service
 
@@ -10,48 +10,74 @@ from dispatch.route.models import Recommendation, RecommendationMatch
 log = logging.getLogger(__name__)
 
 
-def get_resource_matches(
-    *, db_session, incident: Incident, model: Any
-) -> List[RecommendationMatch]:
-    """Fetches all matching model entities for the given incident."""
-    # get all entities with an associated filter
-    model_cls, model_state = model
-    resources = (
+def get_resources(*, db_session, incident: Incident, model: Any) -> List[Any]:
+    """Fetches all model entities with an associated filter in the incident's project."""
+    model_cls, _ = model
+    return (
         db_session.query(model_cls)
         .filter(model_cls.project_id == incident.project_id)
         .filter(model_cls.filters.any())
         .all()
     )
 
+
+def get_resource_matches(
+    *,
+    db_session,
+    incident: Incident,
+    model: Any,
+    resources: List[Any] = None,
+    matches: Dict[int, Set[int]] = None,
+) -> List[RecommendationMatch]:
+    """Fetches all matching model entities for the given incident."""
+    model_cls, model_state = model
+    if resources is None:
+        resources = get_resources(db_session=db_session, incident=incident, model=model)
+
+    if matches is None:
+        matches = search_filter_service.match_many(
+            db_session=db_session,
+            search_filters=[f for r in resources for f in r.filters],
+            class_instances=[incident],
+        )
+
     matched_resources = []
     for resource in resources:
-        for f in resource.filters:
-            match = search_filter_service.match(
-                db_session=db_session,
-                filter_spec=f.expression,
-                class_instance=incident,
-            )
-
-            if match:
-                matched_resources.append(
-                    RecommendationMatch(
-                        resource_state=json.loads(model_state(**resource.__dict__).json()),
-                        resource_type=model_cls.__name__,
-                    )
+        if any(incident.id in matches.get(f.id, ()) for f in resource.filters):
+            matched_resources.append(
+                RecommendationMatch(
+                    resource_state=json.loads(model_state(**resource.__dict__).json()),
+                    resource_type=model_cls.__name__,
                 )
-                break
+            )
 
     return matched_resources
 
 
 def get(*, db_session, incident: Incident, models: List[Any]) -> Recommendation:
     """Get routed resources."""
+    resources = [
+        get_resources(db_session=db_session, incident=incident, model=model) for model in models
+    ]
+
+    # we match the filters of all resources at once
+    matches = search_filter_service.match_many(
+        db_session=db_session,
+        search_filters=[f for rs in resources for r in rs for f in r.filters],
+        class_instances=[incident],
+    )
 
-    matches = []
-    for model in models:
-        matches += get_resource_matches(db_session=db_session, incident=incident, model=model)
+    recommendation_matches = []
+    for model, model_resources in zip(models, resources):
+        recommendation_matches += get_resource_matches(
+            db_session=db_session,
+            incident=incident,
+            model=model,
+            resources=model_resources,
+            matches=matches,
+        )
 
-    recommendation = Recommendation(matches=matches)
+    recommendation = Recommendation(matches=recommendation_matches)
     db_session.add(recommendation)
     db_session.commit()
     return recommendation
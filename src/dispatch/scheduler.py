@@ -7,27 +7,76 @@
 .. moduleauthor:: Kevin Glisson <kglisson@netflix.com>
 .. moduleauthor:: Marc Vilanova <mvilanova@netflix.com>
 """
-import threading
+import heapq
+import itertools
+import json
 import logging
+import os
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
 
 import schedule
 
+from dispatch.config import SCHEDULER_JITTER, SCHEDULER_MAX_WORKERS, SCHEDULER_STATS_PATH
+
 log = logging.getLogger(__name__)
 
 
-def run_threaded(job_func):
-    """Runs a given job in a thread."""
-    job_thread = threading.Thread(target=job_func)
-    job_thread.start()
+class JobStats(object):
+    """Run statistics of a scheduled task."""
+
+    def __init__(self):
+        self.queued = 0
+        self.running = 0
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_run_duration: Optional[float] = None
+
+    def dict(self) -> dict:
+        return {
+            "queued": self.queued,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_run_duration": self.last_run_duration,
+        }
 
 
 #  See: https://schedule.readthedocs.io/en/stable/ for documentation on job syntax
 class Scheduler(object):
-    """Simple scheduler class that holds all scheduled functions."""
+    """Simple scheduler class that holds all scheduled functions.
+
+    Due tasks are run by a bounded pool of worker threads. A task is skipped while
+    `max_concurrency` runs of it are already queued or running, and each run is
+    delayed by a random jitter so that tasks sharing a period don't start together.
+    Delayed runs are submitted to the pool once due, so they don't hold a worker.
+    """
 
     registered_tasks = []
 
+    def __init__(
+        self,
+        max_workers: int = SCHEDULER_MAX_WORKERS,
+        jitter: float = SCHEDULER_JITTER,
+        stats_path: str = SCHEDULER_STATS_PATH,
+    ):
+        self.max_workers = max_workers
+        self.jitter = jitter
+        self.stats_path = stats_path
+        self.executor = None
+        self.delayed = []
+        self.delayed_ids = itertools.count()
+        self.lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+
     def add(self, job, *args, **kwargs):
         """Adds a task to the scheduler."""
 
@@ -37,9 +86,16 @@ class Scheduler(object):
             else:
                 name = kwargs.pop("name")
 
-            self.registered_tasks.append(
-                {"name": name, "func": func, "job": job.do(run_threaded, func)}
-            )
+            task = {
+                "name": name,
+                "func": func,
+                "max_concurrency": kwargs.get("max_concurrency", 1),
+                "jitter": kwargs.get("jitter", self.jitter),
+                "stats": JobStats(),
+            }
+            task["job"] = job.do(self.submit, task)
+            self.registered_tasks.append(task)
+            return func
 
         return decorator
 
@@ -47,10 +103,106 @@ class Scheduler(object):
         """Removes a task from the scheduler."""
         schedule.cancel_job(task["job"])
 
+    def get_executor(self) -> ThreadPoolExecutor:
+        """Returns the worker pool, creating it if required."""
+        with self.lock:
+            if not self.executor:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="dispatch-scheduler"
+                )
+            return self.executor
+
+    def submit(self, task: dict):
+        """Queues a due task unless too many runs of it are already in flight."""
+        stats = task["stats"]
+        with self.lock:
+            if stats.queued + stats.running >= task["max_concurrency"]:
+                stats.skipped += 1
+                log.warning(
+                    f"Skipping task, previous run still in progress. TaskName: {task['name']}"
+                )
+                skipped = True
+            else:
+                stats.queued += 1
+                skipped = False
+                if task["jitter"]:
+                    due_at = time.monotonic() + random.uniform(0, task["jitter"])
+                    heapq.heappush(self.delayed, (due_at, next(self.delayed_ids), task))
+                    return
+
+        if skipped:
+            self.write_stats()
+            return
+
+        self.get_executor().submit(self.run, task)
+
+    def submit_due(self, now: float = None):
+        """Submits the delayed runs that are due to the worker pool."""
+        now = time.monotonic() if now is None else now
+        due = []
+        with self.lock:
+            while self.delayed and self.delayed[0][0] <= now:
+                due.append(heapq.heappop(self.delayed)[2])
+
+        for task in due:
+            self.get_executor().submit(self.run, task)
+
+    def run(self, task: dict):
+        """Runs a task in a worker thread and records its statistics."""
+        stats = task["stats"]
+        with self.lock:
+            stats.queued -= 1
+            stats.running += 1
+
+        start = time.perf_counter()
+        failed = False
+        try:
+            task["func"]()
+        except Exception as e:
+            failed = True
+            log.exception(e)
+        finally:
+            with self.lock:
+                stats.running -= 1
+                stats.runs += 1
+                stats.failures += failed
+                stats.last_run_at = datetime.utcnow()
+                stats.last_run_duration = time.perf_counter() - start
+            self.write_stats()
+
+    def get_stats(self) -> dict:
+        """Returns the statistics of all registered tasks keyed by task name."""
+        with self.lock:
+            return {task["name"]: task["stats"].dict() for task in self.registered_tasks}
+
+    def write_stats(self):
+        """Writes the task statistics so that other processes can read them."""
+        if not self.stats_path:
+            return
+
+        stats = self.get_stats()
+        try:
+            with self.stats_lock:
+                tmp_path = f"{self.stats_path}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(stats, f)
+                os.replace(tmp_path, self.stats_path)
+        except OSError as e:
+            log.warning(f"Unable to write scheduler stats. Path: {self.stats_path} Reason: {e}")
+
+    def read_stats(self) -> dict:
+        """Reads the task statistics written by a running scheduler."""
+        try:
+            with open(self.stats_path) as f:
+                return json.load(f)
+        except (OSError, TypeError, ValueError):
+            return {}
+
     def start(self):
         """Runs all scheduled tasks."""
         while True:
             schedule.run_pending()
+            self.submit_due()
             time.sleep(1)
 
 
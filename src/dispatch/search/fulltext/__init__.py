@@ -5,11 +5,12 @@ https://github.com/kvesteri/sqlalchemy-searchable/blob/master/sqlalchemy_searcha
 import os
 from functools import reduce
 
-from sqlalchemy import event, inspect, func, desc, text, MetaData, Table, Index, orm
+from sqlalchemy import event, inspect, func, desc, false, text, MetaData, Table, Index, orm
 from sqlalchemy.dialects.postgresql.base import RESERVED_WORDS
 from sqlalchemy.schema import DDL
 from sqlalchemy_utils import TSVectorType
 
+from .query import parse as parse_search_query, to_tsquery
 from .vectorizers import Vectorizer
 
 
@@ -37,7 +38,7 @@ def inspect_search_vectors(entity):
     ]
 
 
-def search(query, search_query, vector=None, regconfig=None, sort=False):
+def search(query, search_query, vector=None, regconfig=None, sort=False, prefix=True):
     """
     Search given query with full text search.
 
@@ -45,6 +46,7 @@ def search(query, search_query, vector=None, regconfig=None, sort=False):
     :param vector: search vector to use
     :param regconfig: postgresql regconfig to be used
     :param sort: order results by relevance (quality of hit)
+    :param prefix: match words as prefixes of the indexed words
     """
     if not search_query.strip():
         return query
@@ -57,11 +59,16 @@ def search(query, search_query, vector=None, regconfig=None, sort=False):
     if regconfig is None:
         regconfig = search_manager.options["regconfig"]
 
-    query = query.filter(vector.op("@@")(func.tsq_parse(regconfig, search_query)))
+    tsquery = parse_search_query(search_query, prefix=prefix)
+    if tsquery is None:
+        return query.filter(false())
+
+    tsquery = to_tsquery(tsquery, regconfig)
+    query = query.filter(vector.op("@@")(tsquery))
     if sort:
-        query = query.order_by(desc(func.ts_rank_cd(vector, func.tsq_parse(search_query))))
+        query = query.order_by(desc(func.ts_rank_cd(vector, tsquery)))
 
-    return query.params(term=search_query)
+    return query
 
 
 def quote_identifier(identifier):
@@ -10,6 +10,12 @@ Base usage::
     s.search(query=q)
 
 
+Fetching the top ranked objects of each model::
+
+    s = CompositeSearch(session, [User, Comment, Blog], filters={Blog: [Blog.published]})
+    s.ranked_search('star wars', limit=10)
+
+
 Adding other objects::
 
     class RatingSearch(CompositeSearch):
@@ -41,9 +47,10 @@ from . import inspect_search_vectors, search
 
 
 class CompositeSearch(object):
-    def __init__(self, session, model_classes):
+    def __init__(self, session, model_classes, filters=None):
         self.session = session
         self.model_classes = model_classes
+        self.filters = filters or {}
 
     def union_query(self):
         qs = None
@@ -108,3 +115,37 @@ class CompositeSearch(object):
                 if x.type in objects_by_type:
                     objects[x.type].append(objects_by_type[x.type][x.id])
         return objects
+
+    def filter_query(self, model_class, query):
+        return query.filter(*self.filters.get(model_class, []))
+
+    def ranked_query(self, model_class, search_query, limit=None, regconfig=None):
+        """Returns the ids of the objects of a model matching the query, best ranked first."""
+        vector = inspect_search_vectors(model_class)[0]
+        query = self.filter_query(model_class, self.session.query(model_class.id.label("id")))
+        query = search(query, search_query, vector=vector, regconfig=regconfig, sort=True)
+        if limit:
+            query = query.limit(limit)
+        return query
+
+    def ranked_search(self, search_query, limit=None, regconfig=None):
+        """Returns the top `limit` ranked objects of each model keyed by type.
+
+        Each model is searched by its own ranked and limited query instead of ranking the
+        union of all models, and the matching objects are loaded in one query per model.
+        """
+        objects = defaultdict(list)
+        for model_class in self.model_classes:
+            ids = [
+                x.id for x in self.ranked_query(model_class, search_query, limit, regconfig)
+            ]
+            if not ids:
+                continue
+
+            objects_by_id = {
+                x.id: x
+                for x in self.session.query(model_class).filter(model_class.id.in_(ids))
+            }
+            objects_by_id = self.extend_search_objects(model_class, objects_by_id)
+            objects[model_class.__name__] = [objects_by_id[x] for x in ids if x in objects_by_id]
+        return objects
@@ -0,0 +1,209 @@
+"""
+Parses user search queries into PostgreSQL tsquery text.
+
+Follows the syntax of the `tsq_parse` SQL function::
+
+    incident database        both words
+    incident or database     either word
+    -database                without the word
+    "database outage"        the phrase
+    (db or database) outage  grouping
+
+Parsing is done once in Python and the result is bound as a single parameter to
+`to_tsquery`, which is shared by the `@@` filter and `ts_rank_cd`. Unbalanced
+parentheses, dangling operators and punctuation are dropped so that the generated
+tsquery is always valid, input that can't be searched raises `InvalidSearchQuery`.
+"""
+import re
+from typing import List, Optional, Union
+
+from sqlalchemy import bindparam, func
+
+MAX_SEARCH_QUERY_LENGTH = 256
+MAX_SEARCH_QUERY_DEPTH = 16
+
+# characters that are only searchable as part of a word
+WORD_CHARACTERS = re.compile(r"\w", re.UNICODE)
+
+TOKENS = re.compile(r'"[^"]*"?|[()]|[^\s()"]+', re.UNICODE)
+
+
+class InvalidSearchQuery(ValueError):
+    """Raised when a search query can't be parsed."""
+
+
+class Term(object):
+    def __init__(self, words: List[str], phrase: bool = False):
+        self.words = words
+        self.phrase = phrase
+
+
+class Not(object):
+    def __init__(self, node):
+        self.node = node
+
+
+class Operator(object):
+    def __init__(self, operator: str, nodes: List):
+        self.operator = operator
+        self.nodes = nodes
+
+
+Node = Union[Term, Not, Operator]
+
+
+def tokenize(search_query: str) -> List[str]:
+    """Splits a search query into words, phrases, parentheses and operators."""
+    tokens = []
+    for token in TOKENS.findall(search_query.lower()):
+        if token.startswith('"'):
+            tokens.append(token)
+        elif token in ("(", ")"):
+            tokens.append(token)
+        else:
+            # a leading dash negates the word
+            while token.startswith("-"):
+                tokens.append("-")
+                token = token[1:]
+            if token:
+                tokens.append(token)
+    return tokens
+
+
+class Parser(object):
+    """Recursive descent parser of search query tokens.
+
+    Grammar::
+
+        or  := and ("or" and)*
+        and := not+
+        not := "-" not | term
+        term := "(" or ")" | phrase | word
+    """
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.position = 0
+        self.depth = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def next(self) -> Optional[str]:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self) -> Optional[Node]:
+        nodes = []
+        while self.peek() is not None:
+            node = self.parse_or()
+            if node:
+                nodes.append(node)
+            if self.peek() == ")":
+                # unbalanced closing parenthesis
+                self.next()
+        return combine("&", nodes)
+
+    def parse_or(self) -> Optional[Node]:
+        nodes = [self.parse_and()]
+        while self.peek() == "or":
+            self.next()
+            nodes.append(self.parse_and())
+        return combine("|", [n for n in nodes if n])
+
+    def parse_and(self) -> Optional[Node]:
+        nodes = []
+        while self.peek() not in (None, "or", ")"):
+            node = self.parse_not()
+            if node:
+                nodes.append(node)
+        return combine("&", nodes)
+
+    def parse_not(self) -> Optional[Node]:
+        if self.peek() == "-":
+            self.next()
+            if self.peek() in (None, "or", ")"):
+                return None
+            node = self.parse_not()
+            return Not(node) if node else None
+        return self.parse_term()
+
+    def parse_term(self) -> Optional[Node]:
+        token = self.next()
+        if token == "(":
+            self.depth += 1
+            if self.depth > MAX_SEARCH_QUERY_DEPTH:
+                raise InvalidSearchQuery(
+                    f"Search query nests more than {MAX_SEARCH_QUERY_DEPTH} parentheses."
+                )
+            node = self.parse_or()
+            if self.peek() == ")":
+                self.next()
+            self.depth -= 1
+            return node
+
+        if token.startswith('"'):
+            words = get_words(token.strip('"'))
+            return Term(words, phrase=True) if words else None
+
+        words = get_words(token)
+        return Term(words) if words else None
+
+
+def get_words(text: str) -> List[str]:
+    """Returns the searchable words of a token."""
+    return [w for w in text.split() if WORD_CHARACTERS.search(w)]
+
+
+def combine(operator: str, nodes: List[Node]) -> Optional[Node]:
+    if not nodes:
+        return None
+    if len(nodes) == 1:
+        return nodes[0]
+    return Operator(operator, nodes)
+
+
+def quote(word: str) -> str:
+    """Quotes a word as a tsquery operand."""
+    return "'" + word.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def render(node: Node, prefix: bool) -> str:
+    if isinstance(node, Term):
+        if node.phrase:
+            return "(" + " <-> ".join(quote(w) for w in node.words) + ")"
+        suffix = ":*" if prefix else ""
+        return " & ".join(quote(w) + suffix for w in node.words)
+
+    if isinstance(node, Not):
+        return "!(" + render(node.node, prefix) + ")"
+
+    return "(" + f" {node.operator} ".join(render(n, prefix) for n in node.nodes) + ")"
+
+
+def parse(
+    search_query: str, prefix: bool = True, max_length: int = MAX_SEARCH_QUERY_LENGTH
+) -> Optional[str]:
+    """Parses a search query into tsquery text.
+
+    Words match as prefixes unless `prefix` is false, phrases always match whole words.
+    Returns `None` if the query has no searchable words.
+    """
+    if len(search_query) > max_length:
+        raise InvalidSearchQuery(f"Search query is longer than {max_length} characters.")
+    if "\x00" in search_query:
+        raise InvalidSearchQuery("Search query contains a null character.")
+
+    node = Parser(tokenize(search_query)).parse()
+    if not node:
+        return None
+    return render(node, prefix)
+
+
+def to_tsquery(tsquery: str, regconfig: str = None):
+    """Returns the tsquery expression of parsed tsquery text, bound as a single parameter."""
+    term = bindparam("tsquery", tsquery, unique=True)
+    if regconfig:
+        return func.to_tsquery(regconfig, term)
+    return func.to_tsquery(term)
@@ -2,6 +2,7 @@ from typing import List, Optional
 
 from pydantic import Field
 
+from dispatch.enums import TypeaheadTypes
 from dispatch.models import DispatchBase
 
 from dispatch.definition.models import DefinitionRead
@@ -46,3 +47,14 @@ class ContentResponse(DispatchBase):
 class SearchResponse(DispatchBase):
     query: Optional[str] = Field(None, nullable=True)
     results: ContentResponse
+
+
+class TypeaheadItem(DispatchBase):
+    id: int
+    label: Optional[str] = Field(None, nullable=True)
+
+
+class TypeaheadResponse(DispatchBase):
+    query: str
+    type: TypeaheadTypes
+    items: List[TypeaheadItem] = []
@@ -0,0 +1,126 @@
+"""
+.. module: dispatch.search.service
+    :platform: Unix
+    :copyright: (c) 2019 by Netflix Inc., see AUTHORS for more
+    :license: Apache, see LICENSE for more details.
+"""
+import logging
+from threading import Lock
+from typing import List
+
+from cachetools import TTLCache
+from sqlalchemy import func, or_
+
+from dispatch.auth.models import DispatchUser
+from dispatch.case.models import Case
+from dispatch.config import TYPEAHEAD_CACHE_SIZE, TYPEAHEAD_CACHE_TTL
+from dispatch.database.service import apply_model_specific_filters
+from dispatch.enums import TypeaheadTypes, UserRoles
+from dispatch.incident.models import Incident
+from dispatch.individual.models import IndividualContact
+from dispatch.tag.models import Tag
+from dispatch.term.models import Term
+
+log = logging.getLogger(__name__)
+
+# the model, label column and trigram indexed columns of each type
+TYPEAHEAD_MODELS = {
+    TypeaheadTypes.case: (Case, Case.name, [Case.name, Case.title]),
+    TypeaheadTypes.incident: (Incident, Incident.name, [Incident.name, Incident.title]),
+    TypeaheadTypes.individual_contact: (
+        IndividualContact,
+        IndividualContact.email,
+        [IndividualContact.name, IndividualContact.email],
+    ),
+    TypeaheadTypes.tag: (Tag, Tag.name, [Tag.name]),
+    TypeaheadTypes.term: (Term, Term.text, [Term.text]),
+}
+
+# trigram indexes can only match infixes of at least three characters
+TYPEAHEAD_MIN_INFIX_LENGTH = 3
+
+typeahead_cache = TTLCache(maxsize=TYPEAHEAD_CACHE_SIZE, ttl=TYPEAHEAD_CACHE_TTL)
+typeahead_cache_lock = Lock()
+
+
+def escape_like(value: str) -> str:
+    """Escapes the wildcards of a LIKE pattern."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def get_typeahead_query(
+    *,
+    db_session,
+    type: TypeaheadTypes,
+    query_str: str,
+    project_ids: List[int] = None,
+    current_user: DispatchUser = None,
+    role: UserRoles = UserRoles.member,
+    limit: int = 10,
+):
+    """Returns the query of the ids and labels of the objects matching a type-ahead query.
+
+    Short queries match the start of the indexed columns, longer ones match anywhere.
+    Results are ranked by their trigram similarity with the query.
+    """
+    model_cls, label, columns = TYPEAHEAD_MODELS[type]
+
+    query_str = query_str.strip()
+    pattern = escape_like(query_str) + "%"
+    if len(query_str) >= TYPEAHEAD_MIN_INFIX_LENGTH:
+        pattern = "%" + pattern
+
+    query = db_session.query(model_cls.id.label("id"), label.label("label")).filter(
+        or_(*[c.ilike(pattern) for c in columns])
+    )
+    if project_ids:
+        query = query.filter(model_cls.project_id.in_(project_ids))
+    query = apply_model_specific_filters(model_cls, query, current_user, role)
+
+    similarity = func.greatest(*[func.similarity(c, query_str) for c in columns])
+    return query.order_by(similarity.desc(), label).limit(limit)
+
+
+def typeahead(
+    *,
+    db_session,
+    organization: str,
+    type: TypeaheadTypes,
+    query_str: str,
+    project_ids: List[int] = None,
+    current_user: DispatchUser = None,
+    role: UserRoles = UserRoles.member,
+    limit: int = 10,
+) -> List[dict]:
+    """Returns the ids and labels of the objects matching a type-ahead query.
+
+    Results are cached for `TYPEAHEAD_CACHE_TTL` seconds per organization and user.
+    """
+    key = (
+        organization,
+        type,
+        query_str.strip().lower(),
+        tuple(sorted(project_ids or [])),
+        current_user.email if current_user else None,
+        role,
+        limit,
+    )
+    with typeahead_cache_lock:
+        items = typeahead_cache.get(key)
+    if items is not None:
+        return items
+
+    query = get_typeahead_query(
+        db_session=db_session,
+        type=type,
+        query_str=query_str,
+        project_ids=project_ids,
+        current_user=current_user,
+        role=role,
+        limit=limit,
+    )
+    items = [{"id": id, "label": label} for id, label in query]
+
+    with typeahead_cache_lock:
+        typeahead_cache[key] = items
+    return items
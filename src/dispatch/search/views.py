@@ -1,17 +1,23 @@
 from typing import List
 from fastapi import APIRouter, Depends
 from fastapi.params import Query
+from sqlalchemy.orm import Session
 from starlette.responses import JSONResponse
 
-from dispatch.database.core import get_class_by_tablename
+from dispatch.auth.models import DispatchUser
+from dispatch.auth.service import get_current_role, get_current_user
+from dispatch.config import SEARCH_RESULTS_PER_TYPE
+from dispatch.database.core import get_class_by_tablename, get_db
 from dispatch.database.service import composite_search
-from dispatch.database.service import common_parameters
-from dispatch.enums import SearchTypes, UserRoles
-from dispatch.enums import Visibility
+from dispatch.database.service import common_parameters, QueryStr
+from dispatch.enums import SearchTypes, TypeaheadTypes, UserRoles
+from dispatch.models import OrganizationSlug
 
 from .models import (
     SearchResponse,
+    TypeaheadResponse,
 )
+from .service import typeahead
 
 router = APIRouter()
 
@@ -21,6 +27,7 @@ def search(
     *,
     common: dict = Depends(common_parameters),
     type: List[SearchTypes] = Query(..., alias="type[]"),
+    limit: int = Query(SEARCH_RESULTS_PER_TYPE, gt=0, le=100),
 ):
     """Perform a search."""
     if common["query_str"]:
@@ -30,22 +37,35 @@ def search(
             query_str=common["query_str"],
             models=models,
             current_user=common["current_user"],
+            limit=limit,
         )
-        # add a filter for restricted incidents
-        # TODO won't currently show incidents that you are a member
-        admin_projects = []
-        for p in common["current_user"].projects:
-            if p.role == UserRoles.admin:
-                admin_projects.append(p)
-
-        filtered_incidents = []
-        for incident in results["Incident"]:
-            if incident.project in admin_projects or incident.visibility == Visibility.open:
-                filtered_incidents.append(incident)
-
-        results["Incident"] = filtered_incidents
-
     else:
         results = []
 
     return SearchResponse(**{"query": common["query_str"], "results": results}).dict(by_alias=False)
+
+
+@router.get("/typeahead", response_model=TypeaheadResponse)
+def search_typeahead(
+    *,
+    organization: OrganizationSlug,
+    db_session: Session = Depends(get_db),
+    type: TypeaheadTypes,
+    query_str: QueryStr = Query(..., alias="q"),
+    project_ids: List[int] = Query([], alias="projectId[]"),
+    limit: int = Query(10, gt=0, le=50),
+    current_user: DispatchUser = Depends(get_current_user),
+    role: UserRoles = Depends(get_current_role),
+):
+    """Returns the ids and labels of the objects matching a type-ahead query."""
+    items = typeahead(
+        db_session=db_session,
+        organization=organization,
+        type=type,
+        query_str=query_str,
+        project_ids=project_ids,
+        current_user=current_user,
+        role=role,
+        limit=limit,
+    )
+    return {"query": query_str, "type": type, "items": items}
@@ -0,0 +1,400 @@
+"""
+.. module: dispatch.search_filter.evaluator
+    :platform: Unix
+    :copyright: (c) 2019 by Netflix Inc., see AUTHORS for more
+    :license: Apache, see LICENSE for more details.
+
+Compiles search filter expressions into Python predicates that are evaluated
+against already loaded ORM objects, following the semantics of the SQL query
+built by `dispatch.search_filter.service.match`:
+
+- every model referenced by the expression is joined, an object matches if any
+  combination of the joined rows satisfies the expression
+- models joined through the same relationship come from the same row, e.g. the
+  `TagType` of a combination is the type of its `Tag`
+- comparisons against NULL are unknown and `and`/`or`/`not` use three-valued logic
+
+Expressions that can't be evaluated faithfully in memory raise `UnsupportedFilterError`
+and callers fall back to the database.
+"""
+import json
+import logging
+import re
+from datetime import date, datetime
+from itertools import chain, product
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, inspect, not_, or_
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+from dispatch.database.service import FILTER_SPECIFIC_JOINS, BooleanFilter, build_filters
+
+log = logging.getLogger(__name__)
+
+# the key used to bind the object being matched
+DEFAULT_MODEL = None
+
+
+class UnsupportedFilterError(Exception):
+    """Raised when a filter expression can't be evaluated in memory."""
+
+
+def and3(values) -> Optional[bool]:
+    """SQL AND, where `None` is unknown."""
+    result = True
+    for v in values:
+        if v is False:
+            return False
+        if v is None:
+            result = None
+    return result
+
+
+def or3(values) -> Optional[bool]:
+    """SQL OR, where `None` is unknown."""
+    result = False
+    for v in values:
+        if v is True:
+            return True
+        if v is None:
+            result = None
+    return result
+
+
+def not3(values) -> Optional[bool]:
+    """SQL NOT, where `None` is unknown."""
+    (v,) = values
+    return None if v is None else not v
+
+
+BOOLEAN_FUNCTIONS = {and_: and3, or_: or3, not_: not3}
+
+
+def coerce(value: Any, like: Any) -> Any:
+    """Coerces a filter value to the type of the attribute it is compared with."""
+    if value is None or isinstance(value, type(like)) or isinstance(like, type(value)):
+        return value
+
+    try:
+        if isinstance(like, bool):
+            if isinstance(value, str) and value.lower() in ("true", "t", "yes", "y", "on", "1"):
+                return True
+            if isinstance(value, str) and value.lower() in ("false", "f", "no", "n", "off", "0"):
+                return False
+            if isinstance(value, int):
+                return bool(value)
+        elif isinstance(like, int):
+            return int(value)
+        elif isinstance(like, float):
+            return float(value)
+        elif isinstance(like, datetime):
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        elif isinstance(like, date):
+            return date.fromisoformat(str(value))
+    except (TypeError, ValueError) as e:
+        raise UnsupportedFilterError(f"Unable to coerce {value!r} to {type(like)}. {e}")
+
+    raise UnsupportedFilterError(f"Unable to compare {type(like)} with {type(value)}.")
+
+
+def compare(function: Callable) -> Callable:
+    """Wraps a comparison so that NULL operands are unknown."""
+
+    def wrapper(value, argument):
+        if value is None or argument is None:
+            return None
+        argument = coerce(argument, value)
+        try:
+            return function(value, argument)
+        except TypeError as e:
+            raise UnsupportedFilterError(str(e))
+
+    return wrapper
+
+
+def like_regex(pattern: str, flags: int = 0):
+    """Translates a SQL LIKE pattern into a compiled regular expression."""
+    regex = []
+    escaped = False
+    for c in pattern:
+        if escaped:
+            regex.append(re.escape(c))
+            escaped = False
+        elif c == "\\":
+            escaped = True
+        elif c == "%":
+            regex.append(".*")
+        elif c == "_":
+            regex.append(".")
+        else:
+            regex.append(re.escape(c))
+    return re.compile("".join(regex), re.DOTALL | flags)
+
+
+def like(flags: int = 0, negate: bool = False) -> Callable:
+    def wrapper(value, argument):
+        if value is None or argument is None:
+            return None
+        if not isinstance(value, str) or not isinstance(argument, str):
+            raise UnsupportedFilterError("LIKE is only supported on strings.")
+        result = like_regex(argument, flags).fullmatch(value) is not None
+        return not result if negate else result
+
+    return wrapper
+
+
+def in_(negate: bool = False) -> Callable:
+    def wrapper(value, argument):
+        if not isinstance(argument, (list, tuple, set)):
+            raise UnsupportedFilterError("IN requires a list of values.")
+        if not argument:
+            return negate
+        if value is None:
+            return None
+
+        result = False
+        for a in argument:
+            if a is None:
+                result = None
+            elif value == coerce(a, value):
+                result = True
+                break
+        return result if result is None or not negate else not result
+
+    return wrapper
+
+
+def any_(negate: bool = False) -> Callable:
+    def wrapper(value, argument):
+        if value is None:
+            return None
+        if not isinstance(value, (list, tuple)):
+            raise UnsupportedFilterError("ANY is only supported on array columns.")
+        result = any(v == coerce(argument, v) for v in value if v is not None)
+        return not result if negate else result
+
+    return wrapper
+
+
+OPERATORS = {
+    "is_null": lambda v: v is None,
+    "is_not_null": lambda v: v is not None,
+    "==": compare(lambda v, a: v == a),
+    "eq": compare(lambda v, a: v == a),
+    "!=": compare(lambda v, a: v != a),
+    "ne": compare(lambda v, a: v != a),
+    ">": compare(lambda v, a: v > a),
+    "gt": compare(lambda v, a: v > a),
+    "<": compare(lambda v, a: v < a),
+    "lt": compare(lambda v, a: v < a),
+    ">=": compare(lambda v, a: v >= a),
+    "ge": compare(lambda v, a: v >= a),
+    "<=": compare(lambda v, a: v <= a),
+    "le": compare(lambda v, a: v <= a),
+    "like": like(),
+    "ilike": like(re.IGNORECASE),
+    "not_ilike": like(re.IGNORECASE, negate=True),
+    "in": in_(),
+    "not_in": in_(negate=True),
+    "any": any_(),
+    "not_any": any_(negate=True),
+}
+
+
+def compile_node(node) -> Tuple[Callable, bool]:
+    """Compiles a filter tree node into a predicate over a dict of bound objects.
+
+    Also returns whether any of the filters omits its model.
+    """
+    if isinstance(node, BooleanFilter):
+        function = BOOLEAN_FUNCTIONS[node.function]
+        children = [compile_node(f) for f in node.filters]
+        predicates = [c[0] for c in children]
+        unnamed = any(c[1] for c in children)
+        return (lambda bindings: function([p(bindings) for p in predicates])), unnamed
+
+    spec = node.filter_spec
+    model_name = spec.get("model", DEFAULT_MODEL)
+    field_name = spec["field"]
+    operator = OPERATORS[node.operator.operator]
+    arity = node.operator.arity
+    argument = node.value
+
+    def predicate(bindings):
+        obj = bindings[model_name]
+        if obj is None:
+            value = None
+        else:
+            try:
+                value = getattr(obj, field_name)
+            except AttributeError:
+                raise UnsupportedFilterError(f"Unknown field {model_name}.{field_name}.")
+        return operator(value) if arity == 1 else operator(value, argument)
+
+    return predicate, model_name is DEFAULT_MODEL
+
+
+def get_relationships(model_cls, target_name: str) -> List[Any]:
+    """Returns the relationships of a model that target a model with the given name."""
+    return [r for r in inspect(model_cls).relationships if r.mapper.class_.__name__ == target_name]
+
+
+def get_unique_relationship(model_cls, target_name: str, allow_secondary: bool = False):
+    """Returns the only relationship that sql would implicitly join on, or raises."""
+    relationships = [
+        r
+        for r in get_relationships(model_cls, target_name)
+        if allow_secondary or r.secondary is None
+    ]
+    if len(relationships) != 1:
+        raise UnsupportedFilterError(
+            f"Unable to determine how to join {target_name} from {model_cls.__name__}."
+        )
+    return relationships[0]
+
+
+_join_paths_cache: Dict[Tuple[Any, str], Tuple[Tuple[str, ...], bool]] = {}
+
+
+def get_join_path(model_cls, model_name: str) -> Tuple[Tuple[str, ...], bool]:
+    """Returns the relationship path from a model to a named model and whether it is
+    an outer join, following `apply_filter_specific_joins` and sqlalchemy-filters' auto-join."""
+    key = (model_cls, model_name)
+    if key in _join_paths_cache:
+        return _join_paths_cache[key]
+
+    if model_cls.__name__ == model_name:
+        path, is_outer = (), False
+    elif (model_cls, model_name) in FILTER_SPECIFIC_JOINS:
+        joined, is_outer = FILTER_SPECIFIC_JOINS[(model_cls, model_name)]
+        if isinstance(joined, InstrumentedAttribute):
+            first = joined.property
+        else:
+            first = get_unique_relationship(model_cls, joined.__name__)
+
+        path = (first.key,)
+        target_cls = first.mapper.class_
+        if target_cls.__name__ != model_name:
+            path += (get_unique_relationship(target_cls, model_name).key,)
+    else:
+        path, is_outer = (get_unique_relationship(model_cls, model_name).key,), False
+
+    _join_paths_cache[key] = (path, is_outer)
+    return path, is_outer
+
+
+def get_joined_rows(instance, path: Tuple[str, ...]) -> List[Any]:
+    """Returns the objects joined to an instance through a relationship path."""
+    rows = [instance]
+    for attr in path:
+        next_rows = []
+        for row in rows:
+            value = getattr(row, attr)
+            if isinstance(value, (list, set, tuple)):
+                next_rows.extend(value)
+            elif value is not None:
+                next_rows.append(value)
+        rows = next_rows
+    return rows
+
+
+def get_joined_combinations(
+    instance, attr: str, paths: List[Tuple[Tuple[str, ...], bool]]
+) -> List[Tuple[Any, ...]]:
+    """Returns the combinations of objects joined to an instance through relationship
+    paths that start with the same relationship.
+
+    The relationship is only joined once, so every combination comes from the same
+    related row, e.g. a `TagType` is always the type of the `Tag` it is combined with.
+    """
+    related = get_joined_rows(instance, (attr,))
+    if not related:
+        # an outer join yields a single NULL row, unless it is inner joined further
+        if all(is_outer and len(path) == 1 for path, is_outer in paths):
+            return [(None,) * len(paths)]
+        return []
+
+    combinations = []
+    for row in related:
+        combinations.extend(product(*[get_joined_rows(row, path[1:]) for path, _ in paths]))
+    return combinations
+
+
+class CompiledFilter(object):
+    """A search filter expression compiled into a Python predicate."""
+
+    def __init__(self, expression: List[dict]):
+        self.expression = expression
+        try:
+            filters = build_filters(expression)
+            if not filters:
+                raise UnsupportedFilterError("Empty filter expressions are not supported.")
+
+            model_names = set()
+            for f in filters:
+                model_names.update(f.get_named_models())
+            self.model_names = sorted(model_names)
+
+            compiled = [compile_node(f) for f in filters]
+        except UnsupportedFilterError:
+            raise
+        except Exception as e:
+            raise UnsupportedFilterError(f"Unable to compile filter expression. {e}")
+
+        predicates = [c[0] for c in compiled]
+        self.has_unnamed_filters = any(c[1] for c in compiled)
+        self.predicate = lambda bindings: and3(p(bindings) for p in predicates)
+
+    def evaluate(self, instance) -> bool:
+        """Returns whether an instance matches the filter expression."""
+        model_cls = type(instance)
+
+        # models joined through the same relationship share its rows
+        groups: Dict[Optional[str], List[Tuple[str, Tuple[str, ...], bool]]] = {}
+        for model_name in self.model_names:
+            path, is_outer = get_join_path(model_cls, model_name)
+            groups.setdefault(path[0] if path else None, []).append((model_name, path, is_outer))
+
+        if self.has_unnamed_filters and any(attr is not None for attr in groups):
+            raise UnsupportedFilterError("Filters without a model are ambiguous once joined.")
+
+        names = [DEFAULT_MODEL]
+        rows = [[(instance,)]]
+        for attr, members in groups.items():
+            names.extend(model_name for model_name, _, _ in members)
+            if attr is None:
+                rows.append([(instance,) * len(members)])
+            else:
+                paths = [(path, is_outer) for _, path, is_outer in members]
+                rows.append(get_joined_combinations(instance, attr, paths))
+
+        for combination in product(*rows):
+            bindings = dict(zip(names, chain.from_iterable(combination)))
+            if self.predicate(bindings) is True:
+                return True
+        return False
+
+
+_compiled_filters: Dict[int, Tuple[str, CompiledFilter]] = {}
+_compiled_filters_lock = Lock()
+
+
+def get_compiled_filter(search_filter) -> CompiledFilter:
+    """Returns the compiled expression of a search filter, cached by its id."""
+    key = json.dumps(search_filter.expression, sort_keys=True)
+
+    entry = _compiled_filters.get(search_filter.id)
+    if entry and entry[0] == key:
+        return entry[1]
+
+    compiled_filter = CompiledFilter(search_filter.expression)
+    with _compiled_filters_lock:
+        _compiled_filters[search_filter.id] = (key, compiled_filter)
+    return compiled_filter
+
+
+def invalidate(search_filter_id: int):
+    """Drops the compiled expression of a search filter."""
+    with _compiled_filters_lock:
+        _compiled_filters.pop(search_filter_id, None)
@@ -1,4 +1,5 @@
-from typing import List, Optional
+import logging
+from typing import Dict, List, Optional, Set
 
 from sqlalchemy_filters import apply_filters
 
@@ -6,9 +7,13 @@ from dispatch.database.core import Base, get_class_by_tablename, get_table_name_
 from dispatch.database.service import apply_filter_specific_joins
 from dispatch.project import service as project_service
 
+from . import evaluator
 from .models import SearchFilter, SearchFilterCreate, SearchFilterUpdate
 
 
+log = logging.getLogger(__name__)
+
+
 def get(*, db_session, search_filter_id: int) -> Optional[SearchFilter]:
     """Gets a search filter by id."""
     return db_session.query(SearchFilter).filter(SearchFilter.id == search_filter_id).first()
@@ -35,6 +40,59 @@ def match(*, db_session, filter_spec: List[dict], class_instance: Base):
     return query.filter(model_cls.id == class_instance.id).one_or_none()
 
 
+def evaluate(*, db_session, search_filter: SearchFilter, class_instance: Base) -> bool:
+    """Matches a class instance with a search filter, evaluating its compiled expression
+    in memory and falling back to the database for unsupported expressions."""
+    try:
+        return evaluator.get_compiled_filter(search_filter).evaluate(class_instance)
+    except evaluator.UnsupportedFilterError as e:
+        log.debug(f"Matching search filter {search_filter.id} in the database. Reason: {e}")
+
+    return bool(
+        match(
+            db_session=db_session,
+            filter_spec=search_filter.expression,
+            class_instance=class_instance,
+        )
+    )
+
+
+def match_many(
+    *, db_session, search_filters: List[SearchFilter], class_instances: List[Base]
+) -> Dict[int, Set[int]]:
+    """Matches many class instances of the same type with many search filters.
+
+    Returns the ids of the matched instances keyed by search filter id. Compiled
+    expressions are evaluated in memory, the remaining filters issue a single
+    query each regardless of the number of instances.
+    """
+    matches = {f.id: set() for f in search_filters}
+    if not class_instances:
+        return matches
+
+    table_name = get_table_name_by_class_instance(class_instances[0])
+    model_cls = get_class_by_tablename(table_name)
+    instance_ids = [i.id for i in class_instances]
+
+    for search_filter in {f.id: f for f in search_filters}.values():
+        try:
+            compiled_filter = evaluator.get_compiled_filter(search_filter)
+            matches[search_filter.id] = {
+                i.id for i in class_instances if compiled_filter.evaluate(i)
+            }
+            continue
+        except evaluator.UnsupportedFilterError as e:
+            log.debug(f"Matching search filter {search_filter.id} in the database. Reason: {e}")
+
+        query = db_session.query(model_cls.id)
+        query = apply_filter_specific_joins(model_cls, search_filter.expression, query)
+        query = apply_filters(query, search_filter.expression)
+        query = query.filter(model_cls.id.in_(instance_ids)).distinct()
+        matches[search_filter.id] = {instance_id for (instance_id,) in query.all()}
+
+    return matches
+
+
 def get_or_create(*, db_session, search_filter_in) -> SearchFilter:
     if search_filter_in.id:
         q = db_session.query(SearchFilter).filter(SearchFilter.id == search_filter_in.id)
@@ -76,6 +134,7 @@ def update(
             setattr(search_filter, field, update_data[field])
 
     db_session.commit()
+    evaluator.invalidate(search_filter.id)
     return search_filter
 
 
@@ -86,3 +145,4 @@ def delete(*, db_session, search_filter_id: int):
     )
     db_session.delete(search_filter)
     db_session.commit()
+    evaluator.invalidate(search_filter_id)
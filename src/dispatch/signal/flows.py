@@ -1,9 +1,19 @@
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
 from dispatch.case.models import CaseCreate
+from dispatch.config import SIGNAL_INSTANCE_BATCH_SIZE
 from dispatch.database.core import SessionLocal
 from dispatch.case import service as case_service
 from dispatch.case import flows as case_flows
+from dispatch.enums import RuleMode
 from dispatch.signal import service as signal_service
-from dispatch.signal.models import SignalInstanceCreate, RawSignal
+from dispatch.signal.models import SignalInstance, SignalInstanceCreate, RawSignal
+
+log = logging.getLogger(__name__)
 
 
 def create_signal_instance(db_session: SessionLocal, signal_instance_data: RawSignal):
@@ -49,6 +59,156 @@ def create_signal_instance(db_session: SessionLocal, signal_instance_data: RawSi
 
     signal_instance.case = case
     db_session.commit()
+
     return case_flows.case_new_create_flow(
         db_session=db_session, organization_slug=None, case_id=case.id
     )
+
+
+def create_signal_instances(db_session: SessionLocal, signal_instances_data: List[RawSignal]):
+    """Creates signal instances in batches and a case for each new one.
+
+    Signals are resolved, and suppression and deduplication evaluated, in memory for
+    each batch, whose instances are inserted with one statement and committed once.
+    A failing batch is rolled back and counted as failed, the next batches are created.
+    """
+    results = {
+        "created": 0,
+        "suppressed": 0,
+        "duplicates": 0,
+        "cases": 0,
+        "failed": 0,
+        "unknown": [],
+    }
+    for i in range(0, len(signal_instances_data), SIGNAL_INSTANCE_BATCH_SIZE):
+        batch = signal_instances_data[i : i + SIGNAL_INSTANCE_BATCH_SIZE]
+        try:
+            batch_results = create_signal_instance_batch(db_session, batch)
+        except Exception as e:
+            log.exception(f"Failed to create a batch of {len(batch)} signal instances. {e}")
+            db_session.rollback()
+            results["failed"] += len(batch)
+            continue
+
+        for key, value in batch_results.items():
+            results[key] += value
+    return results
+
+
+def create_signal_instance_batch(db_session: SessionLocal, signal_instances_data: List[RawSignal]):
+    """Creates a batch of signal instances and a case for each new one."""
+    by_variant, by_external_id = signal_service.get_all_by_raw_signals(
+        db_session=db_session, raw_signals=signal_instances_data
+    )
+
+    now = datetime.utcnow()
+    instances = []
+    unknown = []
+    for signal_instance_data in signal_instances_data:
+        if signal_instance_data.variant:
+            signal = by_variant.get(signal_instance_data.variant)
+        else:
+            signal = by_external_id.get(signal_instance_data.id)
+
+        if not signal:
+            unknown.append(signal_instance_data.id)
+            continue
+
+        instances.append(
+            (
+                signal,
+                {
+                    "id": uuid.uuid4(),
+                    "signal_id": signal.id,
+                    "project_id": signal.project_id,
+                    "raw": json.loads(signal_instance_data.json()),
+                    "fingerprint": None,
+                    "case_id": None,
+                    "suppression_rule_id": None,
+                    "duplication_rule_id": None,
+                    "created_at": now,
+                    "updated_at": now,
+                },
+            )
+        )
+
+    # raw signals have no tags, suppressed instances aren't fingerprinted
+    for signal, instance in instances:
+        if signal_service.is_suppressed(signal.suppression_rule, []):
+            instance["suppression_rule_id"] = signal.suppression_rule.id
+        else:
+            instance["fingerprint"] = signal_service.get_fingerprint(
+                signal.duplication_rule, [], instance["raw"]
+            )
+
+    # we look up the earliest previous instance of each fingerprint within its rule's window
+    fingerprints = {}
+    for signal, instance in instances:
+        rule = signal.duplication_rule
+        if instance["fingerprint"] and rule and rule.mode == RuleMode.active:
+            fingerprints[(signal.id, instance["fingerprint"])] = now - timedelta(seconds=rule.window)
+    previous = signal_service.get_duplicates(db_session=db_session, fingerprints=fingerprints)
+
+    new = []
+    duplicates_of = {}
+    earliest = {}
+    suppressed = duplicates = 0
+    for signal, instance in instances:
+        if instance["suppression_rule_id"]:
+            suppressed += 1
+            continue
+
+        key = (signal.id, instance["fingerprint"])
+        if key in fingerprints:
+            if key in previous:
+                instance["case_id"] = previous[key].case_id
+                instance["duplication_rule_id"] = signal.duplication_rule.id
+                duplicates += 1
+                continue
+
+            if key in earliest:
+                duplicates_of[earliest[key]["id"]].append(instance["id"])
+                instance["duplication_rule_id"] = signal.duplication_rule.id
+                duplicates += 1
+                continue
+
+            earliest[key] = instance
+
+        duplicates_of[instance["id"]] = []
+        new.append((signal, instance))
+
+    signal_service.create_instances(db_session=db_session, instances=[i for _, i in instances])
+    db_session.commit()
+
+    # create a case for each instance that isn't a duplicate or supressed
+    cases = 0
+    for signal, instance in new:
+        try:
+            case_in = CaseCreate(
+                title=signal.name,
+                description=signal.description,
+                case_priority=signal.case_priority,
+                case_type=signal.case_type,
+            )
+            case = case_service.create(db_session=db_session, case_in=case_in)
+
+            db_session.query(SignalInstance).filter(
+                SignalInstance.id.in_([instance["id"]] + duplicates_of[instance["id"]])
+            ).update({"case_id": case.id}, synchronize_session=False)
+            db_session.commit()
+
+            case_flows.case_new_create_flow(
+                db_session=db_session, organization_slug=None, case_id=case.id
+            )
+            cases += 1
+        except Exception as e:
+            log.exception(e)
+            db_session.rollback()
+
+    return {
+        "created": len(instances),
+        "suppressed": suppressed,
+        "duplicates": duplicates,
+        "cases": cases,
+        "unknown": unknown,
+    }
@@ -4,7 +4,16 @@ from typing import Any, List, Optional, Dict
 from pydantic import Field
 
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, PrimaryKeyConstraint, DateTime
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    PrimaryKeyConstraint,
+    String,
+    Table,
+)
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy_utils import TSVectorType
 
@@ -97,6 +106,15 @@ class Signal(Base, TimeStampMixin, ProjectMixin):
 
 
 class SignalInstance(Base, TimeStampMixin, ProjectMixin):
+    __table_args__ = (
+        Index(
+            "ix_signal_instance_signal_id_fingerprint_created_at",
+            "signal_id",
+            "fingerprint",
+            "created_at",
+        ),
+    )
+
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     case_id = Column(Integer, ForeignKey("case.id", ondelete="CASCADE"))
     case = relationship("Case", backref="signal_instances")
@@ -224,6 +242,16 @@ class SignalInstanceRead(SignalInstanceBase):
     signal: SignalRead
 
 
+class SignalInstanceBatchRead(DispatchBase):
+    created: int
+    suppressed: int
+    duplicates: int
+    cases: int
+    failed: int = 0
+    unknown: List[str] = []
+
+
 class SignalInstancePagination(DispatchBase):
     items: List[SignalInstanceRead]
-    total: int
+    total: Optional[int]
+    next: Optional[str] = None
@@ -36,12 +36,17 @@ def consume_signals(db_session: SessionLocal, project: Project):
         log.debug(f"Consuming signals. Signal Consumer: {plugin.plugin.slug}")
         signal_instances = plugin.instance.consume()
 
-        for signal_instance_data in signal_instances:
-            try:
-                signal_flows.create_signal_instance(
-                    db_session=db_session,
-                    signal_instance_data=signal_instance_data,
-                )
-            except Exception as e:
-                log.debug(signal_instance_data)
-                log.exception(e)
+        try:
+            results = signal_flows.create_signal_instances(
+                db_session=db_session,
+                signal_instances_data=list(signal_instances),
+            )
+        except Exception as e:
+            db_session.rollback()
+            log.exception(e)
+            continue
+
+        if results["unknown"]:
+            log.warning(f"Signals not found. ExternalIds: {results['unknown']}")
+        if results["failed"]:
+            log.warning(f"Failed to create {results['failed']} signal instances.")
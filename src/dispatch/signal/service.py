@@ -1,6 +1,11 @@
 import hashlib
-from typing import Optional
-from datetime import datetime, timedelta, timezone
+import json
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import selectinload
+
 from dispatch.enums import RuleMode
 from dispatch.project import service as project_service
 from dispatch.tag import service as tag_service
@@ -20,6 +25,7 @@ from .models import (
     DuplicationRuleUpdate,
     SuppressionRuleCreate,
     SuppressionRuleUpdate,
+    RawSignal,
 )
 
 
@@ -233,84 +239,154 @@ def create_instance(*, db_session, signal_instance_in: SignalInstanceCreate) ->
     return signal_instance
 
 
-def create_instance_fingerprint(duplication_rule, signal_instance: SignalInstance) -> str:
+def get_fingerprint(duplication_rule, tags, raw: dict) -> str:
     """Given a list of tag_types and tags creates a hash of their values."""
     hash_values = []
     if duplication_rule:
-        if signal_instance.tags:
+        if tags:
             tag_type_names = [t.name for t in duplication_rule.tag_types]
-            for tag in signal_instance.tags:
+            for tag in tags:
                 if tag.tag_type.name in tag_type_names:
                     hash_values.append(tag.tag_type.name)
         else:
-            hash_values = signal_instance.raw.values()
+            hash_values = raw.values()
     else:
-        hash_values = signal_instance.raw.values()  # fall back to creating a hash of all values
+        hash_values = raw.values()  # fall back to creating a hash of all values
 
+    # raw signals contain lists and dicts, which are hashed by their json representation
+    hash_values = [
+        v if isinstance(v, str) else json.dumps(v, sort_keys=True, default=str)
+        for v in hash_values
+    ]
     return hashlib.sha1("-".join(sorted(hash_values)).encode("utf-8")).hexdigest()
 
 
+def create_instance_fingerprint(duplication_rule, signal_instance: SignalInstance) -> str:
+    """Given a list of tag_types and tags creates a hash of their values."""
+    return get_fingerprint(duplication_rule, signal_instance.tags, signal_instance.raw)
+
+
 def deduplicate(
     *, db_session, signal_instance: SignalInstance, duplication_rule: DuplicationRule
 ) -> bool:
-    """Find any matching duplication rules and match signals."""
+    """Find any matching duplication rules and match signals.
+
+    An instance is a duplicate of the earliest instance of its signal with the same
+    fingerprint created within the rule's window.
+    """
     duplicate = False
 
     # always fingerprint
     fingerprint = create_instance_fingerprint(duplication_rule, signal_instance)
     signal_instance.fingerprint = fingerprint
-    db_session.commit()
-
-    if not duplication_rule:
-        return duplicate
 
-    if duplication_rule.mode != RuleMode.active:
+    if not duplication_rule or duplication_rule.mode != RuleMode.active:
+        db_session.commit()
         return duplicate
 
-    window = datetime.now(timezone.utc) - timedelta(seconds=duplication_rule.window)
-    fingerprint = create_instance_fingerprint(duplication_rule.tag_types, signal_instance)
-
-    instances = (
-        db_session.query(SignalInstance)
-        .filter(Signal.id == signal_instance.signal.id)
-        .filter(SignalInstance.id != signal_instance.id)
-        .filter(SignalInstance.created_at >= window)
-        .filter(SignalInstance.fingerprint == fingerprint)
-        .all()
+    since = datetime.utcnow() - timedelta(seconds=duplication_rule.window)
+    key = (signal_instance.signal_id, fingerprint)
+    duplicates = get_duplicates(
+        db_session=db_session, fingerprints={key: since}, exclude_id=signal_instance.id
     )
 
-    if instances:
+    if key in duplicates:
         duplicate = True
-        # TODO find the earliest created instance
-        signal_instance.case_id = instances[0].case_id
+        signal_instance.case_id = duplicates[key].case_id
         signal_instance.duplication_rule_id = duplication_rule.id
 
     db_session.commit()
     return duplicate
 
 
-def supress(
-    *, db_session, signal_instance: SignalInstance, suppression_rule: SuppressionRule
-) -> bool:
-    """Find any matching suppression rules and match instances."""
-    supressed = False
+def get_duplicates(
+    *, db_session, fingerprints: Dict[Tuple[int, str], datetime], exclude_id=None
+) -> Dict[Tuple[int, str], SignalInstance]:
+    """Returns the earliest instance created since the given time of each (signal id,
+    fingerprint) pair that has one, with one query."""
+    if not fingerprints:
+        return {}
+
+    instances = (
+        db_session.query(SignalInstance)
+        .filter(
+            or_(
+                *[
+                    and_(
+                        SignalInstance.signal_id == signal_id,
+                        SignalInstance.fingerprint == fingerprint,
+                        SignalInstance.created_at >= since,
+                    )
+                    for (signal_id, fingerprint), since in fingerprints.items()
+                ]
+            )
+        )
+        .distinct(SignalInstance.signal_id, SignalInstance.fingerprint)
+        .order_by(
+            SignalInstance.signal_id,
+            SignalInstance.fingerprint,
+            SignalInstance.created_at,
+            SignalInstance.id,
+        )
+    )
+    if exclude_id:
+        instances = instances.filter(SignalInstance.id != exclude_id)
+
+    return {(i.signal_id, i.fingerprint): i for i in instances}
 
+
+def is_suppressed(suppression_rule: SuppressionRule, tag_ids: List[int]) -> bool:
+    """Returns whether an active suppression rule matches the given tags."""
     if not suppression_rule:
-        return supressed
+        return False
 
     if suppression_rule.mode != RuleMode.active:
-        return supressed
+        return False
 
     if suppression_rule.expiration:
         if suppression_rule.expiration <= datetime.now():
-            return supressed
+            return False
+
+    return sorted([t.id for t in suppression_rule.tags]) == sorted(tag_ids)
+
 
-    rule_tag_ids = sorted([t.id for t in suppression_rule.tags])
-    signal_tag_ids = sorted([t.id for t in signal_instance.tags])
+def supress(
+    *, db_session, signal_instance: SignalInstance, suppression_rule: SuppressionRule
+) -> bool:
+    """Find any matching suppression rules and match instances."""
+    supressed = is_suppressed(suppression_rule, [t.id for t in signal_instance.tags])
 
-    if rule_tag_ids == signal_tag_ids:
-        supressed = True
+    if supressed:
         signal_instance.suppression_rule_id = suppression_rule.id
 
     db_session.commit()
     return supressed
+
+
+def get_all_by_raw_signals(
+    *, db_session, raw_signals: List[RawSignal]
+) -> Tuple[Dict[str, Signal], Dict[str, Signal]]:
+    """Gets the signals of raw signals with one query, keyed by variant and by external id."""
+    variants = {r.variant for r in raw_signals if r.variant}
+    external_ids = {r.id for r in raw_signals if not r.variant}
+
+    signals = (
+        db_session.query(Signal)
+        .filter(or_(Signal.variant.in_(variants), Signal.external_id.in_(external_ids)))
+        .options(
+            selectinload(Signal.project),
+            selectinload(Signal.suppression_rule).selectinload(SuppressionRule.tags),
+            selectinload(Signal.duplication_rule).selectinload(DuplicationRule.tag_types),
+        )
+        .all()
+    )
+
+    by_variant = {s.variant: s for s in signals if s.variant in variants}
+    by_external_id = {s.external_id: s for s in signals if s.external_id in external_ids}
+    return by_variant, by_external_id
+
+
+def create_instances(*, db_session, instances: List[dict]):
+    """Inserts signal instances with one multi-row statement, without committing."""
+    if instances:
+        db_session.execute(SignalInstance.__table__.insert().values(instances))
@@ -1,3 +1,5 @@
+from typing import List
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic.error_wrappers import ErrorWrapper, ValidationError
 
@@ -6,7 +8,11 @@ from sqlalchemy.orm import Session
 
 from dispatch.database.core import get_db
 from dispatch.exceptions import ExistsError
-from dispatch.database.service import common_parameters, search_filter_sort_paginate
+from dispatch.database.service import (
+    common_parameters,
+    keyset_parameters,
+    search_filter_sort_paginate,
+)
 from dispatch.models import PrimaryKey
 
 from .models import (
@@ -16,19 +22,30 @@ from .models import (
     SignalRead,
     SignalInstanceRead,
     SignalInstanceCreate,
+    SignalInstanceBatchRead,
+    RawSignal,
     SignalInstancePagination,
 )
+from .flows import create_signal_instances
 from .service import create, update, get, create_instance, delete
 
 router = APIRouter()
 
 
 @router.get("/instances", response_model=SignalInstancePagination)
-def get_signal_instances(*, common: dict = Depends(common_parameters)):
+def get_signal_instances(*, common: dict = Depends(keyset_parameters)):
     """Get all signal instances."""
     return search_filter_sort_paginate(model="SignalInstance", **common)
 
 
+@router.post("/instances/batch", response_model=SignalInstanceBatchRead)
+def create_signal_instance_batch(
+    *, db_session: Session = Depends(get_db), signal_instances_in: List[RawSignal]
+):
+    """Create signal instances from a batch of raw signals."""
+    return create_signal_instances(db_session=db_session, signal_instances_data=signal_instances_in)
+
+
 @router.get("", response_model=SignalPagination)
 def get_signals(*, common: dict = Depends(common_parameters)):
     """Get all signal definitions."""
@@ -0,0 +1,93 @@
+"""
+.. module: dispatch.tag.matcher
+    :platform: Unix
+    :copyright: (c) 2019 by Netflix Inc., see AUTHORS for more
+    :license: Apache, see LICENSE for more details.
+
+Matchers are cached per process and invalidated when a tag is changed through this
+process. Tags changed by other processes, e.g. the scheduler or other API workers,
+are picked up once the cached matcher is older than `TAG_MATCHER_CACHE_TTL` seconds.
+"""
+import logging
+import time
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, Tuple
+
+from spacy.matcher import PhraseMatcher
+
+from dispatch.config import TAG_MATCHER_CACHE_TTL
+from dispatch.nlp import build_phrase_matcher, build_term_vocab
+from dispatch.project.models import Project
+
+from .models import Tag
+
+log = logging.getLogger(__name__)
+
+MatcherKey = Tuple[str, int]
+
+_lock = Lock()
+# the matcher of each project and the time it was built at
+_matchers: Dict[MatcherKey, Tuple[PhraseMatcher, float]] = {}
+_generations: Dict[MatcherKey, int] = defaultdict(int)
+
+
+def get_key(project: Project) -> MatcherKey:
+    """Returns the registry key (organization slug, project id) for a project."""
+    return (project.organization.slug, project.id)
+
+
+def build_matcher(*, db_session, project_id: int) -> PhraseMatcher:
+    """Builds a phrase matcher from all discoverable tags in a project."""
+    tag_names = (
+        db_session.query(Tag.name)
+        .filter(Tag.project_id == project_id)
+        .filter(Tag.discoverable == True)  # noqa
+        .all()
+    )
+    tag_strings = [name.lower() for (name,) in tag_names if name]
+    log.debug(f"Building tag phrase matcher with {len(tag_strings)} tags.")
+    phrases = build_term_vocab(tag_strings)
+    return build_phrase_matcher("dispatch-tag", phrases)
+
+
+def get_matcher(*, db_session, project: Project) -> PhraseMatcher:
+    """Returns the cached tag phrase matcher for a project, building it if required."""
+    key = get_key(project)
+
+    # an empty matcher is falsy, so we check the entry itself
+    entry = _matchers.get(key)
+    if entry is not None:
+        matcher, built_at = entry
+        if time.monotonic() - built_at < TAG_MATCHER_CACHE_TTL:
+            return matcher
+
+    with _lock:
+        generation = _generations[key]
+
+    built_at = time.monotonic()
+    # we build outside of the lock so that one slow project doesn't block the others
+    matcher = build_matcher(db_session=db_session, project_id=project.id)
+
+    with _lock:
+        # only cache the matcher if no tag changed while we were building it
+        if _generations[key] == generation:
+            _matchers[key] = (matcher, built_at)
+
+    return matcher
+
+
+def invalidate(*, project: Project):
+    """Drops the cached tag phrase matcher for a project."""
+    key = get_key(project)
+    with _lock:
+        _generations[key] += 1
+        _matchers.pop(key, None)
+
+
+def clear():
+    """Drops all cached tag phrase matchers."""
+    with _lock:
+        for key in _matchers:
+            _generations[key] += 1
+        _matchers.clear()
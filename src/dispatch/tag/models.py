@@ -1,7 +1,7 @@
 from typing import Optional, List
 from pydantic import Field
 
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, Boolean, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.schema import UniqueConstraint
 from sqlalchemy_utils import TSVectorType
@@ -13,7 +13,15 @@ from dispatch.tag_type.models import TagTypeRead, TagTypeCreate, TagTypeUpdate
 
 
 class Tag(Base, TimeStampMixin, ProjectMixin):
-    __table_args__ = (UniqueConstraint("name", "project_id"),)
+    __table_args__ = (
+        UniqueConstraint("name", "project_id"),
+        Index(
+            "ix_tag_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     # Columns
     id = Column(Integer, primary_key=True)
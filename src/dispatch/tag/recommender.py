@@ -5,12 +5,13 @@
     :license: Apache, see LICENSE for more details.
 """
 import logging
-from typing import List, Any
-from collections import defaultdict
+from typing import List, Any, Tuple
 
 import tempfile
+import numpy as np
 import pandas as pd
 from pandas.core.frame import DataFrame
+from scipy.sparse import csr_matrix
 
 from dispatch.database.core import SessionLocal
 from dispatch.tag import service as tag_service
@@ -30,77 +31,67 @@ def load_model(organization_slug: str, project_slug: str, model_name: str):
     return pd.read_pickle(file_name)
 
 
-def correlation(df, tag_a, tag_b):
-    """Determine the probability of correlation/association."""
-    # Find all rows where a AND b == True
-    a_and_b = df[(df[tag_a]) & (df[tag_b])]
+def get_unique_tags(items: List[Any]):
+    """Get unique tags."""
+    unique_tags = {}
+    for i in items:
+        for t in i.tags:
+            unique_tags[t.id] = t.id
+    return unique_tags
 
-    # Find all rows where a == True AND b != True
-    a_not_b = df[(df[tag_a]) & ~(df[tag_b])]
-    # Find all rows where b == True AND a != True
-    b_not_a = df[(df[tag_b]) & ~(df[tag_a])]
 
-    # Calculate the number of positive and possible outcomes using the shape attribute
-    possible_outcomes = (
-        a_and_b.shape[0] + a_not_b.shape[0] + b_not_a.shape[0]
-    )  # shape[0] returns the number of rows
-    positive_outcomes = a_and_b.shape[0]
+def create_incidence_matrix(items: List[Any]) -> Tuple[csr_matrix, List[int]]:
+    """Create a sparse item x tag incidence matrix and its tag ids (the matrix columns)."""
+    tag_index = {}
+    rows, cols = [], []
+    for row, i in enumerate(items):
+        for t in i.tags:
+            rows.append(row)
+            cols.append(tag_index.setdefault(t.id, len(tag_index)))
 
-    # Calculate the final correlation coefficient
-    r = positive_outcomes / possible_outcomes
+    matrix = csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+        shape=(len(items), len(tag_index)),
+    )
 
-    return r
+    # an item can't have the same tag twice, but we guard against duplicate rows anyway
+    matrix.data = np.minimum(matrix.data, 1)
+    return matrix, list(tag_index)
 
 
-def correlate_with_every_tag(df, tag_a):
-    """Create correlations between every tag."""
+def create_correlation_matrix(matrix: csr_matrix) -> np.ndarray:
+    """Create the tag x tag correlation matrix from an item x tag incidence matrix.
 
-    unique_tags = list(df.columns)
-    # Loop through every tag and store the correlation in a list
-    correlation_list = []
-    for tag_b in unique_tags:
-        correlation_list.append(correlation(df, tag_a, tag_b))
-    return correlation_list
+    The correlation of two tags is the number of items having both tags divided by
+    the number of items having either of them.
+    """
+    # number of items having both tag a and tag b
+    a_and_b = (matrix.T @ matrix).toarray()
 
+    # number of items having tag a or tag b
+    counts = a_and_b.diagonal()
+    a_or_b = counts[:, None] + counts[None, :] - a_and_b
 
-def get_unique_tags(items: List[Any]):
-    """Get unique tags."""
-    unique_tags = {}
-    for i in items:
-        for t in i.tags:
-            unique_tags[t.id] = t.id
-    return unique_tags
+    return np.divide(
+        a_and_b, a_or_b, out=np.zeros(a_and_b.shape, dtype=np.float64), where=a_or_b > 0
+    )
 
 
 def create_correlation_dataframe(dataframe):
     """Create the correlation dataframe based on the boolean dataframe."""
     unique_tags = list(dataframe.columns)
-
-    correlation_matrix_dict = {}
-
-    for tag_a in unique_tags:
-        correlation_matrix_dict[tag_a] = correlate_with_every_tag(dataframe, tag_a)
-
-    correlated_dataframe = pd.DataFrame(correlation_matrix_dict)
-    correlated_dataframe["index"] = unique_tags
-    return correlated_dataframe.set_index("index")
+    matrix = csr_matrix(dataframe.to_numpy(dtype=np.int32))
+    return pd.DataFrame(
+        create_correlation_matrix(matrix),
+        index=pd.Index(unique_tags, name="index"),
+        columns=unique_tags,
+    )
 
 
 def create_boolean_dataframe(items: List[Any]):
     """Create a boolean dataframe with tag and item data."""
-    unique_tags = get_unique_tags(items)
-    boolean_df = pd.DataFrame(columns=unique_tags.values())
-
-    data_dict = defaultdict(list)
-    for col in boolean_df:
-        for i in items:
-            tag_ids = [t.id for t in i.tags]
-            data_dict[col].append(col in tag_ids)
-
-    for col in boolean_df:
-        boolean_df[col] = data_dict[col]
-
-    return boolean_df
+    matrix, unique_tags = create_incidence_matrix(items)
+    return pd.DataFrame(matrix.toarray().astype(bool), columns=unique_tags)
 
 
 def find_correlations(dataframe, tag):
@@ -175,6 +166,10 @@ def get_recommendations(
 
 def build_model(items: List[Any], organization_slug: str, project_slug: str, model_name: str):
     """Builds the correlation dataframe for items."""
-    boolean_dataframe = create_boolean_dataframe(items)
-    correlation_dataframe = create_correlation_dataframe(boolean_dataframe)
+    matrix, unique_tags = create_incidence_matrix(items)
+    correlation_dataframe = pd.DataFrame(
+        create_correlation_matrix(matrix),
+        index=pd.Index(unique_tags, name="index"),
+        columns=unique_tags,
+    )
     save_model(correlation_dataframe, organization_slug, project_slug, model_name)
@@ -5,6 +5,7 @@ from dispatch.exceptions import NotFoundError
 from dispatch.project import service as project_service
 from dispatch.tag_type import service as tag_type_service
 
+from . import matcher as tag_matcher
 from .models import Tag, TagCreate, TagUpdate, TagRead
 
 
@@ -58,6 +59,7 @@ def create(*, db_session, tag_in: TagCreate) -> Tag:
     tag.project = project
     db_session.add(tag)
     db_session.commit()
+    tag_matcher.invalidate(project=tag.project)
     return tag
 
 
@@ -92,11 +94,14 @@ def update(*, db_session, tag: Tag, tag_in: TagUpdate) -> Tag:
         tag.tag_type = tag_type
 
     db_session.commit()
+    tag_matcher.invalidate(project=tag.project)
     return tag
 
 
 def delete(*, db_session, tag_id: int):
     """Deletes an existing tag."""
     tag = db_session.query(Tag).filter(Tag.id == tag_id).one_or_none()
+    project = tag.project
     db_session.delete(tag)
     db_session.commit()
+    tag_matcher.invalidate(project=project)
@@ -72,7 +72,9 @@ def sync_tasks(db_session, task_plugin, incidents, lookback: int = 60, notify: b
 @scheduled_project_task
 def daily_sync_task(db_session: SessionLocal, project: Project):
     """Syncs all incident tasks daily."""
-    incidents = incident_service.get_all(db_session=db_session, project_id=project.id).all()
+    incidents = incident_service.get_all(
+        db_session=db_session, project_id=project.id, load_profile="sync"
+    ).all()
     task_plugin = plugin_service.get_active_instance(
         db_session=db_session, project_id=project.id, plugin_type="task"
     )
@@ -99,10 +101,16 @@ def sync_active_stable_tasks(db_session: SessionLocal, project: Project):
 
     # we get all active and stable incidents
     active_incidents = incident_service.get_all_by_status(
-        db_session=db_session, project_id=project.id, status=IncidentStatus.active
+        db_session=db_session,
+        project_id=project.id,
+        status=IncidentStatus.active,
+        load_profile="sync",
     )
     stable_incidents = incident_service.get_all_by_status(
-        db_session=db_session, project_id=project.id, status=IncidentStatus.stable
+        db_session=db_session,
+        project_id=project.id,
+        status=IncidentStatus.stable,
+        load_profile="sync",
     )
 
     incidents = active_incidents + stable_incidents
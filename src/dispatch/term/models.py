@@ -1,7 +1,7 @@
 from typing import List, Optional
 from pydantic import Field
 
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Index, Integer, String, Boolean
 from sqlalchemy.sql.schema import UniqueConstraint
 from sqlalchemy_utils import TSVectorType
 
@@ -17,7 +17,15 @@ from dispatch.project.models import ProjectRead
 
 # SQLAlchemy models...
 class Term(Base, ProjectMixin):
-    __table_args__ = (UniqueConstraint("text", "project_id"),)
+    __table_args__ = (
+        UniqueConstraint("text", "project_id"),
+        Index(
+            "ix_term_text_trgm",
+            "text",
+            postgresql_using="gin",
+            postgresql_ops={"text": "gin_trgm_ops"},
+        ),
+    )
     id = Column(Integer, primary_key=True)
     text = Column(String)
     discoverable = Column(Boolean, default=True)
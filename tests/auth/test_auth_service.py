@@ -0,0 +1,16 @@
+def test_cached_identity(session):
+    from dispatch.auth.models import DispatchUser
+    from dispatch.auth.service import (
+        get_cached_identity,
+        invalidate_cached_identity,
+        set_cached_identity,
+    )
+
+    user = DispatchUser(id=1, email="cached@example.com")
+    set_cached_identity(organization="default", user=user)
+    set_cached_identity(organization="other", user=user)
+    assert get_cached_identity(organization="default", email=user.email) == (1, None)
+
+    invalidate_cached_identity(email=user.email)
+    assert not get_cached_identity(organization="default", email=user.email)
+    assert not get_cached_identity(organization="other", email=user.email)
@@ -0,0 +1,55 @@
+"""
+Microbenchmark of `PluginManager.get` and `PluginManager.all` lookups.
+
+Registers an increasing number of plugins and shows that slug and type lookups
+stay constant time, run with:
+
+    python -m tests.benchmarks.bench_plugin_manager
+"""
+import sys
+import timeit
+import types
+
+from dispatch.plugins.base import Plugin, PluginManager
+
+
+def build_manager(count: int) -> PluginManager:
+    """Builds a plugin manager with `count` registered plugins."""
+    module = types.ModuleType("bench_plugins")
+    sys.modules[module.__name__] = module
+
+    manager = PluginManager()
+    for i in range(count):
+        cls = type(
+            f"BenchPlugin{i}",
+            (Plugin,),
+            {
+                "__module__": module.__name__,
+                "title": f"Bench Plugin {i}",
+                "slug": f"bench-plugin-{i}",
+                "type": f"bench-type-{i % 10}",
+            },
+        )
+        setattr(module, cls.__name__, cls)
+        manager.register(cls)
+    return manager
+
+
+def main(number: int = 10000):
+    for count in (10, 100, 1000):
+        manager = build_manager(count)
+        slug = f"bench-plugin-{count - 1}"
+        manager.get(slug)  # warm the indexes
+
+        get_elapsed = timeit.timeit(lambda: manager.get(slug), number=number)
+        all_elapsed = timeit.timeit(
+            lambda: list(manager.all(plugin_type="bench-type-0")), number=number
+        )
+        print(
+            f"{count} plugins: get {get_elapsed / number * 1e6:.2f} us, "
+            f"all(plugin_type) {all_elapsed / number * 1e6:.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
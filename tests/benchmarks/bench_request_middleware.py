@@ -0,0 +1,69 @@
+"""
+Microbenchmark of the per-request overhead of `db_session_middleware`.
+
+Compares the previous per-request work (compiling every route regex, querying the
+schema catalog and building a new sessionmaker) with the cached equivalents.
+
+Requires a configured database, run with:
+
+    python -m tests.benchmarks.bench_request_middleware
+"""
+import timeit
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import sessionmaker
+from starlette.routing import compile_path
+
+from dispatch.api import api_router
+from dispatch.database.core import (
+    engine,
+    get_organization_schema_name,
+    get_schema_sessionmaker,
+    organization_schema_exists,
+)
+from dispatch.main import compile_route_path_regexes
+
+
+PATH = "/default/incidents/1"
+SCHEMA = get_organization_schema_name("default")
+
+
+def before():
+    path_params = {}
+    for r in api_router.routes:
+        path_regex, _, _ = compile_path(r.path)
+        match = path_regex.match(PATH)
+        if match:
+            path_params = match.groupdict()
+
+    assert SCHEMA in inspect(engine).get_schema_names()
+    schema_engine = engine.execution_options(schema_translate_map={None: SCHEMA})
+    sessionmaker(bind=schema_engine)().close()
+    return path_params
+
+
+route_path_regexes = compile_route_path_regexes(api_router)
+
+
+def after():
+    path_params = {}
+    for path_regex in route_path_regexes:
+        match = path_regex.match(PATH)
+        if match:
+            path_params = match.groupdict()
+            break
+
+    assert organization_schema_exists(SCHEMA)
+    get_schema_sessionmaker(SCHEMA)().close()
+    return path_params
+
+
+def main(number: int = 1000):
+    assert before() == after()
+    for name, func in [("before", before), ("after", after)]:
+        elapsed = timeit.timeit(func, number=number)
+        print(f"{name}: {elapsed / number * 1e6:.1f} us/request ({number} requests)")
+
+
+if __name__ == "__main__":
+    main()
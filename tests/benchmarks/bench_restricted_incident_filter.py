@@ -0,0 +1,132 @@
+"""
+Benchmark of the incident visibility restriction applied to member users.
+
+Seeds a scratch schema with 100k incidents, 1M participants and 50k individual
+contacts and compares the list and count queries built by the previous join +
+DISTINCT restriction and by the EXISTS semi-join, for members and admins, with
+and without the participant (individual_contact_id, incident_id) index, run with:
+
+    python -m tests.benchmarks.bench_restricted_incident_filter
+
+The schema is dropped when the benchmark finishes.
+"""
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+from dispatch.config import SQLALCHEMY_DATABASE_URI
+
+SCHEMA = "dispatch_benchmark_restricted_incident_filter"
+INCIDENTS = 100000
+PARTICIPANTS = 1000000
+CONTACTS = 50000
+RUNS = 5
+
+SEED = f"""
+DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+CREATE SCHEMA {SCHEMA};
+SET search_path TO {SCHEMA};
+
+CREATE TABLE individual_contact (id serial PRIMARY KEY, email varchar, UNIQUE (email));
+CREATE TABLE incident (
+    id serial PRIMARY KEY, title varchar, visibility varchar, created_at timestamp
+);
+CREATE TABLE participant (
+    id serial PRIMARY KEY,
+    incident_id integer REFERENCES incident(id),
+    individual_contact_id integer REFERENCES individual_contact(id)
+);
+
+INSERT INTO individual_contact (email)
+SELECT 'user' || i || '@example.com' FROM generate_series(1, {CONTACTS}) i;
+
+INSERT INTO incident (title, visibility, created_at)
+SELECT
+    'incident ' || i,
+    CASE WHEN random() < 0.2 THEN 'Restricted' ELSE 'Open' END,
+    now() - (i || ' minutes')::interval
+FROM generate_series(1, {INCIDENTS}) i;
+
+INSERT INTO participant (incident_id, individual_contact_id)
+SELECT 1 + (random() * ({INCIDENTS} - 1))::int, 1 + (random() * ({CONTACTS} - 1))::int
+FROM generate_series(1, {PARTICIPANTS});
+
+ANALYZE;
+"""
+
+INDEX = f"""
+CREATE INDEX ix_participant_individual_contact_id_incident_id
+ON {SCHEMA}.participant (individual_contact_id, incident_id);
+ANALYZE;
+"""
+
+ADMIN = "SELECT {columns} FROM incident"
+
+MEMBER_JOIN = """
+SELECT DISTINCT {columns} FROM incident
+JOIN participant ON incident.id = participant.incident_id
+JOIN individual_contact ON individual_contact.id = participant.individual_contact_id
+WHERE incident.visibility = 'Open' OR individual_contact.email = :email
+"""
+
+MEMBER_EXISTS = """
+SELECT {columns} FROM incident
+WHERE incident.visibility = 'Open' OR EXISTS (
+    SELECT 1 FROM participant, individual_contact
+    WHERE participant.incident_id = incident.id
+    AND participant.individual_contact_id = individual_contact.id
+    AND individual_contact.email = :email
+)
+"""
+
+COLUMNS = "incident.id, incident.title, incident.visibility, incident.created_at"
+
+
+def list_query(query: str) -> str:
+    return query.format(columns=COLUMNS) + " ORDER BY created_at DESC LIMIT 25 OFFSET 5000"
+
+
+def count_query(query: str) -> str:
+    return f"SELECT count(*) FROM ({query.format(columns=COLUMNS)}) AS anon"
+
+
+def measure(connection, query: str) -> float:
+    """Returns the median latency of a query in milliseconds."""
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        connection.execute(text(query), email="user42@example.com").fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def report(connection, label: str):
+    for name, query in [
+        ("admin", ADMIN),
+        ("member join + distinct", MEMBER_JOIN),
+        ("member exists", MEMBER_EXISTS),
+    ]:
+        print(
+            f"{label:<14} {name:<24} "
+            f"list: {measure(connection, list_query(query)):8.1f}ms  "
+            f"count: {measure(connection, count_query(query)):8.1f}ms"
+        )
+
+
+def main():
+    engine = create_engine(str(SQLALCHEMY_DATABASE_URI))
+    with engine.connect() as connection:
+        print(f"Seeding {INCIDENTS} incidents and {PARTICIPANTS} participants...")
+        connection.execute(text(SEED))
+        try:
+            connection.execute(text(f"SET search_path TO {SCHEMA}"))
+            report(connection, "without index")
+            connection.execute(text(INDEX))
+            report(connection, "with index")
+        finally:
+            connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
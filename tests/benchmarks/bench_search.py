@@ -0,0 +1,140 @@
+"""
+Benchmark of full-text search latency.
+
+Seeds a scratch schema with 200k documents, installs the `tsq_parse` SQL functions
+and compares the queries built by calling `tsq_parse` for both the filter and the
+ranking with the queries built from the tsquery parsed once in Python, run with:
+
+    python -m tests.benchmarks.bench_search
+
+The schema is dropped when the benchmark finishes.
+"""
+import os
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+from dispatch.config import SQLALCHEMY_DATABASE_URI
+from dispatch.search.fulltext.query import parse
+
+SCHEMA = "dispatch_benchmark_search"
+DOCUMENTS = 200000
+RUNS = 5
+
+WORDS = [
+    "database",
+    "outage",
+    "latency",
+    "network",
+    "partition",
+    "credential",
+    "leak",
+    "deploy",
+    "rollback",
+    "certificate",
+    "expired",
+    "queue",
+    "backlog",
+    "memory",
+    "pressure",
+    "customer",
+    "impact",
+    "region",
+    "failover",
+    "timeout",
+]
+
+SEED = f"""
+DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+CREATE SCHEMA {SCHEMA};
+SET search_path TO {SCHEMA};
+
+CREATE TABLE document (id serial PRIMARY KEY, title varchar, search_vector tsvector);
+
+INSERT INTO document (title)
+SELECT (
+    SELECT string_agg(
+        (ARRAY[{", ".join(f"'{w}'" for w in WORDS)}])[1 + floor(random() * {len(WORDS)})::int],
+        ' '
+    )
+    FROM generate_series(1, 8 + i % 4)
+)
+FROM generate_series(1, {DOCUMENTS}) i;
+
+UPDATE document SET search_vector = to_tsvector(title);
+CREATE INDEX ix_document_search_vector ON document USING gin (search_vector);
+ANALYZE;
+"""
+
+SEARCH_QUERIES = [
+    "database",
+    "datab",
+    "database outage",
+    "database or network",
+    '"certificate expired" -rollback',
+    "(latency or timeout) region failover",
+]
+
+TSQ_PARSE = """
+SELECT id FROM document
+WHERE search_vector @@ tsq_parse(:search_query)
+ORDER BY ts_rank_cd(search_vector, tsq_parse(:search_query)) DESC
+LIMIT 25
+"""
+
+PARSED = """
+SELECT id FROM document
+WHERE search_vector @@ to_tsquery(:tsquery)
+ORDER BY ts_rank_cd(search_vector, to_tsquery(:tsquery)) DESC
+LIMIT 25
+"""
+
+
+def measure(connection, query: str, **params) -> float:
+    """Returns the median latency of a query in milliseconds."""
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        connection.execute(text(query), **params).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def measure_parsed(connection, search_query: str) -> float:
+    """Returns the median latency of parsing a query and running it in milliseconds."""
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        connection.execute(text(PARSED), tsquery=parse(search_query)).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    engine = create_engine(str(SQLALCHEMY_DATABASE_URI))
+    expressions = os.path.join(
+        os.path.dirname(__file__), "../../src/dispatch/search/fulltext/expressions.sql"
+    )
+
+    with engine.connect() as connection:
+        print(f"Seeding {DOCUMENTS} documents...")
+        connection.execute(text(SEED))
+        try:
+            connection.execute(text(f"SET search_path TO {SCHEMA}"))
+            with open(expressions) as f:
+                connection.execute(f.read())
+
+            for search_query in SEARCH_QUERIES:
+                tsq_parse = measure(connection, TSQ_PARSE, search_query=search_query)
+                print(
+                    f"{search_query:<40} "
+                    f"tsq_parse: {tsq_parse:8.1f}ms  "
+                    f"parsed: {measure_parsed(connection, search_query):8.1f}ms"
+                )
+        finally:
+            connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark of the tag recommendation model builder on synthetic data.
+
+Builds the tag correlation matrix for 10k incidents x 2k tags with the sparse
+implementation, and compares it with the previous per-pair DataFrame implementation
+on a subset small enough for it to finish, run with:
+
+    python -m tests.benchmarks.bench_tag_recommender
+"""
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from dispatch.tag.recommender import (
+    create_boolean_dataframe,
+    create_correlation_matrix,
+    create_incidence_matrix,
+)
+
+
+def generate_items(incident_count: int, tag_count: int, max_tags: int = 8, seed: int = 42):
+    """Generates incidents with a random number of random tags."""
+    rng = random.Random(seed)
+    tags = [SimpleNamespace(id=i) for i in range(tag_count)]
+    return [
+        SimpleNamespace(tags=rng.sample(tags, rng.randint(1, max_tags)))
+        for _ in range(incident_count)
+    ]
+
+
+def pairwise_correlation_matrix(dataframe) -> np.ndarray:
+    """The previous implementation, one boolean DataFrame filter per tag pair."""
+    unique_tags = list(dataframe.columns)
+    result = np.zeros((len(unique_tags), len(unique_tags)))
+    for i, tag_a in enumerate(unique_tags):
+        for j, tag_b in enumerate(unique_tags):
+            a_and_b = dataframe[(dataframe[tag_a]) & (dataframe[tag_b])].shape[0]
+            a_not_b = dataframe[(dataframe[tag_a]) & ~(dataframe[tag_b])].shape[0]
+            b_not_a = dataframe[(dataframe[tag_b]) & ~(dataframe[tag_a])].shape[0]
+            result[j, i] = a_and_b / (a_and_b + a_not_b + b_not_a)
+    return result
+
+
+def main():
+    items = generate_items(10000, 2000)
+    start = time.perf_counter()
+    matrix, _ = create_incidence_matrix(items)
+    create_correlation_matrix(matrix)
+    print(f"sparse 10000 incidents x 2000 tags: {time.perf_counter() - start:.2f}s")
+
+    items = generate_items(500, 50)
+    start = time.perf_counter()
+    matrix, _ = create_incidence_matrix(items)
+    sparse_result = create_correlation_matrix(matrix)
+    print(f"sparse 500 incidents x 50 tags: {time.perf_counter() - start:.4f}s")
+
+    start = time.perf_counter()
+    pairwise_result = pairwise_correlation_matrix(create_boolean_dataframe(items))
+    print(f"pairwise 500 incidents x 50 tags: {time.perf_counter() - start:.2f}s")
+
+    assert np.allclose(sparse_result, pairwise_result)
+
+
+if __name__ == "__main__":
+    main()
@@ -52,6 +52,9 @@ from .factories import (
     ReportFactory,
     SearchFilterFactory,
     ServiceFactory,
+    SignalFactory,
+    SignalInstanceFactory,
+    SuppressionRuleFactory,
     StorageFactory,
     TagFactory,
     TagTypeFactory,
@@ -223,6 +226,16 @@ def task_plugin():
     return TestTaskPlugin
 
 
+@pytest.fixture
+def metric_plugin():
+    from dispatch.plugins.base import register
+    from dispatch.plugins.dispatch_test.metric import TestMetricPlugin
+
+    register(TestMetricPlugin)
+    TestMetricPlugin.sent = []
+    return TestMetricPlugin
+
+
 @pytest.fixture
 def term_plugin():
     from dispatch.plugins.base import register
@@ -255,6 +268,11 @@ def tag(session):
     return TagFactory()
 
 
+@pytest.fixture
+def tags(session):
+    return [TagFactory(), TagFactory()]
+
+
 @pytest.fixture
 def tag_type(session):
     return TagTypeFactory()
@@ -450,11 +468,21 @@ def case(session):
     return CaseFactory()
 
 
+@pytest.fixture
+def cases(session):
+    return [CaseFactory(), CaseFactory()]
+
+
 @pytest.fixture
 def incident(session):
     return IncidentFactory()
 
 
+@pytest.fixture
+def incidents(session):
+    return [IncidentFactory(), IncidentFactory()]
+
+
 @pytest.fixture
 def event(session):
     return EventFactory()
@@ -543,3 +571,23 @@ def workflow(session, workflow_plugin_instance):
 @pytest.fixture
 def workflow_instance(session):
     return WorkflowInstanceFactory()
+
+
+@pytest.fixture
+def signal(session):
+    return SignalFactory()
+
+
+@pytest.fixture
+def suppressed_signal(session):
+    return SignalFactory(suppression_rule=SuppressionRuleFactory())
+
+
+@pytest.fixture
+def signal_instance(session, signal):
+    return SignalInstanceFactory(signal=signal, project=signal.project)
+
+
+@pytest.fixture
+def signal_instances(session, signal):
+    return [SignalInstanceFactory(signal=signal, project=signal.project) for _ in range(3)]
@@ -50,3 +50,18 @@ def test_delete(session, conversation):
 
     delete(db_session=session, conversation_id=conversation.id)
     assert not get(db_session=session, conversation_id=conversation.id)
+
+
+def test_set_channel_organization(session, organization):
+    from dispatch.conversation.service import (
+        get_organization_slug_by_channel_id,
+        set_channel_organization,
+    )
+
+    set_channel_organization(db_session=session, channel_id="C123", organization_id=organization.id)
+
+    # the channel type prefix is ignored
+    assert (
+        get_organization_slug_by_channel_id(db_session=session, channel_id="G123")
+        == organization.slug
+    )
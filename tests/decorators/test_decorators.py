@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def projects(monkeypatch):
+    from dispatch import decorators
+
+    sessions = []
+
+    class Session(object):
+        def __init__(self, organization_slug=None):
+            self.organization_slug = organization_slug
+            self.closed = False
+            sessions.append(self)
+
+        def close(self):
+            self.closed = True
+
+    projects = {
+        1: SimpleNamespace(id=1, name="failing", organization_slug="a"),
+        2: SimpleNamespace(id=2, name="b", organization_slug="a"),
+        3: SimpleNamespace(id=3, name="c", organization_slug="b"),
+    }
+
+    monkeypatch.setattr(decorators, "SessionLocal", Session)
+    monkeypatch.setattr(decorators, "get_organization_session", Session)
+    monkeypatch.setattr(
+        decorators.organization_service,
+        "get_all",
+        lambda *, db_session: [SimpleNamespace(slug="a"), SimpleNamespace(slug="b")],
+    )
+    monkeypatch.setattr(
+        decorators.project_service,
+        "get_all",
+        lambda *, db_session: [
+            p for p in projects.values() if p.organization_slug == db_session.organization_slug
+        ],
+    )
+    monkeypatch.setattr(
+        decorators.project_service,
+        "get",
+        lambda *, db_session, project_id: projects[project_id],
+    )
+    return SimpleNamespace(projects=projects, sessions=sessions)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_scheduled_project_task(projects, max_workers):
+    from dispatch.decorators import scheduled_project_task
+
+    sessions, runs = {}, []
+
+    @scheduled_project_task(max_workers=max_workers)
+    def task(db_session, project):
+        sessions[project.id] = db_session
+        if project.name == "failing":
+            raise Exception("failure")
+        runs.append(project.id)
+
+    task()
+
+    # a failing project doesn't stop the others
+    assert sorted(runs) == [2, 3]
+    for project_id, db_session in sessions.items():
+        assert db_session.organization_slug == projects.projects[project_id].organization_slug
+    assert all(s.closed for s in projects.sessions)
+
+    # with workers, projects of the same organization get their own session
+    assert (sessions[1] is not sessions[2]) == (max_workers > 1)
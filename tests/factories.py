@@ -36,6 +36,7 @@ from dispatch.report.models import Report
 from dispatch.route.models import Recommendation, RecommendationMatch
 from dispatch.search_filter.models import SearchFilter
 from dispatch.service.models import Service
+from dispatch.signal.models import DuplicationRule, Signal, SignalInstance, SuppressionRule
 from dispatch.storage.models import Storage
 from dispatch.tag.models import Tag
 from dispatch.tag_type.models import TagType
@@ -1111,3 +1112,59 @@ class WorkflowInstanceFactory(BaseFactory):
 
         if extracted:
             self.creator_id = extracted.id
+
+
+class DuplicationRuleFactory(BaseFactory):
+    """Duplication Rule Factory."""
+
+    mode = "Active"
+    window = 60 * 60
+    project = SubFactory(ProjectFactory)
+
+    class Meta:
+        """Factory Configuration."""
+
+        model = DuplicationRule
+
+
+class SuppressionRuleFactory(BaseFactory):
+    """Suppression Rule Factory."""
+
+    mode = "Active"
+    project = SubFactory(ProjectFactory)
+
+    class Meta:
+        """Factory Configuration."""
+
+        model = SuppressionRule
+
+
+class SignalFactory(BaseFactory):
+    """Signal Factory."""
+
+    name = FuzzyText()
+    owner = FuzzyText()
+    description = FuzzyText()
+    external_id = Sequence(lambda n: f"signal{n}")
+    duplication_rule = SubFactory(DuplicationRuleFactory)
+    project = SubFactory(ProjectFactory)
+
+    class Meta:
+        """Factory Configuration."""
+
+        model = Signal
+
+
+class SignalInstanceFactory(BaseFactory):
+    """Signal Instance Factory."""
+
+    id = LazyAttribute(lambda _: uuid.uuid4())
+    fingerprint = FuzzyText()
+    raw = {}
+    signal = SubFactory(SignalFactory)
+    project = SubFactory(ProjectFactory)
+
+    class Meta:
+        """Factory Configuration."""
+
+        model = SignalInstance
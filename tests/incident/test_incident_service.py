@@ -0,0 +1,211 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+
+@contextmanager
+def count_queries(session):
+    """Records the statements executed by a session."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_incident_report_reminders_queries(session, incident, incidents):
+    """The queries of the report reminders don't grow with the number of incidents."""
+    from datetime import datetime
+
+    from dispatch.incident.enums import IncidentStatus
+    from dispatch.report.scheduled import incident_report_reminders
+
+    project = incident.project
+    for i in [incident] + incidents:
+        i.project = project
+        i.created_at = datetime.utcnow()
+        i.status = IncidentStatus.closed
+
+    num_queries = []
+    for active in ([incident], incidents):
+        for i in active:
+            i.status = IncidentStatus.active
+        session.commit()
+        session.expire_all()
+
+        with count_queries(session) as statements:
+            incident_report_reminders.__wrapped__(db_session=session, project=project)
+        num_queries.append(len(statements))
+
+    assert num_queries[0] == num_queries[1]
+
+
+def test_daily_report_match_queries(session, incident, incidents, search_filters, tag):
+    """Matching the daily report incidents doesn't load their relationships one by one."""
+    from dispatch.incident.enums import IncidentStatus
+    from dispatch.incident.service import get_all_by_status
+    from dispatch.search_filter.service import match_many
+
+    project = incident.project
+    for i in [incident] + incidents:
+        i.project = project
+        i.status = IncidentStatus.closed
+        i.tags = [tag]
+
+    search_filters[0].expression = [
+        {"model": "TagType", "field": "name", "op": "==", "value": tag.tag_type.name}
+    ]
+    search_filters[1].expression = [
+        {
+            "or": [
+                {"model": "IncidentType", "field": "name", "op": "==", "value": "Unknown"},
+                {"model": "IncidentPriority", "field": "name", "op": "==", "value": "Unknown"},
+                {"model": "Term", "field": "text", "op": "==", "value": "Unknown"},
+            ]
+        }
+    ]
+
+    num_queries = []
+    for active in ([incident], incidents):
+        for i in active:
+            i.status = IncidentStatus.active
+        session.commit()
+        session.expire_all()
+
+        with count_queries(session) as statements:
+            matched = get_all_by_status(
+                db_session=session,
+                project_id=project.id,
+                status=IncidentStatus.active,
+                load_profile="daily_report",
+            )
+            matches = match_many(
+                db_session=session, search_filters=search_filters, class_instances=matched
+            )
+        assert matches[search_filters[0].id] == {i.id for i in matched}
+        num_queries.append(len(statements))
+
+    assert num_queries[0] == num_queries[1]
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_search_filter_sort_paginate_cursor(session, incidents, incident, descending):
+    from dispatch.database.service import search_filter_sort_paginate
+    from dispatch.enums import TotalCount, UserRoles
+
+    kwargs = {
+        "db_session": session,
+        "model": "Incident",
+        "items_per_page": 2,
+        "sort_by": ["status"],
+        "descending": [descending],
+        "total_count": TotalCount.none,
+        "role": UserRoles.admin,
+    }
+    pages = search_filter_sort_paginate(
+        **{
+            **kwargs,
+            "items_per_page": -1,
+            "sort_by": ["status", "id"],
+            "descending": [descending] * 2,
+        }
+    )
+    expected = [i.id for i in pages["items"]]
+
+    ids, cursor = [], ""
+    while cursor is not None:
+        page = search_filter_sort_paginate(**kwargs, cursor=cursor)
+        assert page["total"] is None
+        ids += [i.id for i in page["items"]]
+        cursor = page["next"]
+
+    assert ids == expected
+
+
+@pytest.mark.parametrize("total_count", ["exact", "estimated"])
+def test_count_results(session, incidents, total_count):
+    """Counts run against the tenant schema the session is bound to."""
+    from dispatch.database.core import get_session_schema
+    from dispatch.database.service import count_results
+    from dispatch.enums import TotalCount
+    from dispatch.incident.models import Incident
+
+    assert get_session_schema(session) == "dispatch_organization_default"
+
+    session.execute("ANALYZE dispatch_organization_default.incident")
+    total = count_results(session, session.query(Incident), TotalCount(total_count))
+    assert total is not None and total >= 0
+    if total_count == TotalCount.exact:
+        assert total == session.query(Incident).count()
+
+
+def test_search_filter_sort_paginate_cursor_sort_mismatch(session, incidents):
+    from pydantic.error_wrappers import ValidationError
+
+    from dispatch.database.service import search_filter_sort_paginate
+
+    with pytest.raises(ValidationError):
+        search_filter_sort_paginate(
+            db_session=session,
+            model="Incident",
+            sort_by=["status", "title"],
+            descending=[True],
+            cursor="",
+        )
+
+
+def test_export_incidents(session, incidents, ticket):
+    import csv
+    import json
+
+    from dispatch.common.utils.views import create_pydantic_include, export_csv, export_ndjson
+    from dispatch.incident.models import IncidentRead
+
+    include = create_pydantic_include(["id", "name", "incident_type.name", "ticket.weblink"])
+
+    # the first incident has no ticket, the columns of the second one's are still exported
+    incidents[0].ticket = None
+    incidents[1].ticket = ticket
+    session.commit()
+
+    lines = list(export_ndjson(incidents, IncidentRead, include=include))
+    assert [json.loads(line)["id"] for line in lines] == [i.id for i in incidents]
+
+    exported = "".join(export_csv(incidents, IncidentRead, include=include))
+    rows = list(csv.DictReader(exported.splitlines()))
+    assert [int(row["id"]) for row in rows] == [i.id for i in incidents]
+    assert rows[0]["incident_type.name"] == incidents[0].incident_type.name
+    assert rows[0]["ticket.weblink"] == ""
+    assert rows[1]["ticket.weblink"] == ticket.weblink
+
+
+def test_composite_search(session, incidents):
+    from types import SimpleNamespace
+
+    from dispatch.database.service import composite_search
+    from dispatch.enums import Visibility
+    from dispatch.incident.models import Incident
+
+    public, restricted = incidents
+    for incident in incidents:
+        incident.title = "database outage"
+    restricted.visibility = Visibility.restricted
+    session.commit()
+
+    user = SimpleNamespace(projects=[])
+    results = composite_search(
+        db_session=session, query_str="outage", models=[Incident], current_user=user
+    )
+    assert [i.id for i in results["Incident"]] == [public.id]
+
+    results = composite_search(
+        db_session=session, query_str="outage", models=[Incident], current_user=user, limit=1
+    )
+    assert len(results["Incident"]) == 1
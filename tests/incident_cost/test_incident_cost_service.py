@@ -48,3 +48,48 @@ def test_delete(session, incident_cost):
 
     delete(db_session=session, incident_cost_id=incident_cost.id)
     assert not get(db_session=session, incident_cost_id=incident_cost.id)
+
+
+def test_update_incidents_response_cost(
+    session, incident, incident_cost_type, participant, participant_role
+):
+    from datetime import datetime, timedelta
+
+    from dispatch.incident.enums import IncidentStatus
+    from dispatch.incident_cost.service import (
+        calculate_incident_response_cost,
+        get_by_incident_id_and_incident_cost_type_id,
+        update_incidents_response_cost,
+    )
+    from dispatch.participant_role.models import ParticipantRoleType
+
+    assumed_at = datetime(2022, 1, 1)
+    incident.status = IncidentStatus.closed
+    incident.stable_at = assumed_at + timedelta(hours=30)
+    incident_cost_type.project = incident.project
+    participant.incident_id = incident.id
+    participant_role.participant_id = participant.id
+    participant_role.role = ParticipantRoleType.incident_commander
+    participant_role.assumed_at = assumed_at
+    participant_role.activity = 1
+    session.commit()
+
+    kwargs = {
+        "db_session": session,
+        "project": incident.project,
+        "incident_cost_type": incident_cost_type,
+    }
+    assert update_incidents_response_cost(**kwargs)
+
+    incident_cost = get_by_incident_id_and_incident_cost_type_id(
+        db_session=session, incident_id=incident.id, incident_cost_type_id=incident_cost_type.id
+    )
+    assert incident_cost.amount == calculate_incident_response_cost(incident.id, session)
+
+    # nothing changed since the last calculation
+    assert not update_incidents_response_cost(**kwargs)
+
+    # roles changed since the last calculation
+    participant_role.renounced_at = datetime.utcnow()
+    session.commit()
+    assert update_incidents_response_cost(**kwargs) == 1
@@ -0,0 +1,94 @@
+import time
+
+
+def test_metric_buffer():
+    from dispatch.metrics import MetricBuffer, get_metric_key
+
+    buffer = MetricBuffer(max_size=10, timer_samples=5)
+    tags = {"project": "a"}
+    key = get_metric_key("calls", tags)
+
+    buffer.counter("calls", tags=tags)
+    buffer.counter("calls", value=2, tags=tags)
+    buffer.gauge("size", 1)
+    buffer.gauge("size", 2)
+    for value in range(100):
+        buffer.timer("elapsed", value, tags=tags)
+
+    # the buffered tags don't change with the caller's dict
+    tags["project"] = "b"
+
+    counters, gauges, timers, buffered_tags, dropped = buffer.drain()
+    assert counters[key] == 3
+    assert gauges[get_metric_key("size")] == 2
+    assert buffered_tags[key] == {"project": "a"}
+    assert not dropped
+
+    # timers keep a bounded sample of their values
+    reservoir = timers[get_metric_key("elapsed", {"project": "a"})]
+    assert reservoir.count == 100
+    assert len(reservoir.samples) == 5
+    assert set(reservoir.samples) <= set(range(100))
+
+    assert buffer.drain()[:4] == ({}, {}, {}, {})
+
+
+def test_metric_buffer_overflow():
+    from dispatch.metrics import MetricBuffer, get_metric_key
+
+    buffer = MetricBuffer(max_size=2)
+    buffer.counter("a")
+    buffer.counter("b")
+    buffer.counter("c")
+    buffer.timer("d", 1)
+
+    # existing series are still updated once the buffer is full
+    buffer.counter("a")
+
+    counters, gauges, timers, tags, dropped = buffer.drain()
+    assert dict(counters) == {get_metric_key("a"): 2, get_metric_key("b"): 1}
+    assert not timers
+    assert dropped == 2
+
+
+def test_metrics_flush_thread(metric_plugin):
+    from dispatch.metrics import Metrics
+
+    metrics = Metrics(flush_interval=0.01, buffer_size=1)
+    metrics._providers = [metric_plugin.slug]
+
+    # the buffer is filled before the first metric starts the flush thread
+    metrics.buffer.counter("calls", tags={"project": "a"})
+    metrics.buffer.timer("elapsed", 1.5)
+    metrics.gauge("size", 1)
+
+    deadline = time.monotonic() + 5
+    while len(metric_plugin.sent) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    metrics.stop()
+    metrics._thread.join(timeout=1)
+    assert not metrics._thread.is_alive()
+
+    assert sorted(metric_plugin.sent) == [
+        ("counter", "calls", 1, {"project": "a"}),
+        ("counter", "metrics.dropped.counter", 2, None),
+    ]
+
+
+def test_metrics_flush_sampled_timers(metric_plugin):
+    from dispatch.metrics import Metrics
+
+    metrics = Metrics(timer_samples=10)
+    metrics._providers = [metric_plugin.slug]
+
+    for value in range(250):
+        metrics.buffer.timer("elapsed", value, tags={"project": "a"})
+    metrics.flush()
+
+    timers = [s for s in metric_plugin.sent if s[0] == "timer"]
+    assert len(timers) == 10
+    assert all(s[1] == "elapsed" and s[3] == {"project": "a"} for s in timers)
+
+    # the exact number of values is counted even though only a sample is sent
+    assert ("counter", "elapsed.count", 250, {"project": "a"}) in metric_plugin.sent
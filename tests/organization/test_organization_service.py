@@ -59,3 +59,68 @@ def test_delete(session, organization):
 
     delete(db_session=session, organization_id=organization.id)
     assert not get(db_session=session, organization_id=organization.id)
+
+
+def test_get_organization_session():
+    from dispatch.database.core import (
+        get_organization_session,
+        get_schema_sessionmaker,
+        get_session_schema,
+    )
+    from dispatch.incident.models import Incident
+
+    db_session = get_organization_session("default")
+    try:
+        bind = db_session.get_bind()
+        assert bind.get_execution_options()["schema_translate_map"] == {
+            None: "dispatch_organization_default"
+        }
+        assert get_session_schema(db_session) == "dispatch_organization_default"
+        assert db_session.query(Incident).count() >= 0
+    finally:
+        db_session.close()
+
+    # the session factory is only created once per schema
+    schema_sessionmaker = get_schema_sessionmaker("dispatch_organization_default")
+    assert schema_sessionmaker is get_schema_sessionmaker("dispatch_organization_default")
+
+
+def test_organization_session_scope(monkeypatch):
+    import pytest
+
+    from dispatch.database import core
+
+    calls = []
+    db_session = core.get_organization_session("default")
+    monkeypatch.setattr(db_session, "rollback", lambda: calls.append("rollback"))
+    monkeypatch.setattr(db_session, "close", lambda: calls.append("close"))
+    monkeypatch.setattr(core, "get_organization_session", lambda slug: db_session)
+
+    with core.organization_session_scope("default") as scoped_session:
+        assert scoped_session is db_session
+    assert calls == ["close"]
+
+    calls.clear()
+    with pytest.raises(ValueError):
+        with core.organization_session_scope("default"):
+            raise ValueError()
+    assert calls == ["rollback", "close"]
+
+
+def test_get_session_stats():
+    from dispatch.database.core import get_organization_session, get_session_stats
+
+    schema = "dispatch_organization_default"
+    opened = get_session_stats()["sessions_opened"].get(schema, 0)
+
+    db_session = get_organization_session("default")
+    db_session.connection()
+    try:
+        stats = get_session_stats()
+        assert stats["sessions_opened"][schema] == opened + 1
+        assert stats["schemas"] >= 1
+        assert stats["pool"]["checked_out"] >= 1
+    finally:
+        db_session.close()
+
+    assert get_session_stats()["pool"]["checked_out"] == stats["pool"]["checked_out"] - 1
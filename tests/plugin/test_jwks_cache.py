@@ -0,0 +1,140 @@
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+
+SECRET = b"test-jwks-secret"
+
+
+class JWKSHandler(BaseHTTPRequestHandler):
+    keys = []
+    hits = 0
+
+    def do_GET(self):
+        JWKSHandler.hits += 1
+        body = json.dumps({"keys": JWKSHandler.keys}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def oct_key(kid: str, secret: bytes = SECRET):
+    return {
+        "kty": "oct",
+        "kid": kid,
+        "alg": "HS256",
+        "k": base64.urlsafe_b64encode(secret).decode("utf-8").rstrip("="),
+    }
+
+
+@pytest.fixture
+def jwks_url():
+    JWKSHandler.keys = [oct_key("a")]
+    JWKSHandler.hits = 0
+    server = HTTPServer(("127.0.0.1", 0), JWKSHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/jwks"
+    server.shutdown()
+
+
+def test_get_key_cached(jwks_url):
+    from dispatch.plugins.dispatch_core.jwks import JWKSCache
+
+    cache = JWKSCache(jwks_url)
+    assert cache.get_key("a")["kid"] == "a"
+    assert cache.get_key("a")["kid"] == "a"
+    assert JWKSHandler.hits == 1
+
+
+def test_get_key_rotation(jwks_url):
+    from dispatch.plugins.dispatch_core.jwks import JWKSCache
+
+    cache = JWKSCache(jwks_url, refresh_interval=0)
+    assert cache.get_key("a")
+
+    JWKSHandler.keys = [oct_key("a"), oct_key("b")]
+    assert cache.get_key("b")["kid"] == "b"
+    assert JWKSHandler.hits == 2
+
+
+def test_get_key_unknown_rate_limited(jwks_url):
+    from dispatch.plugins.dispatch_core.jwks import JWKSCache
+
+    cache = JWKSCache(jwks_url, refresh_interval=60)
+    assert cache.get_key("a")
+
+    for _ in range(5):
+        assert not cache.get_key("unknown")
+    assert JWKSHandler.hits == 1
+
+
+def test_get_key_single_flight(jwks_url):
+    from dispatch.plugins.dispatch_core.jwks import JWKSCache
+
+    cache = JWKSCache(jwks_url)
+    threads = [threading.Thread(target=cache.get_key, args=("a",)) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert JWKSHandler.hits == 1
+
+
+def test_get_key_ttl(jwks_url):
+    from dispatch.plugins.dispatch_core.jwks import JWKSCache
+
+    cache = JWKSCache(jwks_url, ttl=0)
+    assert cache.get_key("a")
+    time.sleep(0.01)
+    assert cache.get_key("a")
+    assert JWKSHandler.hits == 2
+
+
+def test_token_cache_expiry():
+    from dispatch.plugins.dispatch_core.jwks import TokenCache
+
+    cache = TokenCache()
+    cache.set("valid", {"email": "a@example.com", "exp": time.time() + 60})
+    cache.set("expired", {"email": "b@example.com", "exp": time.time() - 1})
+    cache.set("no-exp", {"email": "c@example.com"})
+
+    assert cache.get("valid")["email"] == "a@example.com"
+    assert not cache.get("expired")
+    assert not cache.get("no-exp")
+
+
+def test_pkce_get_current_user(jwks_url):
+    from jose import jwt
+    from starlette.requests import Request
+
+    from dispatch.plugins.dispatch_core.jwks import JWKSCache, TokenCache
+    from dispatch.plugins.dispatch_core.plugin import PKCEAuthProviderPlugin
+
+    plugin = PKCEAuthProviderPlugin()
+    plugin.jwks_cache = JWKSCache(jwks_url)
+    plugin.token_cache = TokenCache()
+
+    token = jwt.encode(
+        {"email": "dispatch@example.com", "exp": int(time.time()) + 60},
+        SECRET,
+        algorithm="HS256",
+        headers={"kid": "a"},
+    )
+    request = Request(
+        {"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode("utf-8"))]}
+    )
+
+    for _ in range(3):
+        assert plugin.get_current_user(request) == "dispatch@example.com"
+    assert JWKSHandler.hits == 1
@@ -0,0 +1,32 @@
+from time import monotonic
+
+
+def test_signing_secrets_invalidated_on_commit(session, plugin):
+    from dispatch.plugin.models import PluginInstance
+    from dispatch.plugins.dispatch_slack.views import signing_secrets_cache
+
+    signing_secrets_cache["default"] = (monotonic() + 60, [])
+
+    plugin_instance = PluginInstance(enabled=True, plugin=plugin)
+    session.add(plugin_instance)
+    session.flush()
+
+    # the change isn't visible to other sessions until it is committed
+    assert "default" in signing_secrets_cache
+
+    session.commit()
+    assert "default" not in signing_secrets_cache
+
+
+def test_signing_secrets_kept_on_rollback(session, plugin):
+    from dispatch.plugin.models import PluginInstance
+    from dispatch.plugins.dispatch_slack.views import signing_secrets_cache
+
+    session.begin_nested()
+    session.add(PluginInstance(enabled=True, plugin=plugin))
+    session.flush()
+    session.rollback()
+
+    signing_secrets_cache["default"] = (monotonic() + 60, [])
+    session.commit()
+    assert "default" in signing_secrets_cache
@@ -0,0 +1,94 @@
+import threading
+import time
+
+
+def get_scheduler(tmp_path, **kwargs):
+    from dispatch.scheduler import Scheduler
+
+    scheduler = Scheduler(max_workers=2, stats_path=str(tmp_path / "stats.json"), **kwargs)
+    scheduler.registered_tasks = []
+    return scheduler
+
+
+def add_task(scheduler, func, **kwargs):
+    import schedule
+
+    scheduler.add(schedule.Scheduler().every(1).hours, name="task", **kwargs)(func)
+    return scheduler.registered_tasks[-1]
+
+
+def test_scheduler_skips_overlapping_runs(tmp_path):
+    scheduler = get_scheduler(tmp_path, jitter=0)
+    started, release = threading.Event(), threading.Event()
+
+    def func():
+        started.set()
+        release.wait(5)
+
+    task = add_task(scheduler, func)
+    scheduler.submit(task)
+    assert started.wait(5)
+
+    # the first run is still in progress
+    scheduler.submit(task)
+    assert scheduler.read_stats()["task"]["running"] == 1
+    assert scheduler.read_stats()["task"]["skipped"] == 1
+
+    release.set()
+    scheduler.executor.shutdown(wait=True)
+
+    stats = scheduler.read_stats()
+    assert stats == scheduler.get_stats()
+    assert stats["task"]["queued"] == 0
+    assert stats["task"]["running"] == 0
+    assert stats["task"]["runs"] == 1
+    assert stats["task"]["skipped"] == 1
+    assert stats["task"]["last_run_at"]
+
+
+def test_scheduler_max_concurrency(tmp_path):
+    scheduler = get_scheduler(tmp_path, jitter=0)
+    release = threading.Event()
+
+    task = add_task(scheduler, lambda: release.wait(5), max_concurrency=2)
+    for _ in range(3):
+        scheduler.submit(task)
+
+    release.set()
+    scheduler.executor.shutdown(wait=True)
+
+    stats = scheduler.read_stats()["task"]
+    assert (stats["runs"], stats["skipped"]) == (2, 1)
+
+
+def test_scheduler_failures(tmp_path):
+    scheduler = get_scheduler(tmp_path, jitter=0)
+
+    def func():
+        raise Exception("failure")
+
+    task = add_task(scheduler, func)
+    scheduler.submit(task)
+    scheduler.executor.shutdown(wait=True)
+
+    stats = scheduler.read_stats()["task"]
+    assert (stats["runs"], stats["failures"]) == (1, 1)
+
+
+def test_scheduler_jitter(tmp_path):
+    scheduler = get_scheduler(tmp_path, jitter=10)
+    runs = []
+
+    task = add_task(scheduler, lambda: runs.append(1))
+    scheduler.submit(task)
+
+    # delayed runs don't hold a worker and count towards the overlap guard
+    assert scheduler.executor is None
+    scheduler.submit(task)
+    assert task["stats"].queued == 1
+    assert task["stats"].skipped == 1
+
+    scheduler.submit_due(now=time.monotonic() + 10)
+    scheduler.executor.shutdown(wait=True)
+    assert runs == [1]
+    assert task["stats"].queued == 0
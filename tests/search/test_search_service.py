@@ -0,0 +1,87 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "search_query,prefix,expected",
+    [
+        ("incident", True, "'incident':*"),
+        ("incident", False, "'incident'"),
+        ("Incident Database", True, "('incident':* & 'database':*)"),
+        ("incident or database", True, "('incident':* | 'database':*)"),
+        ("-database outage", True, "(!('database':*) & 'outage':*)"),
+        ('"database outage" db', True, "(('database' <-> 'outage') & 'db':*)"),
+        ("(db or database) outage", True, "(('db':* | 'database':*) & 'outage':*)"),
+        ("o'brien", True, "'o''brien':*"),
+        (")) db (outage", True, "('db':* & 'outage':*)"),
+        ("db or", True, "'db':*"),
+        ("db & !", True, "'db':*"),
+        ("- or", True, None),
+        ('"', True, None),
+        ("...", True, None),
+    ],
+)
+def test_parse(search_query, prefix, expected):
+    from dispatch.search.fulltext.query import parse
+
+    assert parse(search_query, prefix=prefix) == expected
+
+
+@pytest.mark.parametrize("search_query", ["a" * 300, "(" * 20 + "a", "a\x00b"])
+def test_parse_invalid(search_query):
+    from dispatch.search.fulltext.query import InvalidSearchQuery, parse
+
+    with pytest.raises(InvalidSearchQuery):
+        parse(search_query)
+
+
+def test_search(session, incidents):
+    from pydantic.error_wrappers import ValidationError
+
+    from dispatch.database.service import search
+    from dispatch.incident.models import Incident
+
+    incident, _ = incidents
+    incident.name = "outage-123"
+    incident.title = "database outage"
+    session.commit()
+
+    query = session.query(Incident)
+    assert search(query_str="datab outa", query=query, model="incident").all() == [incident]
+    assert not search(query_str="datab", query=query, model="incident", prefix=False).all()
+    assert not search(query_str="( -", query=query, model="incident").all()
+
+    with pytest.raises(ValidationError):
+        search(query_str="a" * 300, query=query, model="incident")
+
+
+def test_typeahead(session, incidents):
+    from dispatch.enums import TypeaheadTypes, UserRoles
+    from dispatch.search.service import typeahead, typeahead_cache
+
+    typeahead_cache.clear()
+    incident, other = incidents
+    incident.title = "database outage"
+    other.title = "database_outage"
+    session.commit()
+
+    def search(query_str, **kwargs):
+        items = typeahead(
+            db_session=session,
+            organization="default",
+            type=TypeaheadTypes.incident,
+            query_str=query_str,
+            role=UserRoles.admin,
+            **kwargs,
+        )
+        return [i["id"] for i in items]
+
+    assert search("base out") == [incident.id]
+    assert search("se_ou") == [other.id]
+    assert set(search("databa")) == {incident.id, other.id}
+    assert not search("databa", project_ids=[-1])
+    assert len(search("databa", limit=1)) == 1
+
+    # results are cached for a short time
+    incident.title = "network partition"
+    session.commit()
+    assert search("base out") == [incident.id]
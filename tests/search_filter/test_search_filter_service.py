@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_get(session, search_filter):
     from dispatch.search_filter.service import get
 
@@ -45,3 +48,157 @@ def test_delete(session, search_filter):
 
     delete(db_session=session, search_filter_id=search_filter.id)
     assert not get(db_session=session, search_filter_id=search_filter.id)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        [{"model": "Incident", "field": "status", "op": "==", "value": "Active"}],
+        [{"model": "Incident", "field": "status", "op": "!=", "value": "Active"}],
+        [{"model": "Incident", "field": "status", "op": "in", "value": ["Active", "Stable"]}],
+        [{"model": "Incident", "field": "title", "op": "ilike", "value": "%a%"}],
+        [{"model": "Incident", "field": "resolution", "op": "is_null"}],
+        [
+            {
+                "or": [
+                    {"model": "Incident", "field": "status", "op": "==", "value": "Closed"},
+                    {
+                        "not": [
+                            {"model": "Incident", "field": "visibility", "op": "==", "value": "Open"}
+                        ]
+                    },
+                ]
+            }
+        ],
+        [{"model": "IncidentType", "field": "name", "op": "==", "value": "Unknown"}],
+        [{"model": "Tag", "field": "name", "op": "==", "value": "Unknown"}],
+        [{"not": [{"model": "Tag", "field": "name", "op": "==", "value": "Unknown"}]}],
+        # the tag and tag type of a combination come from the same tag row
+        lambda tags: [
+            {
+                "and": [
+                    {"or": [{"model": "Tag", "field": "name", "op": "==", "value": tags[0].name}]},
+                    {
+                        "or": [
+                            {
+                                "model": "TagType",
+                                "field": "name",
+                                "op": "==",
+                                "value": tags[1].tag_type.name,
+                            }
+                        ]
+                    },
+                ]
+            }
+        ],
+        lambda tags: [
+            {
+                "and": [
+                    {"or": [{"model": "Tag", "field": "name", "op": "==", "value": tags[0].name}]},
+                    {
+                        "or": [
+                            {
+                                "model": "TagType",
+                                "field": "name",
+                                "op": "==",
+                                "value": tags[0].tag_type.name,
+                            }
+                        ]
+                    },
+                ]
+            }
+        ],
+    ],
+)
+def test_evaluate_matches_sql(session, incident, tags, expression):
+    """The in-memory evaluator agrees with the database for each incident."""
+    from dispatch.search_filter.evaluator import CompiledFilter
+    from dispatch.search_filter.service import match
+
+    if callable(expression):
+        expression = expression(tags)
+
+    compiled_filter = CompiledFilter(expression)
+    for incident_tags in ([], tags[:1], tags):
+        incident.tags = incident_tags
+        session.commit()
+        expected = bool(match(db_session=session, filter_spec=expression, class_instance=incident))
+        assert compiled_filter.evaluate(incident) == expected
+
+
+def test_evaluate_cache_invalidated(session, incident, search_filter):
+    from dispatch.search_filter.service import evaluate, update
+    from dispatch.search_filter.models import SearchFilterUpdate
+
+    search_filter.expression = [
+        {"model": "Incident", "field": "id", "op": "==", "value": incident.id}
+    ]
+    session.commit()
+    assert evaluate(db_session=session, search_filter=search_filter, class_instance=incident)
+
+    search_filter_in = SearchFilterUpdate(
+        name=search_filter.name,
+        expression=[{"model": "Incident", "field": "id", "op": "!=", "value": incident.id}],
+    )
+    update(db_session=session, search_filter=search_filter, search_filter_in=search_filter_in)
+    assert not evaluate(db_session=session, search_filter=search_filter, class_instance=incident)
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_match_many(session, incidents, search_filters, tag, in_memory, monkeypatch):
+    from dispatch.search_filter import evaluator
+    from dispatch.search_filter.service import match_many
+
+    if not in_memory:
+
+        def get_compiled_filter(search_filter):
+            raise evaluator.UnsupportedFilterError("Matched in the database.")
+
+        monkeypatch.setattr(evaluator, "get_compiled_filter", get_compiled_filter)
+
+    incident = incidents[0]
+    incident.tags = [tag]
+
+    search_filters[0].expression = [
+        {"model": "Incident", "field": "id", "op": "==", "value": incident.id}
+    ]
+    # the tags of the second filter are joined through Incident.tags
+    search_filters[1].expression = [
+        {"model": "Incident", "field": "id", "op": "in", "value": [i.id for i in incidents]},
+        {"model": "Tag", "field": "name", "op": "==", "value": tag.name},
+    ]
+    session.commit()
+
+    matches = match_many(
+        db_session=session, search_filters=search_filters, class_instances=incidents
+    )
+    assert matches == {search_filters[0].id: {incident.id}, search_filters[1].id: {incident.id}}
+
+
+def test_get_filters_cached():
+    from dispatch.database.core import get_class_by_name, get_class_by_tablename
+    from dispatch.database.service import get_filters
+    from dispatch.incident.models import Incident
+
+    spec = [{"model": "Incident", "field": "status", "op": "==", "value": "Active"}]
+    reordered = [{"value": "Active", "op": "==", "field": "status", "model": "Incident"}]
+    assert get_filters(spec)[0] is get_filters(reordered)[0]
+
+    assert get_class_by_tablename("incident") is Incident
+    assert get_class_by_name("Incident") is Incident
+
+
+def test_get_class_by_tablename_unknown(monkeypatch):
+    from pydantic import ValidationError
+
+    from dispatch.database import core
+
+    core.get_class_by_tablename("incident")
+
+    # unknown names don't rebuild the indexes while no classes have been mapped
+    monkeypatch.setattr(core, "build_model_indexes", lambda: pytest.fail("indexes rebuilt"))
+    for i in range(300):
+        with pytest.raises(ValidationError):
+            core.get_class_by_tablename(f"Unknown{i}")
+
+    assert core.resolve_table_name.cache_info().currsize <= 256
@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+
+def test_get_fingerprint():
+    from dispatch.signal.models import RawSignal
+    from dispatch.signal.service import get_fingerprint
+
+    raw = RawSignal(id="1", asset=[{"name": "a"}], createdAt=datetime(2023, 1, 1)).dict()
+    fingerprint = get_fingerprint(None, [], raw)
+
+    assert fingerprint == get_fingerprint(None, [], dict(reversed(list(raw.items()))))
+    assert fingerprint != get_fingerprint(None, [], {**raw, "asset": [{"name": "b"}]})
+
+
+def test_is_suppressed():
+    from dispatch.enums import RuleMode
+    from dispatch.signal.service import is_suppressed
+
+    tags = [SimpleNamespace(id=1), SimpleNamespace(id=2)]
+    rule = SimpleNamespace(mode=RuleMode.active, expiration=None, tags=tags)
+
+    assert not is_suppressed(None, [])
+    assert is_suppressed(rule, [2, 1])
+    assert not is_suppressed(rule, [1])
+
+    rule.expiration = datetime.now() - timedelta(minutes=1)
+    assert not is_suppressed(rule, [1, 2])
+
+    rule.expiration = None
+    rule.mode = RuleMode.monitor
+    assert not is_suppressed(rule, [1, 2])
+
+
+def test_get_duplicates(session, signal_instance, case):
+    from dispatch.case import service as case_service
+    from dispatch.signal.service import get_duplicates
+
+    signal_instance.case = case
+    session.commit()
+
+    key = (signal_instance.signal_id, signal_instance.fingerprint)
+    fingerprints = {key: signal_instance.created_at - timedelta(minutes=1)}
+
+    duplicates = get_duplicates(db_session=session, fingerprints=fingerprints)
+    assert duplicates[key].id == signal_instance.id
+    assert duplicates[key].case_id == case.id
+    assert not get_duplicates(
+        db_session=session, fingerprints=fingerprints, exclude_id=signal_instance.id
+    )
+
+    # the instance is deleted along with its case
+    case_service.delete(db_session=session, case_id=case.id)
+    assert not get_duplicates(db_session=session, fingerprints=fingerprints)
+
+
+def test_deduplicate(session, signal_instances):
+    from dispatch.signal.service import deduplicate
+
+    first, second, third = signal_instances
+    rule = first.signal.duplication_rule
+
+    assert not deduplicate(db_session=session, signal_instance=first, duplication_rule=rule)
+    assert deduplicate(db_session=session, signal_instance=second, duplication_rule=rule)
+    assert second.duplication_rule_id == rule.id
+    assert second.fingerprint == first.fingerprint
+
+    # once the earliest instance is deleted, later instances duplicate the next one
+    session.delete(first)
+    session.commit()
+    assert deduplicate(db_session=session, signal_instance=third, duplication_rule=rule)
+    assert third.case_id is None
+
+
+def test_create_signal_instance_batch(
+    session, signal, suppressed_signal, signal_instance, cases, monkeypatch
+):
+    import json
+
+    from dispatch.case import flows as case_flows
+    from dispatch.case import service as case_service
+    from dispatch.signal.flows import create_signal_instance_batch
+    from dispatch.signal.models import RawSignal, SignalInstance
+    from dispatch.signal.service import get_fingerprint
+
+    previous_case, new_case = cases
+
+    # the case flows are out of scope, new instances get the new case
+    monkeypatch.setattr(case_service, "create", lambda **kwargs: new_case)
+    monkeypatch.setattr(case_flows, "case_new_create_flow", lambda **kwargs: None)
+
+    new = RawSignal(id=signal.external_id, asset=[{"name": "new"}])
+    previous = RawSignal(id=signal.external_id, asset=[{"name": "previous"}])
+    suppressed = RawSignal(id=suppressed_signal.external_id)
+    unknown = RawSignal(id="unknown")
+
+    signal_instance.case = previous_case
+    signal_instance.fingerprint = get_fingerprint(
+        signal.duplication_rule, [], json.loads(previous.json())
+    )
+    session.commit()
+
+    results = create_signal_instance_batch(session, [new, new, previous, suppressed, unknown])
+    assert results == {
+        "created": 4,
+        "suppressed": 1,
+        "duplicates": 2,
+        "cases": 1,
+        "unknown": ["unknown"],
+    }
+
+    instances = (
+        session.query(SignalInstance)
+        .filter(SignalInstance.signal_id.in_([signal.id, suppressed_signal.id]))
+        .filter(SignalInstance.id != signal_instance.id)
+        .all()
+    )
+    (suppressed_instance,) = [i for i in instances if i.signal_id == suppressed_signal.id]
+    assert suppressed_instance.suppression_rule_id == suppressed_signal.suppression_rule.id
+    assert suppressed_instance.case_id is None
+
+    # the in batch duplicate shares the new case, the previous duplicate gets its case
+    assert sorted(
+        (i.case_id, i.duplication_rule_id is not None)
+        for i in instances
+        if i.signal_id == signal.id
+    ) == sorted([(new_case.id, False), (new_case.id, True), (previous_case.id, True)])
+
+
+def test_create_signal_instances_failed_batch(session, monkeypatch):
+    from dispatch.signal import flows
+    from dispatch.signal.models import RawSignal
+
+    def create_signal_instance_batch(db_session, signal_instances_data):
+        if signal_instances_data[0].id == "failing":
+            raise ValueError("Failing batch.")
+        return {"created": 1, "suppressed": 0, "duplicates": 0, "cases": 1, "unknown": []}
+
+    monkeypatch.setattr(flows, "SIGNAL_INSTANCE_BATCH_SIZE", 1)
+    monkeypatch.setattr(flows, "create_signal_instance_batch", create_signal_instance_batch)
+
+    # a failing batch doesn't prevent the next batches from being created
+    results = flows.create_signal_instances(
+        session, [RawSignal(id="failing"), RawSignal(id="1"), RawSignal(id="2")]
+    )
+    assert results == {
+        "created": 2,
+        "suppressed": 0,
+        "duplicates": 0,
+        "cases": 2,
+        "failed": 1,
+        "unknown": [],
+    }
@@ -0,0 +1,20 @@
+def test_create_correlation_dataframe():
+    from types import SimpleNamespace
+
+    from dispatch.tag.recommender import create_boolean_dataframe, create_correlation_dataframe
+
+    a, b, c = (SimpleNamespace(id=i) for i in (1, 2, 3))
+    items = [
+        SimpleNamespace(tags=[a, b]),
+        SimpleNamespace(tags=[a]),
+        SimpleNamespace(tags=[b, c]),
+    ]
+
+    correlations = create_correlation_dataframe(create_boolean_dataframe(items))
+
+    # items with both tags / items with either tag
+    assert correlations.loc[1, 2] == 1 / 3
+    assert correlations.loc[2, 1] == 1 / 3
+    assert correlations.loc[1, 3] == 0
+    assert correlations.loc[2, 3] == 1 / 2
+    assert correlations.loc[1, 1] == 1
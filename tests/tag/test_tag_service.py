@@ -50,3 +50,43 @@ def test_delete(session, tag):
 
     delete(db_session=session, tag_id=tag.id)
     assert not get(db_session=session, tag_id=tag.id)
+
+
+def test_matcher_cached(session, tag):
+    from dispatch.tag import matcher as tag_matcher
+
+    tag_matcher.clear()
+    matcher = tag_matcher.get_matcher(db_session=session, project=tag.project)
+    assert tag_matcher.get_matcher(db_session=session, project=tag.project) is matcher
+
+
+def test_matcher_cached_empty(session, tag, monkeypatch):
+    from dispatch.tag import matcher as tag_matcher
+
+    tag.discoverable = False
+    session.commit()
+
+    # a matcher without any tags is cached too, until it expires
+    tag_matcher.clear()
+    matcher = tag_matcher.get_matcher(db_session=session, project=tag.project)
+    assert not len(matcher)
+    assert tag_matcher.get_matcher(db_session=session, project=tag.project) is matcher
+
+    monkeypatch.setattr(tag_matcher, "TAG_MATCHER_CACHE_TTL", 0)
+    assert tag_matcher.get_matcher(db_session=session, project=tag.project) is not matcher
+
+
+def test_matcher_invalidated_on_update(session, tag):
+    from dispatch.nlp import extract_terms_from_text
+    from dispatch.tag import matcher as tag_matcher
+    from dispatch.tag.service import update
+    from dispatch.tag.models import TagUpdate
+
+    tag_matcher.clear()
+    matcher = tag_matcher.get_matcher(db_session=session, project=tag.project)
+
+    update(db_session=session, tag=tag, tag_in=TagUpdate(name="matcher", discoverable=True))
+
+    new_matcher = tag_matcher.get_matcher(db_session=session, project=tag.project)
+    assert new_matcher is not matcher
+    assert "matcher" in extract_terms_from_text("the matcher tag", new_matcher)